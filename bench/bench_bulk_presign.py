@@ -0,0 +1,58 @@
+"""署名付きURL一括発行のベンチマーク
+
+botocoreの1件ずつの発行(generate_presigned_url)と、cAwsAccessMng.get_bulk_signed_urls による一括発行の
+スループット(URL/秒)を比較する。あわせて、同一時刻で発行したURLがbotocoreとバイト単位で一致することを検証する。
+※署名付きURLの発行はローカル計算のみのため、AWSへの接続は不要。
+
+実行例(ルートフォルダから):
+    python bench/bench_bulk_presign.py --count 10000
+"""
+import argparse
+import datetime
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'AKIDEXAMPLE')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'wJalrXUtnFEMI/K7MDENG+bPxRfiCYEXAMPLEKEY')
+os.environ.setdefault('AWS_SESSION_TOKEN', 'FwoGZXIvYXdzEXAMPLE/TOKEN+=')
+
+import botocore.auth
+from module.aws_mng import cAwsAccessMng
+
+def main() -> int:
+    PARSER = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    PARSER.add_argument('--count', type=int, default=10000, help='発行するURL数')
+    PARSER.add_argument('--region', default='ap-northeast-1', help='AWSリージョン名')
+    PARSER.add_argument('--bucket', default='5.65-epaper-app-serever-assets', help='AWS S3バケット名')
+    PARSER.add_argument('--method', default='get_object', choices=['get_object', 'put_object'], help='S3へのリクエストで利用するAPI')
+    ARGS = PARSER.parse_args()
+
+    # 比較のため発行時刻を固定する
+    FIXED_NOW = datetime.datetime(2024, 5, 30, 3, 40, 35)
+    botocore.auth.get_current_datetime = lambda: FIXED_NOW
+
+    # キャッシュの影響を除外するためキャッシュ無効で生成
+    AWS_MNG = cAwsAccessMng(REGION_NAME=ARGS.region, S3_BUCKET=ARGS.bucket, SIGNED_URL_CACHE_SIZE=0)
+    KEYS = [f'images/2024/05/05-30-03-40-35.{i % 1000:03d}-{i:08d} 画像+~.png' for i in range(ARGS.count)]
+    CLIENT = AWS_MNG.S3_CLIENT
+
+    START = time.perf_counter()
+    PER_CALL = [CLIENT.generate_presigned_url(ClientMethod=ARGS.method, Params={'Bucket':ARGS.bucket, 'Key':KEY}, ExpiresIn=3600) for KEY in KEYS]
+    PER_CALL_SEC = time.perf_counter() - START
+
+    START = time.perf_counter()
+    BULK = AWS_MNG.get_bulk_signed_urls(CLIENT_METHOD=ARGS.method, OBJECT_KEYS=KEYS, EXPIRATION=3600)
+    BULK_SEC = time.perf_counter() - START
+
+    MISMATCHES = sum(1 for A, B in zip(PER_CALL, BULK) if A != B)
+    print(f'count          : {ARGS.count}')
+    print(f'per-call       : {PER_CALL_SEC:.3f} sec, {ARGS.count / PER_CALL_SEC:,.0f} URLs/sec')
+    print(f'bulk           : {BULK_SEC:.3f} sec, {ARGS.count / BULK_SEC:,.0f} URLs/sec')
+    print(f'speedup        : x{PER_CALL_SEC / BULK_SEC:.1f}')
+    print(f'byte-identical : {"OK" if MISMATCHES == 0 else f"NG ({MISMATCHES} mismatches)"}')
+    return 0 if MISMATCHES == 0 else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""画像カタログ(Scan応答)のデコードのベンチマーク
+
+DynamoDBのScan応答本文(DynamoDB JSON)をN件分生成し、以下の2方式で画像リストの応答データ(id/last_modified/convertible名称)まで変換した際の
+所要時間と保持メモリ(tracemalloc)を比較する。あわせて、両方式の変換結果が一致することを検証する。
+    generic : botocoreの応答パーサ + boto3の属性値変換(dict) + 列挙型の線形探索(従来の処理)
+    decoder : cImageRecordDecoder(本文から直接cImageRecordへ変換) + 列挙型の変換表
+※応答の解析のみを計測するため、AWSへの接続は不要。
+
+実行例(ルートフォルダから):
+    python bench/bench_catalog_decode.py --count 100000
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import botocore.session
+from boto3.dynamodb.transform import TransformationInjector
+from boto3.dynamodb.types import TypeDeserializer
+from botocore.parsers import create_parser
+from module.common_func import cCommonFunc, eImageConvertibleKind
+from module.image_record import cImageRecordDecoder
+
+def get_name_from_value_linear(VALUE:int) -> str:
+    """列挙型の値に合致する名称を取得する(変換表導入前の線形探索)
+
+    Args:
+        VALUE (int): 列挙型の値
+
+    Returns:
+        str: 列挙型の値に合致する名称
+    """
+    ret_value = eImageConvertibleKind.UNDETERMINED.name.lower()
+    for CLS_VAL in eImageConvertibleKind:
+        if VALUE == CLS_VAL:
+            ret_value = CLS_VAL.name.lower()
+            break
+    return ret_value
+
+def create_body(COUNT:int) -> bytes:
+    """Scan応答本文の生成
+
+    Args:
+        COUNT (int): アイテム数
+
+    Returns:
+        bytes: Scan応答本文(DynamoDB JSON)
+    """
+    ITEMS = [{
+        cCommonFunc.API_RESP_DICT_KEY_ID: {'S':str(uuid.UUID(int=i))},
+        cCommonFunc.API_RESP_DICT_KEY_URL: {'S':f'images/2024/05/05-30-03-40-35.{i % 1000:03d}-{i:08d}.png'},
+        cCommonFunc.API_RESP_DICT_KEY_LAST_MODIFIED: {'S':'2024/05/30 03:40:35.000'},
+        cCommonFunc.API_RESP_DICT_KEY_CONVERTIBLE: {'N':str(i % 3 + 1)},
+    } for i in range(COUNT)]
+    return json.dumps({'Items':ITEMS, 'Count':COUNT, 'ScannedCount':COUNT}).encode('utf-8')
+
+def measure(FUNC) -> tuple[float, float, list]:
+    """所要時間・保持メモリの計測(所要時間はtracemalloc無効で計測)
+
+    Args:
+        FUNC (_type_): 計測対象の処理(戻り値[0]の画像レコードリストを保持メモリの計測対象とする)
+
+    Returns:
+        tuple[float, float, list]: [0]:所要時間(秒), [1]:画像レコードリストの保持メモリ(MB), [2]:応答データ
+    """
+    gc.collect()
+    START = time.perf_counter()
+    _, OUTPUT = FUNC()
+    ELAPSED = time.perf_counter() - START
+    gc.collect()
+    tracemalloc.start()
+    ROWS, _ = FUNC()
+    RETAINED = tracemalloc.get_traced_memory()[0] / 1024 / 1024
+    tracemalloc.stop()
+    del ROWS
+    return ELAPSED, RETAINED, OUTPUT
+
+def main() -> int:
+    PARSER = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    PARSER.add_argument('--count', type=int, default=100000, help='アイテム数')
+    ARGS = PARSER.parse_args()
+
+    BODY = create_body(COUNT=ARGS.count)
+    OPERATION_MODEL = botocore.session.get_session().get_service_model('dynamodb').operation_model('Scan')
+    RESPONSE_PARSER = create_parser('json')
+    INJECTOR = TransformationInjector(deserializer=TypeDeserializer())
+    DECODER = cImageRecordDecoder()
+
+    def generic() -> tuple[list, list]:
+        PARSED = RESPONSE_PARSER.parse({'body':BODY, 'headers':{}, 'status_code':200}, OPERATION_MODEL.output_shape)
+        INJECTOR.inject_attribute_value_output(parsed=PARSED, model=OPERATION_MODEL)
+        ROWS = PARSED.get('Items', [])
+        return ROWS, [(ROW.get(cCommonFunc.API_RESP_DICT_KEY_ID, ''), ROW.get(cCommonFunc.API_RESP_DICT_KEY_LAST_MODIFIED, ''), get_name_from_value_linear(VALUE=ROW.get(cCommonFunc.API_RESP_DICT_KEY_CONVERTIBLE, eImageConvertibleKind.UNDETERMINED))) for ROW in ROWS]
+
+    def decoder() -> tuple[list, list]:
+        # botocoreの応答処理(Endpoint._do_get_response)と同じ順序でフック → パーサを呼び出す
+        RESPONSE_DICT = {'body':BODY, 'headers':{}, 'status_code':200}
+        CUSTOMIZED:dict = {}
+        with DECODER.decoding():
+            DECODER._on_before_parse(response_dict=RESPONSE_DICT, customized_response_dict=CUSTOMIZED)
+        PARSED = RESPONSE_PARSER.parse(RESPONSE_DICT, OPERATION_MODEL.output_shape)
+        PARSED.update(CUSTOMIZED)
+        INJECTOR.inject_attribute_value_output(parsed=PARSED, model=OPERATION_MODEL)
+        ROWS = PARSED.get(cImageRecordDecoder.RESPONSE_KEY_RECORDS, [])
+        GET_CONVERTIBLE_NAME = eImageConvertibleKind.get_name_from_value
+        return ROWS, [(ROW.id, ROW.last_modified, GET_CONVERTIBLE_NAME(VALUE=ROW.convertible)) for ROW in ROWS]
+
+    GENERIC_SEC, GENERIC_MB, GENERIC_OUT = measure(generic)
+    DECODER_SEC, DECODER_MB, DECODER_OUT = measure(decoder)
+
+    IS_SAME = GENERIC_OUT == DECODER_OUT
+    print(f'count     : {ARGS.count}')
+    print(f'generic   : {GENERIC_SEC:.3f} sec, retained {GENERIC_MB:,.1f} MB')
+    print(f'decoder   : {DECODER_SEC:.3f} sec, retained {DECODER_MB:,.1f} MB')
+    print(f'speedup   : x{GENERIC_SEC / DECODER_SEC:.1f}, memory x{DECODER_MB / GENERIC_MB:.2f}')
+    print(f'identical : {"OK" if IS_SAME else "NG"}')
+    return 0 if IS_SAME else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
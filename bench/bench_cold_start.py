@@ -0,0 +1,108 @@
+"""Lambdaハンドラのコールドスタート(import・初期化フェーズ)計測
+
+ハンドラモジュール(app, s3_object_put_handler)ごとに新しいPythonプロセスを起動して `-X importtime` 付きでimportし、
+初期化フェーズ全体の所要時間(import + モジュール直下の初期化処理)と、importに時間を要したモジュールの上位を出力する。
+あわせて、初期化フェーズでクライアントが生成済みであること、AWSへの通信が発生していないこと、
+読み込み不要なモジュール(環境変数ファイルが無い場合のdotenv、初回の画像変換時に読み込む画像変換用のNumPy・Pillow)が読み込まれていないことを確認する。
+※Lambda実行環境を模すためLAMBDA_TASK_ROOTにsrcフォルダを指定し、通信が発生した場合に即座に失敗するよう接続できないエンドポイントを指定して実行する。
+※boto3.s3.transferはS3クライアント生成時にboto3自身が、dateutilはbotocoreが読み込むため確認対象外とする。
+
+実行例(ルートフォルダから):
+    python bench/bench_cold_start.py --runs 5
+    python bench/bench_cold_start.py --runs 5 --output bench/results/cold_start.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+SRC_DIR = os.path.join(ROOT_DIR, 'src')
+
+HANDLERS:list[str] = ['app', 's3_object_put_handler']
+"""計測対象のハンドラモジュール
+"""
+
+UNEXPECTED_MODULES:list[str] = ['dotenv', 'numpy', 'PIL']
+"""初期化フェーズで読み込まれないことが期待されるモジュール
+"""
+
+CHILD_SCRIPT = '''
+import json, sys, time
+START = time.perf_counter()
+import {handler} as HANDLER
+INIT_MS = (time.perf_counter() - START) * 1000
+AWS_MNG = HANDLER.AWS_MNG
+print(json.dumps({{
+    'init_ms': INIT_MS,
+    'clients_ready': AWS_MNG._s3_client is not None and AWS_MNG._dynamodb_client is not None and AWS_MNG._dynamodb_img_mng_resource is not None,
+    'aws_calls_in_init': HANDLER.AWS_CALL_TRACER.get_summary()['AwsCallCount'],
+    'loaded': {{NAME:NAME in sys.modules for NAME in {unexpected}}},
+}}))
+'''
+
+def run_child(HANDLER:str) -> tuple[dict, list[tuple[int, int, str]]]:
+    """ハンドラモジュールを新しいプロセスでimport
+
+    Args:
+        HANDLER (str): ハンドラモジュール名
+
+    Returns:
+        tuple[dict, list[tuple[int, int, str]]]: [0]:子プロセスの計測結果, [1]:importtimeの結果リスト(自身の時間[us], 累積時間[us], モジュール名)
+    """
+    ENV = dict(os.environ)
+    ENV.update(LAMBDA_TASK_ROOT=os.path.abspath(SRC_DIR), AWS_REGION='ap-northeast-1', AWS_S3_BUCKET='bench-cold-start', AWS_DYNAMODB_IMAGE_MNG_TABLE_NAME='bench-cold-start', LOG_LEVEL='0', AWS_CALL_TRACE_ENABLED='1')
+    ENV.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+    ENV.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+    # 初期化フェーズで通信が発生した場合に即座に失敗させるため、接続できないエンドポイントを指定する
+    ENV.update(AWS_ENDPOINT_URL='http://127.0.0.1:9', AWS_MAX_ATTEMPTS='1')
+    PROC = subprocess.run([sys.executable, '-X', 'importtime', '-c', CHILD_SCRIPT.format(handler=HANDLER, unexpected=UNEXPECTED_MODULES)], cwd=SRC_DIR, env=ENV, capture_output=True, text=True, check=True)
+    IMPORTS:list[tuple[int, int, str]] = []
+    for LINE in PROC.stderr.splitlines():
+        if not LINE.startswith('import time:') or 'self [us]' in LINE: continue
+        SELF_US, CUMULATIVE_US, NAME = LINE[len('import time:'):].split('|')
+        IMPORTS.append((int(SELF_US), int(CUMULATIVE_US), NAME.rstrip()))
+    return json.loads(PROC.stdout.strip().splitlines()[-1]), IMPORTS
+
+def main() -> int:
+    PARSER = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    PARSER.add_argument('--runs', type=int, default=5, help='ハンドラごとの計測回数(中央値を採用)')
+    PARSER.add_argument('--top', type=int, default=10, help='出力するimport時間上位のモジュール数')
+    PARSER.add_argument('--output', default='', help='計測結果JSONの保存先(省略時は保存しない)')
+    ARGS = PARSER.parse_args()
+
+    RESULTS:dict[str, dict] = {}
+    IS_OK = True
+    for HANDLER in HANDLERS:
+        RUNS = [run_child(HANDLER) for _ in range(ARGS.runs)]
+        INIT_MS = statistics.median(RESULT['init_ms'] for RESULT, _ in RUNS)
+        RESULT, IMPORTS = RUNS[-1]
+        HANDLER_IMPORT = next((IMPORT for IMPORT in IMPORTS if IMPORT[2].strip() == HANDLER), (0, 0, HANDLER))
+        # 直下のimport(インデント2)のみを上位として出力する
+        TOP = sorted((IMPORT for IMPORT in IMPORTS if IMPORT[2].startswith('   ') and not IMPORT[2].startswith('    ')), key=lambda IMPORT: IMPORT[1], reverse=True)[:ARGS.top]
+        RESULTS[HANDLER] = {
+            'init_ms_median': round(INIT_MS, 2),
+            'import_cumulative_ms': round(HANDLER_IMPORT[1] / 1000, 2),
+            'handler_body_ms': round(HANDLER_IMPORT[0] / 1000, 2),
+            'clients_ready': RESULT['clients_ready'],
+            'aws_calls_in_init': RESULT['aws_calls_in_init'],
+            'unexpected_modules_loaded': [NAME for NAME, LOADED in RESULT['loaded'].items() if LOADED],
+            'top_imports': [{'module':NAME.strip(), 'cumulative_ms':round(CUMULATIVE_US / 1000, 2)} for _, CUMULATIVE_US, NAME in TOP],
+        }
+        IS_OK = IS_OK and RESULT['clients_ready'] and RESULT['aws_calls_in_init'] == 0 and len(RESULTS[HANDLER]['unexpected_modules_loaded']) <= 0
+        print(f'[{HANDLER}] init(median of {ARGS.runs}): {RESULTS[HANDLER]["init_ms_median"]:.1f} ms, import(cumulative): {RESULTS[HANDLER]["import_cumulative_ms"]:.1f} ms, handler body: {RESULTS[HANDLER]["handler_body_ms"]:.1f} ms')
+        print(f'[{HANDLER}] clients ready: {RESULT["clients_ready"]}, aws calls in init: {RESULT["aws_calls_in_init"]}, unexpected modules: {RESULTS[HANDLER]["unexpected_modules_loaded"] or "none"}')
+        for IMPORT in RESULTS[HANDLER]['top_imports']:
+            print(f'    {IMPORT["cumulative_ms"]:>8.1f} ms  {IMPORT["module"]}')
+
+    if ARGS.output:
+        os.makedirs(os.path.dirname(os.path.abspath(ARGS.output)), exist_ok=True)
+        with open(ARGS.output, 'w', encoding='utf-8') as FILE:
+            json.dump(RESULTS, FILE, ensure_ascii=False, indent=2)
+        print(f'saved: {os.path.normpath(ARGS.output)}')
+    return 0 if IS_OK else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
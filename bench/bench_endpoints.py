@@ -0,0 +1,279 @@
+"""APIエンドポイントのベンチマーク
+
+ローカルのS3/DynamoDB代替環境(既定:motoのインプロセスモック、--endpoint-url指定時:LocalStack)に
+指定件数の画像ファイルおよび画像IDとURL管理テーブルのデータを投入し、合成したAPIGatewayイベントで
+app.lambda_handler を全ルートについて呼び出す。
+ルートごとのレイテンシ(p50/p99)、1リクエストあたりのAWS呼び出し回数(cAwsCallTracerの集計結果)、
+ピークメモリ(tracemalloc)を測定し、コミット間で比較できるようJSONに保存する。
+※motoの場合、ピークメモリにはモック側(S3/DynamoDBの代替処理)の確保分も含まれる。
+
+実行例(ルートフォルダから):
+    python bench/bench_endpoints.py --sizes 1000,10000,100000
+    python bench/bench_endpoints.py --sizes 1000 --endpoint-url http://localhost:4566
+    python bench/bench_endpoints.py --sizes 1000 --baseline bench/results/endpoints_1a2b3c4.json
+"""
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT_DIR, 'src'))
+
+def get_commit() -> str:
+    """計測対象のコミットID取得(未コミットの変更がある場合は末尾に"-dirty"を付与)
+
+    Returns:
+        str: コミットID(取得できない場合は"unknown")
+    """
+    try:
+        COMMIT = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR, capture_output=True, text=True, check=True).stdout.strip()
+        DIRTY = subprocess.run(['git', 'status', '--porcelain', '--', 'src'], cwd=ROOT_DIR, capture_output=True, text=True, check=True).stdout.strip()
+        return f'{COMMIT}-dirty' if DIRTY else COMMIT
+    except Exception:
+        return 'unknown'
+
+def create_event(METHOD:str, PATH:str, BODY:dict = None, QUERY:dict = None) -> dict:
+    """APIGateway(RESTプロキシ統合)のイベント生成
+
+    Args:
+        METHOD (str): httpメソッド
+        PATH (str): リクエストパス
+        BODY (dict, optional): リクエストボディ. Defaults to None.
+        QUERY (dict, optional): クエリ文字列パラメータ. Defaults to None.
+
+    Returns:
+        dict: イベント
+    """
+    return {
+        'resource': '/{proxy+}',
+        'path': PATH,
+        'httpMethod': METHOD,
+        'headers': {'Content-Type': 'application/json'},
+        'queryStringParameters': QUERY,
+        'pathParameters': {'proxy': PATH.lstrip('/')},
+        'requestContext': {'stage': 'bench', 'httpMethod': METHOD, 'path': PATH},
+        'body': None if BODY is None else json.dumps(BODY),
+        'isBase64Encoded': False,
+    }
+
+def invoke(APP, EVENT:dict) -> tuple[float, int, dict]:
+    """lambda_handlerの呼び出し
+
+    Args:
+        APP (_type_): appモジュール
+        EVENT (dict): イベント
+
+    Returns:
+        tuple[float, int, dict]: [0]:所要時間(単位:秒), [1]:ステータスコード, [2]:AWS呼び出し計測結果(EMF)
+    """
+    STDOUT = io.StringIO()
+    with contextlib.redirect_stdout(STDOUT):
+        START = time.perf_counter()
+        RESPONSE = APP.lambda_handler(EVENT, None)
+        ELAPSED = time.perf_counter() - START
+    SUMMARY = {}
+    for LINE in STDOUT.getvalue().splitlines():
+        if LINE.startswith('{"_aws"'):
+            # 操作単位のメトリクスの行を除き、ルート単位の合計の行を採用する
+            DATA:dict = json.loads(LINE)
+            if 'Operations' in DATA: SUMMARY = DATA
+    return ELAPSED, RESPONSE.get('statusCode', 0), SUMMARY
+
+def percentile(VALUES:list[float], PERCENT:float) -> float:
+    """パーセンタイル値の算出(nearest-rank法)
+
+    Args:
+        VALUES (list[float]): 値リスト
+        PERCENT (float): パーセント(0～100)
+
+    Returns:
+        float: パーセンタイル値
+    """
+    SORTED = sorted(VALUES)
+    return SORTED[min(len(SORTED) - 1, max(0, math.ceil(PERCENT / 100 * len(SORTED)) - 1))]
+
+def seed(APP, SIZE:int, MAX_WORKERS:int) -> list[str]:
+    """S3への画像ファイルの投入およびテーブル更新による画像IDとURL管理テーブルへのデータ投入
+
+    Args:
+        APP (_type_): appモジュール
+        SIZE (int): 投入件数
+        MAX_WORKERS (int): S3への投入の並列数
+
+    Returns:
+        list[str]: 投入した画像IDリスト
+    """
+    AWS_MNG = APP.AWS_MNG
+    if not AWS_MNG.initialize():
+        raise RuntimeError(f'initialize failed. {AWS_MNG}')
+    S3_CLIENT = AWS_MNG.S3_CLIENT
+    BODY = b'\x89PNG\r\n\x1a\n' + bytes(56)
+    def _put(INDEX:int) -> None:
+        S3_CLIENT.put_object(Bucket=AWS_MNG.S3_BUCKET_NAME, Key=f'{AWS_MNG.S3_PREFIX}/2024/{INDEX % 12 + 1:02d}/bench-{INDEX:08d}.png', Body=BODY)
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as EXECUTOR:
+        list(EXECUTOR.map(_put, range(SIZE)))
+    _, STATUS, _ = invoke(APP, create_event('GET', '/update_table'))
+    if STATUS != 200:
+        raise RuntimeError(f'/update_table failed. STATUS:{STATUS}')
+    with contextlib.redirect_stdout(io.StringIO()):
+        RESPONSE = APP.lambda_handler(create_event('GET', '/images'), None)
+    IDS = [DATA['id'] for DATA in json.loads(RESPONSE['body']).get('data', [])]
+    if len(IDS) != SIZE:
+        raise RuntimeError(f'seeded {len(IDS)} rows, expected {SIZE}.')
+    return IDS
+
+def get_cases(IDS:list[str], ITERATIONS:int, HEAVY_ITERATIONS:int) -> list[tuple[str, int, callable]]:
+    """計測ケース(ルート名, 呼び出し回数, イベント生成関数)の取得
+
+    Args:
+        IDS (list[str]): 投入した画像IDリスト
+        ITERATIONS (int): 呼び出し回数
+        HEAVY_ITERATIONS (int): 全件を処理するルートの呼び出し回数
+
+    Returns:
+        list[tuple[str, int, callable]]: 計測ケースリスト
+    """
+    RANDOM = random.Random(0)
+    # 削除対象は他のケースで参照しない画像IDから払い出す
+    DELETE_IDS = IDS[-(ITERATIONS + 1):]
+    READ_IDS = IDS[:-(ITERATIONS + 1)] or IDS
+    return [
+        ('POST /signed_url', ITERATIONS, lambda: create_event('POST', '/signed_url', BODY={'images':[f'bench/upload-{RANDOM.randrange(1 << 30):010d}.png' for _ in range(10)]})),
+        ('GET /images', HEAVY_ITERATIONS, lambda: create_event('GET', '/images')),
+        ('GET /images/<COUNT>', ITERATIONS, lambda: create_event('GET', '/images/100')),
+        ('GET /image/<ID>', ITERATIONS, lambda: create_event('GET', f'/image/{RANDOM.choice(READ_IDS)}')),
+        ('PATCH /image/<ID>', ITERATIONS, lambda: create_event('PATCH', f'/image/{RANDOM.choice(READ_IDS)}', BODY={'convertible':RANDOM.choice(['enabled', 'invalid'])})),
+        ('DELETE /deletes', ITERATIONS, lambda: create_event('DELETE', '/deletes', BODY={'ids':[DELETE_IDS.pop()]})),
+        ('GET /update_table', HEAVY_ITERATIONS, lambda: create_event('GET', '/update_table')),
+    ]
+
+def run_case(APP, CREATE_EVENT, ITERATIONS:int) -> dict:
+    """計測ケースの実行
+
+    Args:
+        APP (_type_): appモジュール
+        CREATE_EVENT (callable): イベント生成関数
+        ITERATIONS (int): 呼び出し回数
+
+    Returns:
+        dict: 計測結果
+    """
+    LATENCIES:list[float] = []
+    CALLS:list[int] = []
+    STATUSES:dict[str, int] = {}
+    OPERATIONS:dict[str, int] = {}
+    for _ in range(ITERATIONS):
+        ELAPSED, STATUS, SUMMARY = invoke(APP, CREATE_EVENT())
+        LATENCIES.append(ELAPSED * 1000)
+        CALLS.append(sum(STATS['count'] for OPERATION, STATS in SUMMARY.get('Operations', {}).items() if not OPERATION.endswith('Presign')))
+        STATUSES[str(STATUS)] = STATUSES.get(str(STATUS), 0) + 1
+        for OPERATION, STATS in SUMMARY.get('Operations', {}).items():
+            OPERATIONS[OPERATION] = OPERATIONS.get(OPERATION, 0) + STATS['count']
+    # ピークメモリはtracemallocのオーバーヘッドがレイテンシに影響しないよう別途1回呼び出して測定
+    EVENT = CREATE_EVENT()
+    tracemalloc.start()
+    try:
+        invoke(APP, EVENT)
+        PEAK = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {
+        'iterations': ITERATIONS,
+        'p50_ms': round(percentile(LATENCIES, 50), 3),
+        'p99_ms': round(percentile(LATENCIES, 99), 3),
+        'mean_ms': round(sum(LATENCIES) / len(LATENCIES), 3),
+        'aws_calls_per_request': round(sum(CALLS) / len(CALLS), 2),
+        'operations_per_request': {OPERATION:round(COUNT / ITERATIONS, 2) for OPERATION, COUNT in sorted(OPERATIONS.items())},
+        'peak_memory_bytes': PEAK,
+        'statuses': STATUSES,
+    }
+
+def print_comparison(RESULTS:dict, BASELINE:dict) -> None:
+    """ベースライン(過去の計測結果JSON)との比較結果の出力
+
+    Args:
+        RESULTS (dict): 今回の計測結果
+        BASELINE (dict): ベースラインの計測結果
+    """
+    print(f'\ncompare with {BASELINE.get("meta", {}).get("commit", "unknown")}')
+    for SIZE, ROUTES in RESULTS['results'].items():
+        for ROUTE, RESULT in ROUTES.items():
+            BASE = BASELINE.get('results', {}).get(SIZE, {}).get(ROUTE, None)
+            if BASE is None: continue
+            print(f'{SIZE:>7} {ROUTE:<22} p50 x{RESULT["p50_ms"] / max(BASE["p50_ms"], 1e-9):>6.2f}  p99 x{RESULT["p99_ms"] / max(BASE["p99_ms"], 1e-9):>6.2f}  calls {BASE["aws_calls_per_request"]:>7.2f} -> {RESULT["aws_calls_per_request"]:>7.2f}  peak x{RESULT["peak_memory_bytes"] / max(BASE["peak_memory_bytes"], 1):>6.2f}')
+
+def main() -> int:
+    PARSER = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    PARSER.add_argument('--sizes', default='1000,10000,100000', help='投入件数(カンマ区切り)')
+    PARSER.add_argument('--iterations', type=int, default=20, help='ルートごとの呼び出し回数')
+    PARSER.add_argument('--heavy-iterations', type=int, default=3, help='全件を処理するルート(GET /images, GET /update_table)の呼び出し回数')
+    PARSER.add_argument('--endpoint-url', default='', help='LocalStack等のエンドポイントURL(省略時はmotoのインプロセスモック)')
+    PARSER.add_argument('--region', default='ap-northeast-1', help='AWSリージョン名')
+    PARSER.add_argument('--seed-workers', type=int, default=8, help='S3への投入の並列数')
+    PARSER.add_argument('--output', default='', help='計測結果JSONの保存先(省略時はbench/results/endpoints_<コミットID>.json)')
+    PARSER.add_argument('--baseline', default='', help='比較対象の計測結果JSON')
+    ARGS = PARSER.parse_args()
+    SIZES = [int(SIZE) for SIZE in ARGS.sizes.split(',') if SIZE.strip()]
+
+    os.environ.update(AWS_REGION=ARGS.region, AWS_DEFAULT_REGION=ARGS.region, LOG_LEVEL='0', AWS_CALL_TRACE_ENABLED='1')
+    os.environ.setdefault('AWS_ACCESS_KEY_ID', 'testing')
+    os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'testing')
+    if ARGS.endpoint_url:
+        os.environ['AWS_ENDPOINT_URL'] = ARGS.endpoint_url
+        BACKEND = f'localstack({ARGS.endpoint_url})'
+    else:
+        from moto import mock_aws
+        mock_aws().start()
+        BACKEND = 'moto'
+
+    COMMIT = get_commit()
+    RESULTS = {
+        'meta': {
+            'commit': COMMIT,
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'backend': BACKEND,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'iterations': ARGS.iterations,
+            'heavy_iterations': ARGS.heavy_iterations,
+        },
+        'results': {},
+    }
+    APP = None
+    for SIZE in SIZES:
+        # 件数ごとにバケット・テーブルを分け、appモジュールを再読み込みしてコンテナ内の状態(キャッシュ等)を初期化する
+        os.environ.update(AWS_S3_BUCKET=f'bench-endpoints-{SIZE}', AWS_DYNAMODB_IMAGE_MNG_TABLE_NAME=f'bench-endpoints-{SIZE}')
+        APP = importlib.import_module('app') if APP is None else importlib.reload(APP)
+        START = time.perf_counter()
+        IDS = seed(APP, SIZE=SIZE, MAX_WORKERS=ARGS.seed_workers)
+        print(f'[{SIZE}] seeded in {time.perf_counter() - START:.1f} sec')
+        RESULTS['results'][str(SIZE)] = {}
+        for ROUTE, ITERATIONS, CREATE_EVENT in get_cases(IDS=IDS, ITERATIONS=ARGS.iterations, HEAVY_ITERATIONS=ARGS.heavy_iterations):
+            RESULT = run_case(APP, CREATE_EVENT=CREATE_EVENT, ITERATIONS=ITERATIONS)
+            RESULTS['results'][str(SIZE)][ROUTE] = RESULT
+            print(f'[{SIZE}] {ROUTE:<22} p50:{RESULT["p50_ms"]:>10.2f} ms  p99:{RESULT["p99_ms"]:>10.2f} ms  calls:{RESULT["aws_calls_per_request"]:>7.2f}  peak:{RESULT["peak_memory_bytes"] / 1024 / 1024:>8.2f} MiB  statuses:{RESULT["statuses"]}')
+
+    OUTPUT = ARGS.output or os.path.join(ROOT_DIR, 'bench', 'results', f'endpoints_{COMMIT}.json')
+    os.makedirs(os.path.dirname(os.path.abspath(OUTPUT)), exist_ok=True)
+    with open(OUTPUT, 'w', encoding='utf-8') as FILE:
+        json.dump(RESULTS, FILE, ensure_ascii=False, indent=2)
+    print(f'saved: {os.path.normpath(OUTPUT)}')
+    if ARGS.baseline:
+        with open(ARGS.baseline, 'r', encoding='utf-8') as FILE:
+            print_comparison(RESULTS=RESULTS, BASELINE=json.load(FILE))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""電子ペーパー向けフレームバッファ形式の変換・往復検証のベンチマーク
+
+テスト画像(グラデーション + 単色領域 + ノイズ)をJPEGで生成し、cEpaperConverterで7色へ減色した後、
+各出力形式(raw/rle/zlib、いずれもヘッダ付き)のサイズ・エンコード/デコード時間を計測する。あわせて、以下の往復変換が一致することを検証する。
+    PNG  → 色インデックス            : フレームバッファ(raw)をデコード・展開した色インデックスと一致
+    raw  → デコード → フレームバッファ : ヘッダの幅・高さ・CRC32と一致
+    rle  → デコード → フレームバッファ : rawと一致(ヘッダの幅・高さ・CRC32を含む)
+    zlib → デコード → フレームバッファ : rawと一致(ヘッダの幅・高さ・CRC32を含む)
+    RLE(PackBits)単体                : ランダムなバイト列(連続値を多く含む)で圧縮 → 展開が一致
+※画像変換のみを計測するため、AWSへの接続は不要。
+
+実行例(ルートフォルダから):
+    python bench/bench_framebuffer.py --width 4000 --height 3000
+"""
+import argparse
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import numpy as np
+from module.epaper_converter import cEpaperConverter
+from PIL import Image
+
+def create_source(WIDTH:int, HEIGHT:int) -> bytes:
+    """テスト画像(JPEG)の生成
+
+    Args:
+        WIDTH (int): 幅(単位:px)
+        HEIGHT (int): 高さ(単位:px)
+
+    Returns:
+        bytes: JPEGファイル
+    """
+    Y, X = np.mgrid[0:HEIGHT, 0:WIDTH]
+    PIXELS = np.stack([X * 255 // max(1, WIDTH - 1), Y * 255 // max(1, HEIGHT - 1), (X + Y) % 256], axis=-1).astype(np.uint8)
+    # 単色領域(RLEが有効な領域)とノイズ領域を含める
+    PIXELS[:HEIGHT // 4, :] = 255
+    PIXELS[HEIGHT // 2:HEIGHT // 2 + HEIGHT // 8, :WIDTH // 2] = np.random.default_rng(0).integers(0, 256, (HEIGHT // 8, WIDTH // 2, 3), dtype=np.uint8)
+    with io.BytesIO() as OUTPUT:
+        Image.fromarray(PIXELS).save(OUTPUT, format='JPEG', quality=90)
+        return OUTPUT.getvalue()
+
+def measure(FUNC, REPEAT:int) -> tuple[float, object]:
+    """所要時間の計測(REPEAT回の平均)
+
+    Args:
+        FUNC (_type_): 計測対象の処理
+        REPEAT (int): 繰り返し回数
+
+    Returns:
+        tuple[float, object]: [0]:1回あたりの所要時間(秒), [1]:最後の戻り値
+    """
+    START = time.perf_counter()
+    for _ in range(REPEAT):
+        RESULT = FUNC()
+    return (time.perf_counter() - START) / REPEAT, RESULT
+
+def main() -> int:
+    PARSER = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    PARSER.add_argument('--width', type=int, default=4000, help='テスト画像の幅')
+    PARSER.add_argument('--height', type=int, default=3000, help='テスト画像の高さ')
+    PARSER.add_argument('--repeat', type=int, default=5, help='エンコード/デコードの繰り返し回数')
+    ARGS = PARSER.parse_args()
+
+    CONVERTER = cEpaperConverter()
+    SRC = create_source(WIDTH=ARGS.width, HEIGHT=ARGS.height)
+    CONVERT_SEC, OUTPUTS = measure(lambda: CONVERTER.convert(SRC=SRC), REPEAT=1)
+    if OUTPUTS is None:
+        print('convert   : NG')
+        return 1
+    RAW, _, _ = cEpaperConverter.decode_framebuffer(SRC=OUTPUTS[cEpaperConverter.FORMAT_RAW])
+    with Image.open(io.BytesIO(OUTPUTS[cEpaperConverter.FORMAT_PNG])) as PNG:
+        INDEXES = np.asarray(PNG)
+    results:dict[str, bool] = {'png': bool((cEpaperConverter.unpack_framebuffer(RAW=RAW, WIDTH=CONVERTER.WIDTH, HEIGHT=CONVERTER.HEIGHT) == INDEXES).all())}
+
+    print(f'source    : {ARGS.width}x{ARGS.height} JPEG {len(SRC):,} bytes')
+    print(f'convert   : {CONVERT_SEC:.3f} sec')
+    print(f'{"format":<10}{"bytes":>10}{"encode":>12}{"decode":>12}')
+    print(f'{"png":<10}{len(OUTPUTS[cEpaperConverter.FORMAT_PNG]):>10,}')
+    for FORMAT in (cEpaperConverter.FORMAT_RAW, cEpaperConverter.FORMAT_RLE, cEpaperConverter.FORMAT_ZLIB):
+        ENCODE_SEC, ENCODED = measure(lambda: cEpaperConverter.encode_framebuffer(RAW=RAW, WIDTH=CONVERTER.WIDTH, HEIGHT=CONVERTER.HEIGHT, FORMAT=FORMAT), REPEAT=ARGS.repeat)
+        DECODE_SEC, DECODED = measure(lambda: cEpaperConverter.decode_framebuffer(SRC=ENCODED), REPEAT=ARGS.repeat)
+        results[FORMAT] = ENCODED == OUTPUTS[FORMAT] and DECODED == (RAW, CONVERTER.WIDTH, CONVERTER.HEIGHT)
+        print(f'{FORMAT:<10}{len(ENCODED):>10,}{ENCODE_SEC * 1000:>10.1f}ms{DECODE_SEC * 1000:>10.1f}ms')
+
+    RNG = np.random.default_rng(1)
+    PACKBITS_DATAS = [bytes(RNG.choice([0x00, 0x11, 0x6F, 0xFF], size=int(RNG.integers(0, 1024)), p=[0.7, 0.1, 0.1, 0.1]).astype(np.uint8)) for _ in range(200)]
+    results['packbits'] = all(cEpaperConverter.decode_rle(SRC=cEpaperConverter.encode_rle(SRC=DATA)) == DATA for DATA in PACKBITS_DATAS + [b'', b'\x01', b'\x02' * 1000])
+
+    IS_SAME = all(results.values())
+    print(f'round-trip: {" ".join(f"{NAME}:{"OK" if RESULT else "NG"}" for NAME, RESULT in results.items())}')
+    print(f'identical : {"OK" if IS_SAME else "NG"}')
+    return 0 if IS_SAME else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,45 @@
+"""ログ出力(cLoggerWrapper.output)のマイクロベンチマーク
+
+LOG_LEVELにより出力対象外となるログ呼び出し1回あたりのオーバーヘッドを測定する。
+参考値として、従来の実装が出力判定前に行っていた inspect.stack() および現在時刻の整形のコストも測定する。
+
+実行例(ルートフォルダから):
+    python bench/bench_logger.py --number 100000
+"""
+import argparse
+import inspect
+import logging
+import os
+import sys
+import timeit
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from module.aws_mng import cAwsAccessMng
+from module.logger_wrapper import cLoggerWrapper
+
+def main() -> int:
+    PARSER = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    PARSER.add_argument('--number', type=int, default=100000, help='測定回数')
+    ARGS = PARSER.parse_args()
+
+    # DEBUGログが出力対象外となるレベルで生成
+    LOGGER_WRAPPER = cLoggerWrapper(LEVEL=logging.WARN)
+    AWS_MNG = cAwsAccessMng(REGION_NAME='ap-northeast-1', S3_BUCKET='bucket', DYNAMO_DB_IMAGE_MNG_TABLE_NAME='table', LOGGER_WRAPPER=LOGGER_WRAPPER)
+    COUNT = 10
+    CASES = {
+        'suppressed, lazy msg (lambda)': lambda: LOGGER_WRAPPER.output(MSG=lambda: f'self:<{AWS_MNG}>, COUNT:{COUNT}', PREFIX='::Enter'),
+        'suppressed, eager f-string msg': lambda: LOGGER_WRAPPER.output(MSG=f'self:<{AWS_MNG}>, COUNT:{COUNT}', PREFIX='::Enter'),
+        'is_enabled() guard only': lambda: LOGGER_WRAPPER.is_enabled(logging.DEBUG),
+        '(reference) inspect.stack()[1]': lambda: inspect.stack()[1],
+        '(reference) timestamp format': lambda: datetime.now().strftime("%Y/%m/%d %H:%M:%S.%f")[:-3],
+    }
+    for NAME, FUNC in CASES.items():
+        NUMBER = ARGS.number if not NAME.startswith('(reference) inspect') else max(ARGS.number // 100, 100)
+        SEC = timeit.timeit(FUNC, number=NUMBER)
+        print(f'{NAME:<34}: {SEC / NUMBER * 1e9:>12,.0f} ns/call')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,14 +1,41 @@
-from aws_lambda_powertools.event_handler import APIGatewayRestResolver
+from aws_lambda_powertools.event_handler import APIGatewayRestResolver, Response, content_types
+from aws_lambda_powertools.event_handler.middlewares import NextMiddleware
 from http import HTTPStatus
+from module.aws_call_tracer import cAwsCallTracer
+from module.aws_client_factory import cAwsClientFactory
 from module.aws_mng import cAwsAccessMng
 from module.common_func import cCommonFunc
 from module.env_mng import cEnvMng
 from module.logger_wrapper import cLoggerWrapper
+from module.response_codec import cResponseCodec
 
 ENV_MNG = cEnvMng()
 LOGGER_WRAPPER:cLoggerWrapper = cLoggerWrapper(LEVEL=ENV_MNG.LOG_LEVEL)
-AWS_MNG = cAwsAccessMng(REGION_NAME=ENV_MNG.AWS_REGION, S3_BUCKET=ENV_MNG.AWS_S3_BUCKET, DYNAMO_DB_IMAGE_MNG_TABLE_NAME=ENV_MNG.AWS_DYNAMODB_IMAGE_MNG_TABLE_NAME, LOGGER_WRAPPER=LOGGER_WRAPPER)
-app = APIGatewayRestResolver()
+AWS_CALL_TRACER:cAwsCallTracer = cAwsCallTracer(ENABLED=ENV_MNG.AWS_CALL_TRACE_ENABLED)
+AWS_CLIENT_FACTORY:cAwsClientFactory = cAwsClientFactory(REGION_NAME=ENV_MNG.AWS_REGION, MAX_POOL_CONNECTIONS=max(ENV_MNG.AWS_CLIENT_MAX_POOL_CONNECTIONS, ENV_MNG.S3_LIST_MAX_WORKERS), CONNECT_TIMEOUT=ENV_MNG.AWS_CLIENT_CONNECT_TIMEOUT, READ_TIMEOUT=ENV_MNG.AWS_CLIENT_READ_TIMEOUT, TCP_KEEPALIVE=ENV_MNG.AWS_CLIENT_TCP_KEEPALIVE, RETRY_MODE=ENV_MNG.AWS_CLIENT_RETRY_MODE, MAX_ATTEMPTS=ENV_MNG.AWS_CLIENT_MAX_ATTEMPTS, LOGGER_WRAPPER=LOGGER_WRAPPER)
+AWS_MNG = cAwsAccessMng(REGION_NAME=ENV_MNG.AWS_REGION, S3_BUCKET=ENV_MNG.AWS_S3_BUCKET, DYNAMO_DB_IMAGE_MNG_TABLE_NAME=ENV_MNG.AWS_DYNAMODB_IMAGE_MNG_TABLE_NAME, LOGGER_WRAPPER=LOGGER_WRAPPER, SIGNED_URL_CACHE_SIZE=ENV_MNG.SIGNED_URL_CACHE_SIZE, SIGNED_URL_CACHE_REFRESH_RATIO=ENV_MNG.SIGNED_URL_CACHE_REFRESH_RATIO, S3_LIST_MAX_WORKERS=ENV_MNG.S3_LIST_MAX_WORKERS, AWS_CALL_TRACER=AWS_CALL_TRACER, AWS_CLIENT_FACTORY=AWS_CLIENT_FACTORY, CATALOG_CACHE_MAX_ITEMS=ENV_MNG.CATALOG_CACHE_MAX_ITEMS)
+# 初期化フェーズでクライアントを生成しておく(AWSへの通信は行わない)
+AWS_MNG.create_clients()
+RESPONSE_CODEC:cResponseCodec = cResponseCodec(MIN_SIZE=ENV_MNG.RESPONSE_COMPRESS_MIN_SIZE, LOGGER_WRAPPER=LOGGER_WRAPPER)
+app = APIGatewayRestResolver(serializer=RESPONSE_CODEC.serialize)
+
+def _trace_route_middleware(app:APIGatewayRestResolver, next_middleware:NextMiddleware) -> Response:
+    """AWS呼び出し計測のルートをルート定義(ex:"GET /images/<COUNT>")に置き換えるミドルウェア
+    ※APIGatewayは{proxy+}で全パスを受けるため、イベントのresourceではルートを区別できない
+
+    Args:
+        app (APIGatewayRestResolver): リゾルバ
+        next_middleware (NextMiddleware): 次のミドルウェア
+
+    Returns:
+        Response: 応答
+    """
+    ROUTE = app.context.get('_route', None)
+    if not ROUTE is None:
+        AWS_CALL_TRACER.set_route(ROUTE=f'{ROUTE.method} {ROUTE.path}')
+    return next_middleware(app)
+
+app.use(middlewares=[_trace_route_middleware])
 
 @app.post("/signed_url")
 def get_signedurl() -> tuple[dict[str, str|list], int]:
@@ -17,14 +44,14 @@ def get_signedurl() -> tuple[dict[str, str|list], int]:
     Returns:
         tuple[dict[str, str|list], int]: [0]:応答内容dict(ex:{'result':'OK', 'signed_urls':[{'src.png':'http://～'}, ...]}), [1]:ステータスコード
     """
-    LOGGER_WRAPPER.output(f'', PREFIX='::Enter')
+    LOGGER_WRAPPER.output('', PREFIX='::Enter')
     JSON_DATA:dict = {} if app.current_event is None or not hasattr(app.current_event, 'json_body') else app.current_event.json_body
     IMAGE_FILE_PATHS:list[str] = JSON_DATA.get('images', [])
 
     RESULT_DATAS:dict[str, str|list] = {cCommonFunc.API_RESP_DICT_KEY_RESULT:'', cCommonFunc.API_RESP_DICT_KEY_SIGNED_URLS:[]}
     STATUS = AWS_MNG.get_signed_urls_for_put_object(IMAGE_FILE_PATHS=IMAGE_FILE_PATHS, API_RESULT_DATAS=RESULT_DATAS)
     _set_api_result_msg(STATUS_CODE=STATUS, RESULT_DATAS=RESULT_DATAS)
-    LOGGER_WRAPPER.output(f'RESULT_DATAS:{RESULT_DATAS}, STATUS:{STATUS}', PREFIX='::Leave')
+    LOGGER_WRAPPER.output(lambda: f'RESULT_DATAS:{RESULT_DATAS}, STATUS:{STATUS}', PREFIX='::Leave')
     return RESULT_DATAS, STATUS
 
 @app.get("/update_table")
@@ -34,46 +61,101 @@ def update_table() -> tuple[dict[str, str], int]:
     Returns:
         tuple[dict[str, str], int]: [0]:応答内容dict(ex:{'result':'OK'}), [1]:ステータスコード
     """
-    LOGGER_WRAPPER.output(f'', PREFIX='::Enter')
+    LOGGER_WRAPPER.output('', PREFIX='::Enter')
     RESULT_DATAS:dict[str, str] = {cCommonFunc.API_RESP_DICT_KEY_RESULT:''}
     STATUS = AWS_MNG.force_update_image_mng_hash_table(API_RESULT_DATAS=RESULT_DATAS)
     _set_api_result_msg(STATUS_CODE=STATUS, RESULT_DATAS=RESULT_DATAS)
-    LOGGER_WRAPPER.output(f'RESULT_DATAS:{RESULT_DATAS}, STATUS:{STATUS}', PREFIX='::Leave')
+    LOGGER_WRAPPER.output(lambda: f'RESULT_DATAS:{RESULT_DATAS}, STATUS:{STATUS}', PREFIX='::Leave')
     return RESULT_DATAS, STATUS
 
 @app.get("/images")
 @app.get("/images/<COUNT>")
-def get_images(COUNT:int = 0) -> tuple[dict[str, str|list], int]:
+def get_images(COUNT:int|str = 0) -> tuple[dict[str, str|list], int]:
     """画像リスト要求
 
     Args:
-        COUNT (int, optional): 取得する画像リスト数(0の場合は全件取得). Defaults to 0.
+        COUNT (int|str, optional): 取得する画像リスト数(0の場合は全件取得). Defaults to 0.
 
     Returns:
-        tuple[dict[str, str|list], int]: [0]:応答内容dict(ex:{'result':'OK', 'data':[{'id':'abcd...', 'convertible':'undetermined', 'url':'http://～'}, ...]}), [1]:ステータスコード
+        tuple[dict[str, str|list], int]: [0]:応答内容dict(ex:{'result':'OK', 'data':[{'id':'abcd...', 'convertible':'undetermined', 'url':'http://～'}, ...], 'next_token':'eyJp...'}), [1]:ステータスコード
     """
-    LOGGER_WRAPPER.output(f'COUNT:{COUNT}', PREFIX='::Enter')
+    LOGGER_WRAPPER.output(lambda: f'COUNT:{COUNT}', PREFIX='::Enter')
+    # パスパラメータは文字列で渡されるため数値に変換(数値以外は不正値として扱う)
+    PAGE_SIZE:int = int(COUNT) if str(COUNT).lstrip('-').isdigit() else -1
+    NEXT_TOKEN:str = '' if app.current_event is None else app.current_event.get_query_string_value(name=cCommonFunc.API_RESP_DICT_KEY_NEXT_TOKEN, default_value='')
     RESULT_DATAS:dict[str, str|list] = {cCommonFunc.API_RESP_DICT_KEY_RESULT:'', cCommonFunc.API_RESP_DICT_KEY_DATA:[]}
-    STATUS = AWS_MNG.get_images(COUNT=COUNT, API_RESULT_DATAS=RESULT_DATAS)
+    STATUS = AWS_MNG.get_images(COUNT=PAGE_SIZE, API_RESULT_DATAS=RESULT_DATAS, NEXT_TOKEN=NEXT_TOKEN)
     _set_api_result_msg(STATUS_CODE=STATUS, RESULT_DATAS=RESULT_DATAS)
-    LOGGER_WRAPPER.output(f'COUNT:{COUNT}, RESULT_DATAS.{cCommonFunc.API_RESP_DICT_KEY_RESULT}:{RESULT_DATAS.get(cCommonFunc.API_RESP_DICT_KEY_RESULT, "")}, len(RESULT_DATAS.{cCommonFunc.API_RESP_DICT_KEY_DATA}):{len(RESULT_DATAS.get(cCommonFunc.API_RESP_DICT_KEY_DATA, []))}, STATUS:{STATUS}', PREFIX='::Leave')
+    LOGGER_WRAPPER.output(lambda: f'COUNT:{COUNT}, RESULT_DATAS.{cCommonFunc.API_RESP_DICT_KEY_RESULT}:{RESULT_DATAS.get(cCommonFunc.API_RESP_DICT_KEY_RESULT, "")}, len(RESULT_DATAS.{cCommonFunc.API_RESP_DICT_KEY_DATA}):{len(RESULT_DATAS.get(cCommonFunc.API_RESP_DICT_KEY_DATA, []))}, STATUS:{STATUS}', PREFIX='::Leave')
     return RESULT_DATAS, STATUS
 
+@app.get("/export")
+def export_images() -> Response:
+    """画像カタログのエクスポート要求(NDJSON)
+    ※クエリ文字列"segment"/"total_segments"で並列スキャンのセグメントを、"presign"(1:署名付きURLを出力)で"url"の出力内容を指定する
+
+    Returns:
+        Response: 応答(本文:NDJSON(1行:{"id", "url", "last_modified", "convertible"})、ヘッダ:X-Next-Token(続きが存在する場合のみ))
+    """
+    LOGGER_WRAPPER.output('', PREFIX='::Enter')
+    QUERY:dict[str, str] = {} if app.current_event is None else (app.current_event.query_string_parameters or {})
+    # クエリ文字列は文字列で渡されるため数値に変換(数値以外は不正値として扱う)
+    SEGMENT:int = int(QUERY.get('segment', '0')) if QUERY.get('segment', '0').isdigit() else -1
+    TOTAL_SEGMENTS:int = int(QUERY.get('total_segments', '1')) if QUERY.get('total_segments', '1').isdigit() else -1
+    IS_PRESIGN:bool = QUERY.get('presign', '0') == '1'
+    NEXT_TOKEN:str = QUERY.get(cCommonFunc.API_RESP_DICT_KEY_NEXT_TOKEN, '')
+    RESULT_DATAS:dict[str, str] = {cCommonFunc.API_RESP_DICT_KEY_RESULT:'', cCommonFunc.API_RESP_DICT_KEY_NEXT_TOKEN:''}
+    LINES:list[str] = []
+    STATUS = AWS_MNG.export_images(API_RESULT_DATAS=RESULT_DATAS, LINES=LINES, SEGMENT=SEGMENT, TOTAL_SEGMENTS=TOTAL_SEGMENTS, IS_PRESIGN=IS_PRESIGN, NEXT_TOKEN=NEXT_TOKEN, MAX_BYTES=ENV_MNG.EXPORT_MAX_BYTES)
+    _set_api_result_msg(STATUS_CODE=STATUS, RESULT_DATAS=RESULT_DATAS)
+    LOGGER_WRAPPER.output(lambda: f'SEGMENT:{SEGMENT}, TOTAL_SEGMENTS:{TOTAL_SEGMENTS}, IS_PRESIGN:{IS_PRESIGN}, len(LINES):{len(LINES)}, RESULT_DATAS:{RESULT_DATAS}, STATUS:{STATUS}', PREFIX='::Leave')
+    if STATUS != HTTPStatus.OK:
+        return Response(status_code=STATUS, content_type=content_types.APPLICATION_JSON, body=RESULT_DATAS)
+    NEXT_TOKEN = RESULT_DATAS.get(cCommonFunc.API_RESP_DICT_KEY_NEXT_TOKEN, '')
+    HEADERS:dict[str, str] = {} if len(NEXT_TOKEN) <= 0 else {'X-Next-Token':NEXT_TOKEN}
+    return Response(status_code=STATUS, content_type='application/x-ndjson', body=''.join(f'{LINE}\n' for LINE in LINES), headers=HEADERS)
+
 @app.get("/image/<ID>")
-def get_image(ID:str) -> tuple[dict[str, str], int]:
+def get_image(ID:str) -> Response:
     """画像要求
+    ※応答ヘッダにETagを設定し、リクエストヘッダ"If-None-Match"と一致する場合は本文なしの304を返す
 
     Args:
         ID (str): 画像ID
 
     Returns:
-        tuple[dict[str, str], int]: [0]:応答内容dict(ex:{'result':'OK', 'url':'http://～'}), [1]:ステータスコード
+        Response: 応答(本文:応答内容dict(ex:{'result':'OK', 'url':'http://～'}), ヘッダ:ETag)
     """
-    LOGGER_WRAPPER.output(f'ID:{ID}', PREFIX='::Enter')
+    LOGGER_WRAPPER.output(lambda: f'ID:{ID}', PREFIX='::Enter')
+    # 圧縮した応答のETagは圧縮方式を付与しているため、除去してから比較する
+    IF_NONE_MATCH:str = '' if app.current_event is None else cResponseCodec.remove_etag_encoding(IF_NONE_MATCH=app.current_event.get_header_value(name='If-None-Match', default_value='', case_sensitive=False))
     RESULT_DATAS:dict[str, str] = {cCommonFunc.API_RESP_DICT_KEY_RESULT:'', cCommonFunc.API_RESP_DICT_KEY_URL:''}
-    STATUS = AWS_MNG.get_signed_urls_for_get_object_to_id(ID=ID, API_RESULT_DATAS=RESULT_DATAS)
+    HEADERS:dict[str, str] = {}
+    STATUS = AWS_MNG.get_signed_urls_for_get_object_to_id(ID=ID, API_RESULT_DATAS=RESULT_DATAS, IF_NONE_MATCH=IF_NONE_MATCH, RESPONSE_HEADERS=HEADERS)
     _set_api_result_msg(STATUS_CODE=STATUS, RESULT_DATAS=RESULT_DATAS)
-    LOGGER_WRAPPER.output(f'ID:{ID}, RESULT_DATAS:{RESULT_DATAS}, STATUS:{STATUS}', PREFIX='::Leave')
+    LOGGER_WRAPPER.output(lambda: f'ID:{ID}, RESULT_DATAS:{RESULT_DATAS}, STATUS:{STATUS}', PREFIX='::Leave')
+    if STATUS == HTTPStatus.NOT_MODIFIED:
+        return Response(status_code=STATUS, body='', headers=HEADERS)
+    return Response(status_code=STATUS, content_type=content_types.APPLICATION_JSON, body=RESULT_DATAS, headers=HEADERS)
+
+@app.get("/image/<ID>/framebuffer")
+def get_image_framebuffer(ID:str) -> tuple[dict[str, str], int]:
+    """電子ペーパー向けに変換した画像の要求
+    ※クエリ文字列"format"で出力形式(raw/rle/zlib:ヘッダ付きのフレームバッファ(無圧縮/RLE圧縮/zlib圧縮), png:インデックスカラーのPNG)を指定する(省略時はzlib)
+
+    Args:
+        ID (str): 画像ID
+
+    Returns:
+        tuple[dict[str, str], int]: [0]:応答内容dict(ex:{'result':'OK', 'url':'http://～'}), [1]:ステータスコード(画像が変換されていない場合は409、指定の出力形式の変換した画像が存在しない場合は404)
+    """
+    LOGGER_WRAPPER.output(lambda: f'ID:{ID}', PREFIX='::Enter')
+    QUERY:dict[str, str] = {} if app.current_event is None else (app.current_event.query_string_parameters or {})
+    FORMAT:str = QUERY.get('format', 'zlib')
+    RESULT_DATAS:dict[str, str] = {cCommonFunc.API_RESP_DICT_KEY_RESULT:'', cCommonFunc.API_RESP_DICT_KEY_URL:''}
+    STATUS = AWS_MNG.get_signed_url_for_converted_object_to_id(ID=ID, FORMAT=FORMAT, API_RESULT_DATAS=RESULT_DATAS)
+    _set_api_result_msg(STATUS_CODE=STATUS, RESULT_DATAS=RESULT_DATAS)
+    LOGGER_WRAPPER.output(lambda: f'ID:{ID}, FORMAT:{FORMAT}, RESULT_DATAS:{RESULT_DATAS}, STATUS:{STATUS}', PREFIX='::Leave')
     return RESULT_DATAS, STATUS
 
 @app.patch("/image/<ID>")
@@ -84,15 +166,17 @@ def update_image_data(ID:str) -> tuple[dict[str, str], int]:
         ID (str): 画像ID
 
     Returns:
-        tuple[dict[str, str], int]: [0]:応答内容dict(ex:{'result':'OK'}), [1]:ステータスコード
+        tuple[dict[str, str], int]: [0]:応答内容dict(ex:{'result':'OK'}), [1]:ステータスコード(期待する画像変換状態と異なる場合は409)
     """
-    LOGGER_WRAPPER.output(f'ID:{ID}', PREFIX='::Enter')
+    LOGGER_WRAPPER.output(lambda: f'ID:{ID}', PREFIX='::Enter')
     JSON_DATA:dict = {} if app.current_event is None or not hasattr(app.current_event, 'json_body') else app.current_event.json_body
     CONVERTIBLE:str = JSON_DATA.get('convertible', '')
+    # 更新前に期待する画像変換状態(任意 ※指定時は一致する場合のみ更新)
+    EXPECTED:str = str(JSON_DATA.get('expected', None) or '')
     RESULT_DATAS:dict[str, str] = {cCommonFunc.API_RESP_DICT_KEY_RESULT:''}
-    STATUS = AWS_MNG.update_hash_table_image_convertible_state(ID=ID, CONVERTIBLE=CONVERTIBLE, API_RESULT_DATAS=RESULT_DATAS)
+    STATUS = AWS_MNG.update_hash_table_image_convertible_state(ID=ID, CONVERTIBLE=CONVERTIBLE, API_RESULT_DATAS=RESULT_DATAS, EXPECTED=EXPECTED)
     _set_api_result_msg(STATUS_CODE=STATUS, RESULT_DATAS=RESULT_DATAS)
-    LOGGER_WRAPPER.output(f'ID:{ID}, RESULT_DATAS:{RESULT_DATAS}, STATUS:{STATUS}', PREFIX='::Leave')
+    LOGGER_WRAPPER.output(lambda: f'ID:{ID}, RESULT_DATAS:{RESULT_DATAS}, STATUS:{STATUS}', PREFIX='::Leave')
     return RESULT_DATAS, STATUS
 
 @app.delete("/deletes")
@@ -100,26 +184,22 @@ def delete_image() -> tuple[dict[str, str], int]:
     """画像削除要求
 
     Returns:
-        tuple[dict[str, str], int]: [0]:応答内容dict(ex:{'result':['OK','NG',...])}, [1]:ステータスコード
+        tuple[dict[str, str], int]: [0]:応答内容dict(ex:{'result':['OK','NG',...])}, [1]:ステータスコード(スループット超過で未処理のIDがある場合は503)
     """
     # リクエストボディからIDリストを取り出す
-    LOGGER_WRAPPER.output(f'', PREFIX='::Enter')
+    LOGGER_WRAPPER.output('', PREFIX='::Enter')
     JSON_DATA:dict = {} if app.current_event is None or not hasattr(app.current_event, 'json_body') else app.current_event.json_body
     ids:list[str] = JSON_DATA.get('ids', [])
 
-    LOGGER_WRAPPER.output(f'IDs:{ids}', PREFIX='::Enter')
+    LOGGER_WRAPPER.output(lambda: f'IDs:{ids}', PREFIX='::Enter')
     RESULT_DATAS:dict[str, str|list] = {cCommonFunc.API_RESP_DICT_KEY_RESULT:['']}
-    RESULT_DATAS_2:dict[str, str|list] = {cCommonFunc.API_RESP_DICT_KEY_RESULT:['']}
 
-    # S3バケット削除処理
-    STATUS, RESULT_DATAS = AWS_MNG.delete_object_for_S3backet(ids=ids, API_RESULT_DATAS=RESULT_DATAS)
-    # dynamoDB削除処理
-    STATUS_2, RESULT_DATAS_2 = AWS_MNG.deleteitem_to_dynamodb_image_mng_table(ids=ids, API_RESULT_DATAS=RESULT_DATAS)
+    # S3バケットおよびdynamoDBの一括削除処理
+    STATUS = AWS_MNG.delete_images(IDS=ids, API_RESULT_DATAS=RESULT_DATAS)
 
     _set_delete_api_result_msg(STATUS_CODE=STATUS, RESULT_DATAS=RESULT_DATAS)
 
-    LOGGER_WRAPPER.output(f'IDs:{ids}, RESULT_DATAS:{RESULT_DATAS}, STATUS:{STATUS}', PREFIX='::Leave')
-    LOGGER_WRAPPER.output(f'', PREFIX='::Leave')
+    LOGGER_WRAPPER.output(lambda: f'IDs:{ids}, RESULT_DATAS:{RESULT_DATAS}, STATUS:{STATUS}', PREFIX='::Leave')
     return RESULT_DATAS, STATUS
 
 def _set_delete_api_result_msg(STATUS_CODE:int, RESULT_DATAS:dict[str, str|list]) -> bool:
@@ -157,5 +237,14 @@ def lambda_handler(event, context) -> dict[str, type]:
     Returns:
         dict[str, type]: _description_
     """
-    RESULT = app.resolve(event, context)
+    # AWS呼び出し計測はルート定義単位で集計する(ルート未確定時はリクエストパス)
+    AWS_CALL_TRACER.begin(ROUTE=f'{event.get("httpMethod", "")} {event.get("path", "")}')
+    try:
+        # S3バケット・DynamoDBテーブル(インデックス含む)の存在確認(確認済みの場合は通信しない)
+        AWS_MNG.initialize()
+        RESULT = app.resolve(event, context)
+        # 応答本文をリクエストヘッダ"Accept-Encoding"に応じて圧縮する(最小サイズ未満は無圧縮)
+        RESULT = RESPONSE_CODEC.compress_response(RESPONSE=RESULT, ACCEPT_ENCODING=cResponseCodec.get_accept_encoding(EVENT=event))
+    finally:
+        AWS_CALL_TRACER.emit()
     return RESULT
@@ -0,0 +1,317 @@
+"""AWS呼び出し計測処理
+"""
+from contextlib import contextmanager
+from collections.abc import Iterator
+from threading import Lock
+
+import json
+import sys
+import time
+
+class cAwsCallTracer:
+    """AWS呼び出し計測クラス
+    ※botocoreのイベントフックでAPI呼び出しごとの回数・送受信バイト数・所要時間を操作(サービス名.操作名)単位で集計し、
+    Lambda呼び出しの終了時にCloudWatch Embedded Metric Format(EMF)のJSONとして標準出力へ出力する。
+    ルート単位の合計(1行)に加え、操作単位の集計をルート・操作をディメンションとしたメトリクス(操作ごとに1行)として出力する。
+    署名付きURL発行のようにAPI呼び出しを伴わない処理はmeasure()で計測する。
+    """
+
+    NAMESPACE:str = 'EPaperAppServer'
+    """メトリクスの名前空間
+    """
+
+    DIMENSION_ROUTE:str = 'Route'
+    """ルートのディメンション名
+    """
+
+    DIMENSION_OPERATION:str = 'Operation'
+    """操作(サービス名.操作名)のディメンション名
+    """
+
+    CONTEXT_KEY_START:str = '_aws_call_tracer_start'
+    """呼び出し開始時刻を保持するリクエストコンテキストのキー名
+    """
+
+    CONTEXT_KEY_BYTES_OUT:str = '_aws_call_tracer_bytes_out'
+    """送信バイト数を保持するリクエストコンテキストのキー名
+    """
+
+    def __init__(self, ENABLED:bool = True, NAMESPACE:str = NAMESPACE) -> None:
+        """AWS呼び出し計測クラスのコンストラクタ
+
+        Args:
+            ENABLED (bool, optional): 計測の有効/無効(無効の場合はフック登録・出力を行わない). Defaults to True.
+            NAMESPACE (str, optional): メトリクスの名前空間. Defaults to NAMESPACE.
+        """
+        self._enabled:bool = ENABLED
+        self._namespace:str = NAMESPACE
+        self._route:str = ''
+        self._started_at:float = time.perf_counter()
+        # 操作名 → [回数, エラー数, 送信バイト数, 受信バイト数, 所要時間(秒)]
+        self._operations:dict[str, list[int|float]] = {}
+        self._attached_ids:set[int] = set()
+        self._lock:Lock = Lock()
+
+    def __str__(self) -> str:
+        """現在のオブジェクトを表す文字列を返す
+
+        Returns:
+            str: 現在のオブジェクトを表す文字列
+        """
+        return f'ENABLED:{self.ENABLED}, NAMESPACE:{self._namespace}, ROUTE:{self.ROUTE}, len(OPERATIONS):{len(self._operations)}'
+
+    @property
+    def ENABLED(self) -> bool:
+        """計測の有効/無効 取得
+
+        Returns:
+            bool: 有効時はTrue、それ以外はFalse
+        """
+        return self._enabled
+
+    @property
+    def ROUTE(self) -> str:
+        """計測中のルート 取得
+
+        Returns:
+            str: 計測中のルート(ex:"GET /images/<COUNT>")
+        """
+        return self._route
+
+    def attach(self, CLIENT) -> None:
+        """boto3クライアントへの計測フック登録(同一クライアントへの重複登録は行わない)
+
+        Args:
+            CLIENT (_type_): boto3クライアントのインスタンス
+        """
+        if not self._enabled or CLIENT is None or id(CLIENT) in self._attached_ids:
+            return
+        self._attached_ids.add(id(CLIENT))
+        EVENTS = CLIENT.meta.events
+        EVENTS.register('before-call.*.*', self._on_before_call)
+        EVENTS.register('request-created.*.*', self._on_request_created)
+        EVENTS.register('after-call.*.*', self._on_after_call)
+        EVENTS.register('after-call-error.*.*', self._on_after_call_error)
+
+    def begin(self, ROUTE:str = '') -> None:
+        """計測開始(集計結果の初期化)
+
+        Args:
+            ROUTE (str, optional): 計測対象のルート(ex:"GET /images/10"). Defaults to ''.
+        """
+        with self._lock:
+            self._route = ROUTE
+            self._started_at = time.perf_counter()
+            self._operations = {}
+
+    def set_route(self, ROUTE:str) -> None:
+        """計測中のルートの設定(ルーティング確定後にルート定義で上書きする場合に使用)
+
+        Args:
+            ROUTE (str): 計測対象のルート(ex:"GET /images/<COUNT>")
+        """
+        with self._lock:
+            self._route = ROUTE
+
+    def record(self, OPERATION:str, DURATION:float, BYTES_OUT:int = 0, BYTES_IN:int = 0, IS_ERROR:bool = False) -> None:
+        """呼び出し結果の集計
+
+        Args:
+            OPERATION (str): 操作名(ex:"dynamodb.Scan", "s3.Presign")
+            DURATION (float): 所要時間(単位:秒)
+            BYTES_OUT (int, optional): 送信バイト数. Defaults to 0.
+            BYTES_IN (int, optional): 受信バイト数. Defaults to 0.
+            IS_ERROR (bool, optional): エラー応答の場合はTrue. Defaults to False.
+        """
+        if not self._enabled:
+            return
+        with self._lock:
+            STATS = self._operations.setdefault(OPERATION, [0, 0, 0, 0, 0.0])
+            STATS[0] += 1
+            STATS[1] += 1 if IS_ERROR else 0
+            STATS[2] += BYTES_OUT
+            STATS[3] += BYTES_IN
+            STATS[4] += DURATION
+
+    @contextmanager
+    def measure(self, OPERATION:str) -> Iterator[None]:
+        """with文で囲んだ処理の所要時間を集計
+
+        Args:
+            OPERATION (str): 操作名(ex:"s3.Presign")
+        """
+        STARTED_AT = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(OPERATION=OPERATION, DURATION=time.perf_counter() - STARTED_AT)
+
+    def get_summary(self) -> dict[str, str|int|float|dict]:
+        """集計結果(EMF形式)の取得
+        ※"Operations"キーの操作単位の集計はログ参照用(メトリクスではない)で、メトリクスはget_operation_summaries()で取得する
+
+        Returns:
+            dict[str, str|int|float|dict]: EMF形式の集計結果
+        """
+        with self._lock:
+            OPERATIONS = {OPERATION:{'count':STATS[0], 'errors':STATS[1], 'bytes_out':STATS[2], 'bytes_in':STATS[3], 'duration_ms':round(STATS[4] * 1000, 3)} for OPERATION, STATS in sorted(self._operations.items())}
+            DURATION_MS = round((time.perf_counter() - self._started_at) * 1000, 3)
+            ROUTE = self._route
+        return {
+            '_aws': {
+                'Timestamp': int(time.time() * 1000),
+                'CloudWatchMetrics': [{
+                    'Namespace': self._namespace,
+                    'Dimensions': [[self.DIMENSION_ROUTE]],
+                    'Metrics': [
+                        {'Name':'RequestDuration', 'Unit':'Milliseconds'},
+                        {'Name':'AwsCallCount', 'Unit':'Count'},
+                        {'Name':'AwsCallErrors', 'Unit':'Count'},
+                        {'Name':'AwsCallDuration', 'Unit':'Milliseconds'},
+                        {'Name':'AwsCallBytesOut', 'Unit':'Bytes'},
+                        {'Name':'AwsCallBytesIn', 'Unit':'Bytes'},
+                    ],
+                }],
+            },
+            self.DIMENSION_ROUTE: ROUTE,
+            'RequestDuration': DURATION_MS,
+            'AwsCallCount': sum(STATS['count'] for STATS in OPERATIONS.values()),
+            'AwsCallErrors': sum(STATS['errors'] for STATS in OPERATIONS.values()),
+            'AwsCallDuration': round(sum(STATS['duration_ms'] for STATS in OPERATIONS.values()), 3),
+            'AwsCallBytesOut': sum(STATS['bytes_out'] for STATS in OPERATIONS.values()),
+            'AwsCallBytesIn': sum(STATS['bytes_in'] for STATS in OPERATIONS.values()),
+            'Operations': OPERATIONS,
+        }
+
+    def get_operation_summaries(self) -> list[dict[str, str|int|float|dict]]:
+        """操作単位の集計結果(EMF形式、ルート・操作をディメンションとする)の取得
+
+        Returns:
+            list[dict[str, str|int|float|dict]]: 操作ごとのEMF形式の集計結果リスト
+        """
+        with self._lock:
+            OPERATIONS = sorted((OPERATION, list(STATS)) for OPERATION, STATS in self._operations.items())
+            ROUTE = self._route
+        TIMESTAMP = int(time.time() * 1000)
+        return [{
+            '_aws': {
+                'Timestamp': TIMESTAMP,
+                'CloudWatchMetrics': [{
+                    'Namespace': self._namespace,
+                    'Dimensions': [[self.DIMENSION_ROUTE, self.DIMENSION_OPERATION]],
+                    'Metrics': [
+                        {'Name':'AwsCallCount', 'Unit':'Count'},
+                        {'Name':'AwsCallErrors', 'Unit':'Count'},
+                        {'Name':'AwsCallDuration', 'Unit':'Milliseconds'},
+                        {'Name':'AwsCallBytesOut', 'Unit':'Bytes'},
+                        {'Name':'AwsCallBytesIn', 'Unit':'Bytes'},
+                    ],
+                }],
+            },
+            self.DIMENSION_ROUTE: ROUTE,
+            self.DIMENSION_OPERATION: OPERATION,
+            'AwsCallCount': STATS[0],
+            'AwsCallErrors': STATS[1],
+            'AwsCallDuration': round(STATS[4] * 1000, 3),
+            'AwsCallBytesOut': STATS[2],
+            'AwsCallBytesIn': STATS[3],
+        } for OPERATION, STATS in OPERATIONS]
+
+    def emit(self) -> dict[str, str|int|float|dict]:
+        """集計結果(ルート単位の合計および操作単位)をEMF形式のJSON(1件1行)として標準出力へ出力
+
+        Returns:
+            dict[str, str|int|float|dict]: 出力したルート単位の集計結果(計測無効時は空dict)
+        """
+        if not self._enabled:
+            return {}
+        SUMMARY = self.get_summary()
+        sys.stdout.write(''.join(f'{json.dumps(DATA, ensure_ascii=False, separators=(",", ":"))}\n' for DATA in [SUMMARY] + self.get_operation_summaries()))
+        sys.stdout.flush()
+        return SUMMARY
+
+    def _on_before_call(self, context:dict, **kwargs) -> None:
+        """API呼び出し前フック(開始時刻の記録)
+
+        Args:
+            context (dict): リクエストコンテキスト
+        """
+        context[self.CONTEXT_KEY_START] = time.perf_counter()
+
+    def _on_request_created(self, request, **kwargs) -> None:
+        """HTTPリクエスト作成フック(送信バイト数の記録 ※リトライ時は最後の送信分)
+
+        Args:
+            request (_type_): botocoreのHTTPリクエスト
+        """
+        BODY = getattr(request, 'body', None)
+        CONTEXT = getattr(request, 'context', None)
+        if CONTEXT is None:
+            return
+        if isinstance(BODY, (bytes, bytearray, str)):
+            CONTEXT[self.CONTEXT_KEY_BYTES_OUT] = len(BODY)
+
+    def _on_after_call(self, http_response, model, context:dict, **kwargs) -> None:
+        """API呼び出し後フック(集計)
+
+        Args:
+            http_response (_type_): botocoreのHTTPレスポンス
+            model (_type_): 操作のモデル
+            context (dict): リクエストコンテキスト
+        """
+        self.record(OPERATION=self._get_operation_name(MODEL=model), DURATION=self._get_elapsed(CONTEXT=context), BYTES_OUT=context.get(self.CONTEXT_KEY_BYTES_OUT, 0), BYTES_IN=self._get_response_length(HTTP_RESPONSE=http_response, MODEL=model), IS_ERROR=getattr(http_response, 'status_code', 200) >= 300)
+
+    def _on_after_call_error(self, model, context:dict, **kwargs) -> None:
+        """API呼び出し失敗フック(通信エラー等の集計)
+
+        Args:
+            model (_type_): 操作のモデル
+            context (dict): リクエストコンテキスト
+        """
+        self.record(OPERATION=self._get_operation_name(MODEL=model), DURATION=self._get_elapsed(CONTEXT=context), BYTES_OUT=context.get(self.CONTEXT_KEY_BYTES_OUT, 0), IS_ERROR=True)
+
+    def _get_elapsed(self, CONTEXT:dict) -> float:
+        """API呼び出し開始からの経過時間取得
+
+        Args:
+            CONTEXT (dict): リクエストコンテキスト
+
+        Returns:
+            float: 経過時間(単位:秒、開始時刻不明の場合は0)
+        """
+        STARTED_AT = CONTEXT.get(self.CONTEXT_KEY_START, None)
+        return 0.0 if STARTED_AT is None else time.perf_counter() - STARTED_AT
+
+    @classmethod
+    def _get_operation_name(cls, MODEL) -> str:
+        """操作名(サービス名.操作名)の取得
+
+        Args:
+            MODEL (_type_): 操作のモデル
+
+        Returns:
+            str: 操作名(ex:"dynamodb.Scan")
+        """
+        return f'{MODEL.service_model.service_name}.{MODEL.name}'
+
+    @classmethod
+    def _get_response_length(cls, HTTP_RESPONSE, MODEL) -> int:
+        """受信バイト数の取得(Content-Length優先、ストリーミング応答は本文を読み込まない)
+
+        Args:
+            HTTP_RESPONSE (_type_): botocoreのHTTPレスポンス
+            MODEL (_type_): 操作のモデル
+
+        Returns:
+            int: 受信バイト数
+        """
+        ret_value:int = 0
+        try:
+            LENGTH = HTTP_RESPONSE.headers.get('content-length', '')
+            if LENGTH.isdigit():
+                ret_value = int(LENGTH)
+            elif not MODEL.has_streaming_output:
+                ret_value = len(HTTP_RESPONSE.content or b'')
+        except Exception:
+            ret_value = 0
+        return ret_value
@@ -0,0 +1,143 @@
+"""AWSクライアント生成処理
+"""
+from botocore.config import Config
+from threading import RLock
+
+import boto3.session
+import logging
+
+from module.logger_wrapper import cLoggerWrapper
+
+class cAwsClientFactory:
+    """AWSクライアント生成クラス
+    ※1つのboto3セッションから、接続プールサイズ・TCPキープアライブ・タイムアウト・リトライモードを揃えたクライアントを生成し、サービス単位で共有する。
+    リソース(boto3.resource)を利用するサービスは、リソースが内部に持つクライアントを低レベルクライアントとしても返し、接続プールを1つにまとめる。
+    """
+
+    RESOURCE_SERVICES:tuple[str] = ('dynamodb',)
+    """リソースと低レベルクライアントで接続プールを共有するサービス
+    """
+
+    SERVICE_CONFIGS:dict[str, Config] = {'s3': Config(signature_version='s3v4')}
+    """サービス固有の追加設定
+    """
+
+    def __init__(self, REGION_NAME:str = '', MAX_POOL_CONNECTIONS:int = 16, CONNECT_TIMEOUT:float = 3.0, READ_TIMEOUT:float = 10.0, TCP_KEEPALIVE:bool = True, RETRY_MODE:str = 'adaptive', MAX_ATTEMPTS:int = 3, LOGGER_WRAPPER:cLoggerWrapper = None) -> None:
+        """AWSクライアント生成クラスのコンストラクタ
+
+        Args:
+            REGION_NAME (str, optional): AWSリージョン名(空文字の場合は実行環境の既定値). Defaults to ''.
+            MAX_POOL_CONNECTIONS (int, optional): クライアントごとの接続プールの最大接続数. Defaults to 16.
+            CONNECT_TIMEOUT (float, optional): 接続タイムアウト(単位:秒). Defaults to 3.0.
+            READ_TIMEOUT (float, optional): 読み込みタイムアウト(単位:秒). Defaults to 10.0.
+            TCP_KEEPALIVE (bool, optional): TCPキープアライブの有効/無効. Defaults to True.
+            RETRY_MODE (str, optional): リトライモード("legacy", "standard", "adaptive"). Defaults to 'adaptive'.
+            MAX_ATTEMPTS (int, optional): 最大試行回数(初回を含む). Defaults to 3.
+            LOGGER_WRAPPER (cLoggerWrapper, optional): ログ出力管理クラスのインスタンス. Defaults to None.
+        """
+        self._region_name:str = REGION_NAME
+        self._config:Config = Config(max_pool_connections=max(1, MAX_POOL_CONNECTIONS), connect_timeout=CONNECT_TIMEOUT, read_timeout=READ_TIMEOUT, tcp_keepalive=TCP_KEEPALIVE, retries={'mode':RETRY_MODE, 'total_max_attempts':max(1, MAX_ATTEMPTS)})
+        self._logger_wrapper:cLoggerWrapper = LOGGER_WRAPPER
+        self._session:boto3.session.Session = None
+        self._clients:dict[str, object] = {}
+        self._resources:dict[str, object] = {}
+        self._lock:RLock = RLock()
+
+    def __str__(self) -> str:
+        """現在のオブジェクトを表す文字列を返す
+
+        Returns:
+            str: 現在のオブジェクトを表す文字列
+        """
+        return f'REGION_NAME:{self._region_name}, MAX_POOL_CONNECTIONS:{self.CONFIG.max_pool_connections}, CONNECT_TIMEOUT:{self.CONFIG.connect_timeout}, READ_TIMEOUT:{self.CONFIG.read_timeout}, TCP_KEEPALIVE:{self.CONFIG.tcp_keepalive}, RETRIES:{self.CONFIG.retries}'
+
+    @property
+    def CONFIG(self) -> Config:
+        """全クライアント共通の設定 取得
+
+        Returns:
+            Config: 全クライアント共通の設定
+        """
+        return self._config
+
+    @property
+    def SESSION(self) -> boto3.session.Session:
+        """boto3セッションのインスタンス 取得
+
+        Returns:
+            boto3.session.Session: boto3セッションのインスタンス
+        """
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = boto3.session.Session(region_name=self._region_name or None)
+        return self._session
+
+    @property
+    def LOGGER_WRAPPER(self) -> cLoggerWrapper:
+        """ログ出力管理クラスのインスタンス 取得
+
+        Returns:
+            cLoggerWrapper: ログ出力管理クラスのインスタンス
+        """
+        if self._logger_wrapper is None:
+            self._logger_wrapper = cLoggerWrapper()
+        return self._logger_wrapper
+
+    def get_client(self, SERVICE_NAME:str):
+        """サービスの低レベルクライアント取得(生成済みの場合は生成済みのインスタンスを返す)
+
+        Args:
+            SERVICE_NAME (str): サービス名(ex:"s3", "dynamodb")
+
+        Returns:
+            _type_: クライアントのインスタンス(生成失敗時はNone)
+        """
+        if SERVICE_NAME in self.RESOURCE_SERVICES:
+            # リソースが内部に持つクライアントを共有する
+            RESOURCE = self.get_resource(SERVICE_NAME=SERVICE_NAME)
+            return None if RESOURCE is None else RESOURCE.meta.client
+        CLIENT = self._clients.get(SERVICE_NAME, None)
+        if CLIENT is None:
+            try:
+                with self._lock:
+                    CLIENT = self._clients.get(SERVICE_NAME, None)
+                    if CLIENT is None:
+                        CLIENT = self.SESSION.client(service_name=SERVICE_NAME, config=self._get_service_config(SERVICE_NAME=SERVICE_NAME))
+                        self._clients[SERVICE_NAME] = CLIENT
+            except Exception as e:
+                self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, SERVICE_NAME:{SERVICE_NAME}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+        return CLIENT
+
+    def get_resource(self, SERVICE_NAME:str):
+        """サービスのリソース取得(生成済みの場合は生成済みのインスタンスを返す)
+
+        Args:
+            SERVICE_NAME (str): サービス名(ex:"dynamodb")
+
+        Returns:
+            _type_: リソースのインスタンス(生成失敗時はNone)
+        """
+        RESOURCE = self._resources.get(SERVICE_NAME, None)
+        if RESOURCE is None:
+            try:
+                with self._lock:
+                    RESOURCE = self._resources.get(SERVICE_NAME, None)
+                    if RESOURCE is None:
+                        RESOURCE = self.SESSION.resource(service_name=SERVICE_NAME, config=self._get_service_config(SERVICE_NAME=SERVICE_NAME))
+                        self._resources[SERVICE_NAME] = RESOURCE
+            except Exception as e:
+                self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, SERVICE_NAME:{SERVICE_NAME}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+        return RESOURCE
+
+    def _get_service_config(self, SERVICE_NAME:str) -> Config:
+        """サービスごとのクライアント設定取得(共通設定にサービス固有の設定を上書き)
+
+        Args:
+            SERVICE_NAME (str): サービス名
+
+        Returns:
+            Config: クライアント設定
+        """
+        SERVICE_CONFIG = self.SERVICE_CONFIGS.get(SERVICE_NAME, None)
+        return self._config if SERVICE_CONFIG is None else self._config.merge(SERVICE_CONFIG)
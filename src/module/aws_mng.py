@@ -1,31 +1,52 @@
 """AWSアクセス関連処理
 """
 
-import boto3
-import boto3.s3
-import boto3.s3.constants
-import boto3.s3.transfer
-import boto3.session
-from datetime import datetime
+import base64
+import hashlib
 import json
 import logging
 import os.path as path
+import random
+import time
 
-from boto3.dynamodb.conditions import Key, Attr
 from boto3.dynamodb.types import TypeSerializer, TypeDeserializer
-from botocore.client import Config
 from botocore.exceptions import ClientError
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from http import HTTPStatus
+from module.aws_call_tracer import cAwsCallTracer
+from module.aws_client_factory import cAwsClientFactory
+from module.bulk_presigner import cBulkPresigner
+from module.catalog_cache import cCatalogCache
 from module.common_func import *
+from module.event_dedupe_cache import cEventDedupeCache
+from module.image_record import cImageRecord, cImageRecordDecoder
 from module.logger_wrapper import cLoggerWrapper
-from uuid import uuid4
+from module.signed_url_cache import cSignedUrlCache
+from queue import Full, Queue
+from threading import Event
+from typing import NamedTuple
+from uuid import NAMESPACE_URL, uuid4, uuid5
+
+class cS3ObjectRecord(NamedTuple):
+    """S3オブジェクト情報
+    """
+    key:str
+    """ファイルパス
+    """
+    size:int
+    """ファイルサイズ
+    """
+    last_modified:datetime
+    """最終更新日時
+    """
 
 class cAwsAccessMng:
     """AWSアクセス処理クラス
     """
 
-    def __init__(self, REGION_NAME:str = '', S3_BUCKET:str = '', DYNAMO_DB_IMAGE_MNG_TABLE_NAME:str = '', LOGGER_WRAPPER:cLoggerWrapper = None) -> None:
+    def __init__(self, REGION_NAME:str = '', S3_BUCKET:str = '', DYNAMO_DB_IMAGE_MNG_TABLE_NAME:str = '', LOGGER_WRAPPER:cLoggerWrapper = None, SIGNED_URL_CACHE_SIZE:int = 4096, SIGNED_URL_CACHE_REFRESH_RATIO:float = 0.5, S3_LIST_MAX_WORKERS:int = 4, AWS_CALL_TRACER:cAwsCallTracer = None, AWS_CLIENT_FACTORY:cAwsClientFactory = None, CATALOG_CACHE_MAX_ITEMS:int = 50000, EVENT_DEDUPE_CACHE_SIZE:int = 4096, EVENT_DEDUPE_CACHE_TTL:float = 300.0) -> None:
         """AWSアクセス処理クラスのコンストラクタ
 
         Args:
@@ -33,6 +54,14 @@ class cAwsAccessMng:
             S3_BUCKET (str, optional): AWS S3バケット名. Defaults to ''.
             DYNAMO_DB_IMAGE_MNG_TABLE_NAME (str, optional): 画像IDとURL管理DynamoDBテーブル名. Defaults to ''.
             LOGGER_WRAPPER (cLoggerWrapper, optional): ログ出力管理クラスのインスタンス. Defaults to None.
+            SIGNED_URL_CACHE_SIZE (int, optional): 署名付きURLキャッシュの最大保持件数(0以下の場合はキャッシュしない). Defaults to 4096.
+            SIGNED_URL_CACHE_REFRESH_RATIO (float, optional): 署名付きURLを再発行する閾値(有効期限に対する経過時間の割合). Defaults to 0.5.
+            S3_LIST_MAX_WORKERS (int, optional): S3内ファイル一覧の並列取得数(1以下の場合は逐次取得). Defaults to 4.
+            AWS_CALL_TRACER (cAwsCallTracer, optional): AWS呼び出し計測クラスのインスタンス(未指定の場合は計測しない). Defaults to None.
+            AWS_CLIENT_FACTORY (cAwsClientFactory, optional): AWSクライアント生成クラスのインスタンス(未指定の場合は既定の設定で生成). Defaults to None.
+            CATALOG_CACHE_MAX_ITEMS (int, optional): 画像カタログキャッシュの最大保持件数(0以下の場合はキャッシュしない). Defaults to 50000.
+            EVENT_DEDUPE_CACHE_SIZE (int, optional): S3イベント重複排除キャッシュの最大保持件数(0以下の場合はキャッシュしない). Defaults to 4096.
+            EVENT_DEDUPE_CACHE_TTL (float, optional): S3イベント重複排除キャッシュの保持期間(単位:秒). Defaults to 300.0.
         """
         self._region_name = REGION_NAME
         self._s3_bucket_name = S3_BUCKET
@@ -43,6 +72,17 @@ class cAwsAccessMng:
         self._dynamodb_img_mng_resource = None
         self._serializer:TypeSerializer = None
         self._deserializer:TypeDeserializer = None
+        self._signed_url_cache:cSignedUrlCache = cSignedUrlCache(MAX_SIZE=SIGNED_URL_CACHE_SIZE, REFRESH_RATIO=SIGNED_URL_CACHE_REFRESH_RATIO)
+        self._s3_list_max_workers:int = S3_LIST_MAX_WORKERS
+        self._aws_call_tracer:cAwsCallTracer = AWS_CALL_TRACER
+        self._aws_client_factory:cAwsClientFactory = AWS_CLIENT_FACTORY
+        self._catalog_cache:cCatalogCache = cCatalogCache(MAX_ITEMS=CATALOG_CACHE_MAX_ITEMS)
+        self._image_record_decoder:cImageRecordDecoder = cImageRecordDecoder()
+        self._event_dedupe_cache:cEventDedupeCache = cEventDedupeCache(MAX_SIZE=EVENT_DEDUPE_CACHE_SIZE, TTL=EVENT_DEDUPE_CACHE_TTL)
+        self._is_s3_bucket_ready:bool = False
+        self._is_dynamodb_table_ready:bool = False
+        # テーブルの存在確認結果(インデックスの確認を含むテーブル準備完了とは区別する)
+        self._is_dynamodb_table_exist:bool = False
 
     def __str__(self) -> str:
         """現在のオブジェクトを表す文字列を返す
@@ -56,7 +96,7 @@ class cAwsAccessMng:
             ret_value += f', S3_BUCKET_NAME:{self.S3_BUCKET_NAME}'
             ret_value += f', DYNAMO_DB_IMAGE_MNG_TABLE_NAME:{self.DYNAMO_DB_IMAGE_MNG_TABLE_NAME}'
         except Exception as e:
-            self.LOGGER_WRAPPER.output(MSG=f'ret_value:{ret_value}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+            self.LOGGER_WRAPPER.output(MSG=lambda: f'ret_value:{ret_value}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
         return ret_value
 
     @property
@@ -70,7 +110,7 @@ class cAwsAccessMng:
             try:
                 self._serializer = TypeSerializer()
             except Exception as e:
-                self.LOGGER_WRAPPER.output(MSG=f'self:<{self}>, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+                self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, {type(e).__name__}! {e}', LEVEL=logging.WARN)
         return self._serializer
 
     @property
@@ -84,9 +124,77 @@ class cAwsAccessMng:
             try:
                 self._deserializer = TypeDeserializer()
             except Exception as e:
-                self.LOGGER_WRAPPER.output(MSG=f'self:<{self}>, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+                self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, {type(e).__name__}! {e}', LEVEL=logging.WARN)
         return self._deserializer
 
+    @property
+    def SignedUrlCache(self) -> cSignedUrlCache:
+        """署名付きURLキャッシュ管理クラスのインスタンス 取得
+
+        Returns:
+            cSignedUrlCache: 署名付きURLキャッシュ管理クラスのインスタンス
+        """
+        return self._signed_url_cache
+
+    @property
+    def CatalogCache(self) -> cCatalogCache:
+        """画像カタログキャッシュ管理クラスのインスタンス 取得
+
+        Returns:
+            cCatalogCache: 画像カタログキャッシュ管理クラスのインスタンス
+        """
+        return self._catalog_cache
+
+    @property
+    def ImageRecordDecoder(self) -> cImageRecordDecoder:
+        """画像レコードの高速デコードクラスのインスタンス 取得
+
+        Returns:
+            cImageRecordDecoder: 画像レコードの高速デコードクラスのインスタンス
+        """
+        return self._image_record_decoder
+
+    @property
+    def EventDedupeCache(self) -> cEventDedupeCache:
+        """S3イベント重複排除キャッシュ管理クラスのインスタンス 取得
+
+        Returns:
+            cEventDedupeCache: S3イベント重複排除キャッシュ管理クラスのインスタンス
+        """
+        return self._event_dedupe_cache
+
+    @property
+    def AwsCallTracer(self) -> cAwsCallTracer:
+        """AWS呼び出し計測クラスのインスタンス 取得
+
+        Returns:
+            cAwsCallTracer: AWS呼び出し計測クラスのインスタンス
+        """
+        if self._aws_call_tracer is None:
+            self._aws_call_tracer = cAwsCallTracer(ENABLED=False)
+        return self._aws_call_tracer
+
+    @property
+    def AwsClientFactory(self) -> cAwsClientFactory:
+        """AWSクライアント生成クラスのインスタンス 取得
+
+        Returns:
+            cAwsClientFactory: AWSクライアント生成クラスのインスタンス
+        """
+        if self._aws_client_factory is None:
+            # S3内ファイル一覧の並列取得数を下回らない接続プールサイズで生成
+            self._aws_client_factory = cAwsClientFactory(REGION_NAME=self.REGION_NAME, MAX_POOL_CONNECTIONS=max(16, self.S3_LIST_MAX_WORKERS), LOGGER_WRAPPER=self.LOGGER_WRAPPER)
+        return self._aws_client_factory
+
+    @property
+    def SIGNED_URL_CACHEABLE_METHODS(self) -> tuple[str]:
+        """署名付きURLキャッシュ対象のAPI 取得
+
+        Returns:
+            tuple[str]: 署名付きURLキャッシュ対象のAPI
+        """
+        return ('get_object',)
+
     @property
     def MAX_S3_FILE_PATH_LENGTH(self) -> int:
         """S3ファイルパスの最大長 取得
@@ -114,6 +222,15 @@ class cAwsAccessMng:
         """
         return self._s3_bucket_name
 
+    @property
+    def S3_LIST_MAX_WORKERS(self) -> int:
+        """S3内ファイル一覧の並列取得数 取得
+
+        Returns:
+            int: S3内ファイル一覧の並列取得数
+        """
+        return self._s3_list_max_workers
+
     @property
     def S3_PREFIX(self) -> str:
         """AWS S3プレフィックス名 取得
@@ -123,6 +240,25 @@ class cAwsAccessMng:
         """
         return 'images'
 
+    @property
+    def S3_CONVERTED_PREFIX(self) -> str:
+        """電子ペーパー向けに変換した画像を格納するAWS S3プレフィックス名 取得
+        ※S3通知・画像リストの対象外とするため、元画像のプレフィックスの外に格納する
+
+        Returns:
+            str: 変換した画像を格納するAWS S3プレフィックス名
+        """
+        return 'converted'
+
+    @property
+    def CONVERTED_OBJECT_EXTENSIONS(self) -> dict[str, str]:
+        """電子ペーパー向けに変換した画像の出力形式名 → ファイル拡張子 取得
+
+        Returns:
+            dict[str, str]: 出力形式名(png:インデックスカラーのPNG, raw/rle/zlib:ヘッダ付きのフレームバッファ(無圧縮/RLE圧縮/zlib圧縮))をキーとしたファイル拡張子
+        """
+        return {'png':'.png', 'raw':'.fb', 'rle':'.rle.fb', 'zlib':'.zlib.fb'}
+
     @property
     def S3_CLIENT(self):
         """AWS S3クライアントのインスタンス 取得
@@ -132,9 +268,10 @@ class cAwsAccessMng:
         """
         if self._s3_client is None:
             try:
-                self._s3_client = boto3.client('s3', config=Config(signature_version='s3v4'), region_name=self.REGION_NAME)
+                self._s3_client = self.AwsClientFactory.get_client(SERVICE_NAME='s3')
+                self.AwsCallTracer.attach(CLIENT=self._s3_client)
             except Exception as e:
-                self.LOGGER_WRAPPER.output(MSG=f'self:<{self}>, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+                self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, {type(e).__name__}! {e}', LEVEL=logging.WARN)
         return self._s3_client
 
     @property
@@ -149,15 +286,19 @@ class cAwsAccessMng:
     @property
     def DynamoDBClient(self):
         """AWS DynamoDBクライアントのインスタンス 取得
+        ※DynamoDBリソースと同一のクライアントのため、項目(Item/Key等)の入出力はDynamoDB JSON形式ではなくPythonの値となる
 
         Returns:
             _type_: AWS DynamoDBクライアントのインスタンス
         """
         if self._dynamodb_client is None:
             try:
-                self._dynamodb_client = boto3.client('dynamodb', region_name=self.REGION_NAME)
+                # DynamoDBリソースと同一のクライアント(接続プール)を共有する
+                self._dynamodb_client = self.AwsClientFactory.get_client(SERVICE_NAME='dynamodb')
+                self.AwsCallTracer.attach(CLIENT=self._dynamodb_client)
+                self.ImageRecordDecoder.attach(CLIENT=self._dynamodb_client)
             except Exception as e:
-                self.LOGGER_WRAPPER.output(MSG=f'self:<{self}>, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+                self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, {type(e).__name__}! {e}', LEVEL=logging.WARN)
         return self._dynamodb_client
 
     @property
@@ -167,15 +308,106 @@ class cAwsAccessMng:
         Returns:
             _type_: AWS DynamoDBリソースのインスタンス
         """
-        if self._dynamodb_img_mng_resource is None:
-            try:
-                self._dynamodb_img_mng_resource = boto3.resource(service_name='dynamodb', region_name=self.REGION_NAME)
-            except Exception as e:
-                self.LOGGER_WRAPPER.output(MSG=f'self:<{self}>, {type(e).__name__}! {e}', LEVEL=logging.WARN)
-        # テーブル作成
-        self._create_dynamo_db_table(DB_RESOURCE=self._dynamodb_img_mng_resource, TABLE_NAME=self.DYNAMO_DB_IMAGE_MNG_TABLE_NAME, ATTRIBUTE_DEFINITIONS=[{'AttributeName':cCommonFunc.API_RESP_DICT_KEY_ID, 'AttributeType':'S'}], KEY_SCHEMA=[{'AttributeName':cCommonFunc.API_RESP_DICT_KEY_ID, 'KeyType':'HASH'}], PROVISIONED_THROUGHPUT={'ReadCapacityUnits':5, 'WriteCapacityUnits':5})
+        self._create_dynamodb_resource()
+        # テーブル作成(コンテナ内で存在確認済みの場合は省略)
+        if not self._is_dynamodb_table_ready and not self._dynamodb_img_mng_resource is None:
+            URL_INDEX = {'IndexName':self.URL_INDEX_NAME, 'KeySchema':[{'AttributeName':cCommonFunc.API_RESP_DICT_KEY_URL, 'KeyType':'HASH'}], 'Projection':{'ProjectionType':'ALL'}, 'ProvisionedThroughput':{'ReadCapacityUnits':5, 'WriteCapacityUnits':5}}
+            self._is_dynamodb_table_ready = self._create_dynamo_db_table(DB_RESOURCE=self._dynamodb_img_mng_resource, TABLE_NAME=self.DYNAMO_DB_IMAGE_MNG_TABLE_NAME, ATTRIBUTE_DEFINITIONS=[{'AttributeName':cCommonFunc.API_RESP_DICT_KEY_ID, 'AttributeType':'S'}, {'AttributeName':cCommonFunc.API_RESP_DICT_KEY_URL, 'AttributeType':'S'}], KEY_SCHEMA=[{'AttributeName':cCommonFunc.API_RESP_DICT_KEY_ID, 'KeyType':'HASH'}], PROVISIONED_THROUGHPUT={'ReadCapacityUnits':5, 'WriteCapacityUnits':5}, GLOBAL_SECONDARY_INDEXES=[URL_INDEX])
         return self._dynamodb_img_mng_resource
 
+    @property
+    def CATALOG_VERSION_ID(self) -> str:
+        """画像IDと画像URL管理テーブル内のカタログバージョン管理用アイテムの画像ID 取得
+        ※画像のアイテムではないため、画像リスト・存在確認・削除の対象外とする
+
+        Returns:
+            str: カタログバージョン管理用アイテムの画像ID
+        """
+        return '__catalog_version__'
+
+    @property
+    def CATALOG_VERSION_ATTRIBUTE_NAME(self) -> str:
+        """カタログバージョン管理用アイテムのバージョン属性名 取得
+
+        Returns:
+            str: カタログバージョン管理用アイテムのバージョン属性名
+        """
+        return 'version'
+
+    @property
+    def SEQUENCER_ATTRIBUTE_NAME(self) -> str:
+        """S3イベントのシーケンサーを保持する属性名 取得
+
+        Returns:
+            str: S3イベントのシーケンサーを保持する属性名
+        """
+        return 'sequencer'
+
+    @property
+    def CONVERTED_FORMATS_ATTRIBUTE_NAME(self) -> str:
+        """電子ペーパー向けに変換して格納した出力形式名(文字列セット)を保持する属性名 取得
+
+        Returns:
+            str: 電子ペーパー向けに変換して格納した出力形式名を保持する属性名
+        """
+        return 'converted_formats'
+
+    @property
+    def URL_INDEX_NAME(self) -> str:
+        """画像IDと画像URL管理テーブルの画像URLをキーとしたグローバルセカンダリインデックス名 取得
+
+        Returns:
+            str: 画像URLをキーとしたグローバルセカンダリインデックス名
+        """
+        return 'url-index'
+
+    @property
+    def URL_QUERY_MAX_WORKERS(self) -> int:
+        """画像URLインデックスへのQueryの並列数 取得
+        ※AWSクライアントの接続プールの最大接続数(既定:16)以下とする
+
+        Returns:
+            int: 画像URLインデックスへのQueryの並列数
+        """
+        return 8
+
+    @property
+    def EXPORT_PAGE_SIZE(self) -> int:
+        """画像カタログのエクスポート時のScan 1回あたりの取得件数 取得
+
+        Returns:
+            int: 画像カタログのエクスポート時のScan 1回あたりの取得件数
+        """
+        return 1000
+
+    @property
+    def BATCH_GET_MAX_ATTEMPTS(self) -> int:
+        """BatchGetItemの最大試行回数(未処理キーの再取得を含む) 取得
+
+        Returns:
+            int: BatchGetItemの最大試行回数
+        """
+        return 5
+
+    @property
+    def BATCH_GET_BACKOFF_BASE(self) -> float:
+        """BatchGetItemの未処理キー再取得時の待機時間の基準値 取得
+        ※待機時間は 0～min(基準値 × 2^(試行回数-1), 上限値) の乱数(フルジッター)とする
+
+        Returns:
+            float: 待機時間の基準値(単位:秒)
+        """
+        return 0.05
+
+    @property
+    def BATCH_GET_BACKOFF_MAX(self) -> float:
+        """BatchGetItemの未処理キー再取得時の待機時間の上限値 取得
+
+        Returns:
+            float: 待機時間の上限値(単位:秒)
+        """
+        return 1.0
+
     @property
     def S3_DB_NAME(self) -> str:
         """AWS S3に保持する画像ID・画像変換状態・画像URLのhash-tableリスト管理DB名 取得
@@ -196,6 +428,30 @@ class cAwsAccessMng:
             self._logger_wrapper = cLoggerWrapper()
         return self._logger_wrapper
 
+    def create_clients(self) -> bool:
+        """AWSクライアント・リソースのインスタンス生成(AWSへの通信は行わない)
+        ※Lambdaの初期化フェーズで呼び出し、初回リクエスト時のクライアント生成(サービス定義の読み込み等)を省略する。
+        通信を伴わないため、初期化フェーズのスナップショット(SnapStart)にも影響しない。
+
+        Returns:
+            bool: 成功時はTrue、それ以外はFalse
+        """
+        return not self.S3_CLIENT is None and not self.DynamoDBClient is None and not self._create_dynamodb_resource() is None
+
+    def initialize(self) -> bool:
+        """AWSリソースの初期化(S3バケット・DynamoDBテーブルの存在確認および作成)
+        ※確認結果はコンテナ内で保持し、以降のリクエストでは存在確認を省略する
+
+        Returns:
+            bool: 成功時はTrue、それ以外はFalse
+        """
+        self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>', PREFIX='::Enter')
+        RESULT_DATAS:dict[str, str] = {}
+        ret_value = self._create_s3_bucket(S3_CLIENT=self.S3_CLIENT, API_RESULT_DATAS=RESULT_DATAS)
+        ret_value = not self.ImageMngDynamoDbResource is None and self._is_dynamodb_table_ready and ret_value
+        self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, RESULT_DATAS:{RESULT_DATAS}, ret_value:{ret_value}', PREFIX='::Leave')
+        return ret_value
+
     def get_signed_urls_for_put_object(self, IMAGE_FILE_PATHS:list[str], API_RESULT_DATAS:dict[str, str|list], EXPIRATION:int=3600) -> int:
         """ファイルPUT用署名付きURLリストの取得
 
@@ -207,7 +463,7 @@ class cAwsAccessMng:
         Returns:
             int: httpステータスコード
         """
-        self.LOGGER_WRAPPER.output(MSG=f'self:<{self}>, len(IMAGE_FILE_PATHS):{-1 if IMAGE_FILE_PATHS is None else len(IMAGE_FILE_PATHS)}, EXPIRATION:{EXPIRATION}', PREFIX='::Enter')
+        self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, len(IMAGE_FILE_PATHS):{-1 if IMAGE_FILE_PATHS is None else len(IMAGE_FILE_PATHS)}, EXPIRATION:{EXPIRATION}', PREFIX='::Enter')
         SIGNED_URLS:list[dict[str, str]] = API_RESULT_DATAS.get(cCommonFunc.API_RESP_DICT_KEY_SIGNED_URLS, None) #: 署名付きURLリスト(key:元画像ファイルパス, value:署名付きURL)
         ret_value = HTTPStatus.OK if not cCommonFunc.is_none_or_empty(IMAGE_FILE_PATHS) and not SIGNED_URLS is None else HTTPStatus.BAD_REQUEST if cCommonFunc.is_none_or_empty(IMAGE_FILE_PATHS) else HTTPStatus.INTERNAL_SERVER_ERROR
         if ret_value != HTTPStatus.OK:
@@ -223,22 +479,28 @@ class cAwsAccessMng:
                 NOW_TIME:datetime = datetime.now()
                 # S3バケット内ディレクトリ名
                 DIR_NAME = self._get_adjust_s3_naming_convention(SRC=f'{NOW_TIME.strftime("%Y")}/{NOW_TIME.strftime("%m")}', PREFIX_LENGTH=len(f'{self.S3_PREFIX}/00-00-00-00.000-{len(str(uuid4()))}.jpeg')+1)
+                OBJECT_KEYS:list[str] = []
                 for SRC_FILE_PATH in IMAGE_FILE_PATHS:
                     FILE_EXT = path.splitext(SRC_FILE_PATH.replace('\\', '/'))[1]
                     FILE_NAME = f'{NOW_TIME.strftime("%m-%d-%H-%M-%S.%f")[:-3]}-{str(uuid4())}{FILE_EXT}'
-                    # S3バケット内に「images/yyyy/mm/mm-dd-HH-MM-SS.fff-UID.(元ファイル拡張子)」というファイル名での署名付きURLを取得
-                    URL = self._get_signed_url(S3_CLIENT=self.S3_CLIENT, CLIENT_METHOD='put_object', EXPIRATION=EXPIRATION, OBJECT_KEY=self._get_adjust_s3_naming_convention(SRC=f'{self.S3_PREFIX}/{DIR_NAME}/{FILE_NAME}'))
+                    # S3バケット内に「images/yyyy/mm/mm-dd-HH-MM-SS.fff-UID.(元ファイル拡張子)」というファイル名
+                    OBJECT_KEYS.append(self._get_adjust_s3_naming_convention(SRC=f'{self.S3_PREFIX}/{DIR_NAME}/{FILE_NAME}'))
+                # 署名付きURLを一括取得
+                URLS = self.get_bulk_signed_urls(CLIENT_METHOD='put_object', OBJECT_KEYS=OBJECT_KEYS, EXPIRATION=EXPIRATION)
+                for SRC_FILE_PATH, URL in zip(IMAGE_FILE_PATHS, URLS):
                     SIGNED_URLS.append({SRC_FILE_PATH:URL})
             except Exception as e:
+                self._reset_bootstrap_state(ERROR=e)
                 ret_value = HTTPStatus.INTERNAL_SERVER_ERROR
                 # 例外内容をAPI処理結果詳細に設定
                 cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'{type(e).__name__}, {e}')
-                self.LOGGER_WRAPPER.output(MSG=f'self:<{self}>, len(IMAGE_FILE_PATHS):{-1 if IMAGE_FILE_PATHS is None else len(IMAGE_FILE_PATHS)}, EXPIRATION:{EXPIRATION}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
-        self.LOGGER_WRAPPER.output(MSG=f'self:<{self}>, len(IMAGE_FILE_PATHS):{-1 if IMAGE_FILE_PATHS is None else len(IMAGE_FILE_PATHS)}, EXPIRATION:{EXPIRATION}, len(SIGNED_URLS):{-1 if SIGNED_URLS is None else len(SIGNED_URLS)}, ret_value:{ret_value}', PREFIX='::Leave')
+                self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, len(IMAGE_FILE_PATHS):{-1 if IMAGE_FILE_PATHS is None else len(IMAGE_FILE_PATHS)}, EXPIRATION:{EXPIRATION}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+        self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, len(IMAGE_FILE_PATHS):{-1 if IMAGE_FILE_PATHS is None else len(IMAGE_FILE_PATHS)}, EXPIRATION:{EXPIRATION}, len(SIGNED_URLS):{-1 if SIGNED_URLS is None else len(SIGNED_URLS)}, ret_value:{ret_value}', PREFIX='::Leave')
         return ret_value
 
     def force_update_image_mng_hash_table(self, API_RESULT_DATAS:dict[str, str]) -> int:
         """画像IDとURLのhash-table強制アップデート
+        ※S3とDBの差分(追加・削除)のみを反映し、既存画像の画像IDおよび画像変換状態は保持する
 
         Args:
             API_RESULT_DATAS (dict[str, str]): API応答内容dict
@@ -246,220 +508,848 @@ class cAwsAccessMng:
         Returns:
             int: httpステータスコード
         """
-        self.LOGGER_WRAPPER.output(MSG=f'self:<{self}>', PREFIX='::Enter')
-        S3_IMAGE_FILE_PATHS:list[dict] = []
-        # AWS S3内画像ファイルパス一覧取得 →　S3_IMAGE_FILE_PATHSに設定
-        ret_value = self._get_s3_file_lists(API_RESULT_DATAS=API_RESULT_DATAS, IMAGE_FILE_PATHS=S3_IMAGE_FILE_PATHS)
+        self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>', PREFIX='::Enter')
+        # AWS S3内画像ファイル情報を逐次取得(バケットが存在しない場合は0件)
+        S3_RECORDS:Iterator[cS3ObjectRecord] = self._iter_s3_file_lists(MAX_WORKERS=self.S3_LIST_MAX_WORKERS) if self._is_exist_s3_bucket(S3_CLIENT=self.S3_CLIENT, API_RESULT_DATAS=API_RESULT_DATAS) else iter(())
 
-        image_hash_table:list[dict[str, str|int]] = None
-        # AWS S3内画像ファイルパス一覧取得成功
-        if ret_value == HTTPStatus.OK:
-            # hash-tableリストにテーブル追加
-            ret_value, image_hash_table = self._append_hash_tables_from_s3(API_RESULT_DATAS=API_RESULT_DATAS, S3_IMAGE_FILE_PATH_DICTS=S3_IMAGE_FILE_PATHS)
+        # S3とDBの差分(追加・削除対象)を取得
+        ret_value, put_tables, delete_tables = self._get_hash_table_diff_from_s3(API_RESULT_DATAS=API_RESULT_DATAS, S3_RECORDS=S3_RECORDS)
 
-        # テーブル追加成功
+        # 差分取得成功
         if ret_value == HTTPStatus.OK:
-            # DB更新
-            ret_value = self._force_update_db_from_hash_table(API_RESULT_DATAS=API_RESULT_DATAS, IMAGE_HASH_TABLE=image_hash_table)
+            # 差分のみDBに反映
+            ret_value = self._apply_hash_table_diff_to_db(API_RESULT_DATAS=API_RESULT_DATAS, PUT_TABLES=put_tables, DELETE_TABLES=delete_tables)
 
-        self.LOGGER_WRAPPER.output(MSG=f'self:<{self}>, len(S3_IMAGE_FILE_PATHS):{len(S3_IMAGE_FILE_PATHS)}, len(IMAGE_HASH_TABLE):{-1 if image_hash_table is None else len(image_hash_table)}, ret_value:{ret_value}', PREFIX='::Leave')
+        self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, len(PUT_TABLES):{-1 if put_tables is None else len(put_tables)}, len(DELETE_TABLES):{-1 if delete_tables is None else len(delete_tables)}, ret_value:{ret_value}', PREFIX='::Leave')
         return ret_value
 
-    def get_images(self, COUNT:int, API_RESULT_DATAS:dict[str, str|list], EXPIRATION:int=3600) -> int:
+    def get_images(self, COUNT:int, API_RESULT_DATAS:dict[str, str|list], EXPIRATION:int=3600, NEXT_TOKEN:str = '') -> int:
         """画像リスト取得
 
         Args:
             COUNT (int): 取得する画像リスト数(0の場合は全件取得)
             API_RESULT_DATAS (dict[str, str | list]): API応答内容dict ※本dict内の"data"キー(※cCommonFunc.API_RESP_DICT_KEY_DATA と同値)内に画像IDと画像URLリストが設定される
             EXPIRATION (int, optional): 有効期限(単位:秒). Defaults to 3600.
+            NEXT_TOKEN (str, optional): 継続トークン(前回応答の"next_token"の値). Defaults to ''.
 
         Returns:
             int: httpステータスコード
         """
-        self.LOGGER_WRAPPER.output(MSG=f'self:<{self}>, COUNT:{COUNT}, EXPIRATION:{EXPIRATION}', PREFIX='::Enter')
+        self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, COUNT:{COUNT}, EXPIRATION:{EXPIRATION}, NEXT_TOKEN:{NEXT_TOKEN}', PREFIX='::Enter')
         DATAS:list[dict[str, str]] = None if API_RESULT_DATAS is None else API_RESULT_DATAS.get(cCommonFunc.API_RESP_DICT_KEY_DATA, None)
-        IMAGE_HASH_TABLE:list[dict[str, str|int]] = []
-        ret_value = HTTPStatus.OK if COUNT >= 0 and not DATAS is None and self._set_image_url_hash_table_from_db(IMAGE_HASH_TABLES=IMAGE_HASH_TABLE) else HTTPStatus.BAD_REQUEST if COUNT < 0 else HTTPStatus.INTERNAL_SERVER_ERROR
+        IMAGE_HASH_TABLE:list[cImageRecord] = []
+        IS_PAGING = COUNT > 0 or not cCommonFunc.is_none_or_empty(NEXT_TOKEN)
+        EXCLUSIVE_START_KEY:dict = self._decode_continuation_token(TOKEN=NEXT_TOKEN)
+        last_evaluated_key:dict = None
+        ret_value = HTTPStatus.OK if COUNT >= 0 and EXCLUSIVE_START_KEY is not None and not DATAS is None else HTTPStatus.BAD_REQUEST if COUNT < 0 or EXCLUSIVE_START_KEY is None else HTTPStatus.INTERNAL_SERVER_ERROR
+        if ret_value == HTTPStatus.OK:
+            # カタログバージョンがコンテナ内のキャッシュと一致する場合はスキャンせずキャッシュから取得
+            CATALOG_VERSION:int = self._get_catalog_version() if self.CatalogCache.ENABLED else None
+            CACHED_TABLES, NEXT_ID = (None, '') if CATALOG_VERSION is None else self.CatalogCache.get_page(VERSION=CATALOG_VERSION, LIMIT=COUNT, START_ID=EXCLUSIVE_START_KEY.get(cCommonFunc.API_RESP_DICT_KEY_ID, ''))
+            if not CACHED_TABLES is None:
+                IMAGE_HASH_TABLE.extend(CACHED_TABLES)
+                last_evaluated_key = {cCommonFunc.API_RESP_DICT_KEY_ID:NEXT_ID} if len(NEXT_ID) > 0 else None
+                is_success = True
+            # 件数指定または継続トークン指定時は1ページ分のみ取得
+            elif IS_PAGING:
+                is_success, last_evaluated_key = self._set_image_url_hash_table_page_from_db(IMAGE_HASH_TABLES=IMAGE_HASH_TABLE, LIMIT=COUNT, EXCLUSIVE_START_KEY=EXCLUSIVE_START_KEY)
+            else:
+                is_success = self._set_image_url_hash_table_from_db(IMAGE_HASH_TABLES=IMAGE_HASH_TABLE)
+                # スキャン前に読み込んだカタログバージョンで保持(スキャン中の書き込みは次回のバージョン不一致で再取得される)
+                if is_success: self.CatalogCache.put(VERSION=CATALOG_VERSION, ITEMS=IMAGE_HASH_TABLE)
+            ret_value = HTTPStatus.OK if is_success else HTTPStatus.INTERNAL_SERVER_ERROR
         if ret_value == HTTPStatus.OK:
             try:
                 DATAS.clear()
-                for TABLE in IMAGE_HASH_TABLE:
-                    URL:str = TABLE.get(cCommonFunc.API_RESP_DICT_KEY_URL, '')
-                    CONVERTIBLE:eImageConvertibleKind = TABLE.get(cCommonFunc.API_RESP_DICT_KEY_CONVERTIBLE, eImageConvertibleKind.UNDETERMINED)
-                    DATAS.append({cCommonFunc.API_RESP_DICT_KEY_ID:TABLE.get(cCommonFunc.API_RESP_DICT_KEY_ID, ''), cCommonFunc.API_RESP_DICT_KEY_URL:self._get_signed_url(S3_CLIENT=self.S3_CLIENT, CLIENT_METHOD='get_object', EXPIRATION=EXPIRATION, OBJECT_KEY=URL), cCommonFunc.API_RESP_DICT_KEY_LAST_MODIFIED:TABLE.get(cCommonFunc.API_RESP_DICT_KEY_LAST_MODIFIED, ""), cCommonFunc.API_RESP_DICT_KEY_CONVERTIBLE:eImageConvertibleKind.get_name_from_value(VALUE=CONVERTIBLE)})
+                # 署名付きURL(画像ダウンロード用)を一括取得
+                SIGNED_URLS = self.get_bulk_signed_urls(CLIENT_METHOD='get_object', OBJECT_KEYS=[RECORD.url for RECORD in IMAGE_HASH_TABLE], EXPIRATION=EXPIRATION)
+                GET_CONVERTIBLE_NAME = eImageConvertibleKind.get_name_from_value
+                for RECORD, SIGNED_URL in zip(IMAGE_HASH_TABLE, SIGNED_URLS):
+                    DATAS.append({cCommonFunc.API_RESP_DICT_KEY_ID:RECORD.id, cCommonFunc.API_RESP_DICT_KEY_URL:SIGNED_URL, cCommonFunc.API_RESP_DICT_KEY_LAST_MODIFIED:RECORD.last_modified, cCommonFunc.API_RESP_DICT_KEY_CONVERTIBLE:GET_CONVERTIBLE_NAME(VALUE=RECORD.convertible)})
+                if IS_PAGING:
+                    # 続きが存在する場合のみ継続トークンを設定(最終ページは空文字)
+                    cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=self._encode_continuation_token(LAST_EVALUATED_KEY=last_evaluated_key), KEY=cCommonFunc.API_RESP_DICT_KEY_NEXT_TOKEN)
             except Exception as e:
+                self._reset_bootstrap_state(ERROR=e)
                 ret_value = HTTPStatus.INTERNAL_SERVER_ERROR
                 # 例外内容をAPI処理結果詳細に設定
                 cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'{type(e).__name__}, {e}')
-                self.LOGGER_WRAPPER.output(MSG=f'self:<{self}>, COUNT:{COUNT}, EXPIRATION:{EXPIRATION}, len(DATAS):{-1 if DATAS is None else len(DATAS)}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+                self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, COUNT:{COUNT}, EXPIRATION:{EXPIRATION}, len(DATAS):{-1 if DATAS is None else len(DATAS)}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
         elif ret_value == HTTPStatus.BAD_REQUEST:
             # リクエストデータに不正がある旨をAPI処理結果詳細に設定
-            cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'COUNT is less than 0!\n\tCOUNT:{COUNT}')
+            cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'COUNT is less than 0 or NEXT_TOKEN is invalid!\n\tCOUNT:{COUNT}, NEXT_TOKEN:{NEXT_TOKEN}')
         else:
             # 内部変数に不正がある旨をAPI処理結果詳細に設定
             cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'hash-tables is None or internal parameter is invalid!\n\tlen(DATAS):{-1 if DATAS is None else len(DATAS)}')
-        self.LOGGER_WRAPPER.output(MSG=f'self:<{self}>, COUNT:{COUNT}, EXPIRATION:{EXPIRATION}, len(DATAS):{-1 if DATAS is None else len(DATAS)}, ret_value:{ret_value}', PREFIX='::Leave')
+        self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, COUNT:{COUNT}, EXPIRATION:{EXPIRATION}, len(DATAS):{-1 if DATAS is None else len(DATAS)}, ret_value:{ret_value}', PREFIX='::Leave')
+        return ret_value
+
+    def export_images(self, API_RESULT_DATAS:dict[str, str], LINES:list[str], SEGMENT:int = 0, TOTAL_SEGMENTS:int = 1, IS_PRESIGN:bool = False, EXPIRATION:int=3600, NEXT_TOKEN:str = '', MAX_BYTES:int = 4194304) -> int:
+        """画像カタログのエクスポート(NDJSON)
+        ※Scanのページ単位で画像レコードをNDJSONの行へ変換し、ページ全体を保持しない。
+        出力サイズが最大サイズに達した時点(ページ境界)で打ち切り、続きを取得するための継続トークンを設定する。
+
+        Args:
+            API_RESULT_DATAS (dict[str, str]): API応答内容dict ※本dict内の"next_token"キーに継続トークンが設定される(末尾まで出力した場合は空文字)
+            LINES (list[str]): NDJSONの行リスト(1行:{"id", "url", "last_modified", "convertible"}のJSON文字列)
+            SEGMENT (int, optional): 並列スキャンのセグメント番号(0～TOTAL_SEGMENTS-1). Defaults to 0.
+            TOTAL_SEGMENTS (int, optional): 並列スキャンのセグメント数(1の場合は並列スキャンしない). Defaults to 1.
+            IS_PRESIGN (bool, optional): "url"に署名付きURL(画像ダウンロード用)を出力する場合はTrue、S3ファイルパスを出力する場合はFalse. Defaults to False.
+            EXPIRATION (int, optional): 署名付きURLの有効期限(単位:秒). Defaults to 3600.
+            NEXT_TOKEN (str, optional): 継続トークン(前回応答の継続トークン、同じセグメント指定で使用すること). Defaults to ''.
+            MAX_BYTES (int, optional): 1回の出力の最大サイズ(単位:byte、ページ境界で打ち切るため1ページ分超過する場合がある). Defaults to 4194304.
+
+        Returns:
+            int: httpステータスコード
+        """
+        self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, SEGMENT:{SEGMENT}, TOTAL_SEGMENTS:{TOTAL_SEGMENTS}, IS_PRESIGN:{IS_PRESIGN}, EXPIRATION:{EXPIRATION}, NEXT_TOKEN:{NEXT_TOKEN}, MAX_BYTES:{MAX_BYTES}', PREFIX='::Enter')
+        EXCLUSIVE_START_KEY:dict = self._decode_continuation_token(TOKEN=NEXT_TOKEN)
+        # DynamoDBの並列スキャンのセグメント数は1～1000000
+        IS_VALID = EXCLUSIVE_START_KEY is not None and 1 <= TOTAL_SEGMENTS <= 1000000 and 0 <= SEGMENT < TOTAL_SEGMENTS
+        ret_value = HTTPStatus.OK if IS_VALID and not LINES is None else HTTPStatus.BAD_REQUEST if not IS_VALID else HTTPStatus.INTERNAL_SERVER_ERROR
+        last_evaluated_key:dict = None
+        if ret_value == HTTPStatus.OK:
+            ret_value = HTTPStatus.INTERNAL_SERVER_ERROR if not self._is_exist_dynamodb_table(TABLE_NAME=self.DYNAMO_DB_IMAGE_MNG_TABLE_NAME) else ret_value
+        if ret_value == HTTPStatus.OK:
+            try:
+                LINES.clear()
+                CATALOG_VERSION_ID = self.CATALOG_VERSION_ID
+                GET_CONVERTIBLE_NAME = eImageConvertibleKind.get_name_from_value
+                OPTION = {'TableName':self.DYNAMO_DB_IMAGE_MNG_TABLE_NAME}
+                if TOTAL_SEGMENTS > 1:
+                    OPTION['Segment'] = SEGMENT
+                    OPTION['TotalSegments'] = TOTAL_SEGMENTS
+                if not cCommonFunc.is_none_or_empty(EXCLUSIVE_START_KEY): OPTION['ExclusiveStartKey'] = EXCLUSIVE_START_KEY
+                output_bytes = 0
+                PAGINATOR = self.DynamoDBClient.get_paginator('scan')
+                with self.ImageRecordDecoder.decoding():
+                    # 1ページの件数を制限し、打ち切り時の最大サイズからの超過量を抑える
+                    for PAGE in PAGINATOR.paginate(**OPTION, PaginationConfig={'PageSize':self.EXPORT_PAGE_SIZE}):
+                        # カタログバージョン管理用アイテムは除外
+                        RECORDS = [RECORD for RECORD in self._get_image_records(RESPONSE=PAGE) if RECORD.id != CATALOG_VERSION_ID]
+                        # 署名付きURLはページ単位で一括取得
+                        URLS = self.get_bulk_signed_urls(CLIENT_METHOD='get_object', OBJECT_KEYS=[RECORD.url for RECORD in RECORDS], EXPIRATION=EXPIRATION) if IS_PRESIGN else [RECORD.url for RECORD in RECORDS]
+                        for RECORD, URL in zip(RECORDS, URLS):
+                            LINE = json.dumps({cCommonFunc.API_RESP_DICT_KEY_ID:RECORD.id, cCommonFunc.API_RESP_DICT_KEY_URL:URL, cCommonFunc.API_RESP_DICT_KEY_LAST_MODIFIED:RECORD.last_modified, cCommonFunc.API_RESP_DICT_KEY_CONVERTIBLE:GET_CONVERTIBLE_NAME(VALUE=RECORD.convertible)}, ensure_ascii=False, separators=(',', ':'))
+                            LINES.append(LINE)
+                            output_bytes += len(LINE.encode('utf-8')) + 1
+                        last_evaluated_key = PAGE.get('LastEvaluatedKey', None)
+                        # 最大サイズに達した場合はページ境界で打ち切る(続きは継続トークンで取得)
+                        if last_evaluated_key is None or output_bytes >= MAX_BYTES:
+                            break
+                cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=self._encode_continuation_token(LAST_EVALUATED_KEY=last_evaluated_key), KEY=cCommonFunc.API_RESP_DICT_KEY_NEXT_TOKEN)
+            except Exception as e:
+                self._reset_bootstrap_state(ERROR=e)
+                ret_value = HTTPStatus.INTERNAL_SERVER_ERROR
+                LINES.clear()
+                # 例外内容をAPI処理結果詳細に設定
+                cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'{type(e).__name__}, {e}')
+                self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, SEGMENT:{SEGMENT}, TOTAL_SEGMENTS:{TOTAL_SEGMENTS}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+        elif ret_value == HTTPStatus.BAD_REQUEST:
+            # リクエストデータに不正がある旨をAPI処理結果詳細に設定
+            cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'SEGMENT or TOTAL_SEGMENTS or NEXT_TOKEN is invalid!\n\tSEGMENT:{SEGMENT}, TOTAL_SEGMENTS:{TOTAL_SEGMENTS}, NEXT_TOKEN:{NEXT_TOKEN}')
+        else:
+            # 内部変数に不正がある旨をAPI処理結果詳細に設定
+            cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'image table is not available or internal parameter is invalid!\n\tlen(LINES):{-1 if LINES is None else len(LINES)}')
+        self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, SEGMENT:{SEGMENT}, TOTAL_SEGMENTS:{TOTAL_SEGMENTS}, len(LINES):{-1 if LINES is None else len(LINES)}, ret_value:{ret_value}', PREFIX='::Leave')
         return ret_value
 
-    def get_signed_urls_for_get_object_to_id(self, ID:str, API_RESULT_DATAS:dict[str, str], EXPIRATION:int=3600) -> int:
+    def get_signed_urls_for_get_object_to_id(self, ID:str, API_RESULT_DATAS:dict[str, str], EXPIRATION:int=3600, IF_NONE_MATCH:str = '', RESPONSE_HEADERS:dict[str, str] = None) -> int:
         """IDに該当する署名付きURL(画像ダウンロード用)を取得する
+        ※GetItem 1回(取得属性を限定)で画像URLを取得し、アイテムと署名付きURLから生成したETagが"If-None-Match"と一致する場合は304を返す
 
         Args:
             ID (str): 画像ID
             API_RESULT_DATAS (dict[str, str]): API応答内容dict
             EXPIRATION (int, optional): 有効期限(単位:秒). Defaults to 3600.
+            IF_NONE_MATCH (str, optional): リクエストヘッダ"If-None-Match"の値(空文字の場合は比較しない). Defaults to ''.
+            RESPONSE_HEADERS (dict[str, str], optional): 応答ヘッダdict ※本dict内の"ETag"キーにETagが設定される. Defaults to None.
 
         Returns:
-            int: httpステータスコード
+            int: httpステータスコード(ETagが一致する場合は304)
         """
-        self.LOGGER_WRAPPER.output(MSG=f'self:<{self}>, ID:{ID}, EXPIRATION:{EXPIRATION}', PREFIX='::Enter')
-        ret_value = HTTPStatus.OK if self._is_exist_id_in_dynamodb_image_mng_table(ID=ID) else HTTPStatus.BAD_REQUEST
+        self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, ID:{ID}, EXPIRATION:{EXPIRATION}, IF_NONE_MATCH:{IF_NONE_MATCH}', PREFIX='::Enter')
+        RECORD:cImageRecord = self._get_image_mng_record(ID=ID)
+        ret_value = HTTPStatus.OK if not RECORD is None and len(RECORD.id) > 0 else HTTPStatus.BAD_REQUEST if not RECORD is None else HTTPStatus.INTERNAL_SERVER_ERROR
         if ret_value == HTTPStatus.OK:
             try:
-                DB_TABLE = self.ImageMngDynamoDbResource.Table(self.DYNAMO_DB_IMAGE_MNG_TABLE_NAME)
-                self.LOGGER_WRAPPER.output(MSG=f'DBTABLE:{DB_TABLE}', LEVEL=logging.WARN)
-                TABLE_RESULTS:list[dict] = DB_TABLE.query(KeyConditionExpression=Key(cCommonFunc.API_RESP_DICT_KEY_ID).eq(ID))
-                ITEMS:list[dict] = TABLE_RESULTS.get('Items', [])
-                DATA:dict = ITEMS[0] if not cCommonFunc.is_none_or_empty(ITEMS) else {}
-                SRC_URL = DATA.get(cCommonFunc.API_RESP_DICT_KEY_URL, "")
-                # 署名付きURL(画像ダウンロード用)をAPI応答内容dictに設定
-                cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=self._get_signed_url(S3_CLIENT=self.S3_CLIENT, CLIENT_METHOD='get_object', EXPIRATION=EXPIRATION, OBJECT_KEY=SRC_URL), KEY=cCommonFunc.API_RESP_DICT_KEY_URL)
+                # 署名付きURL(画像ダウンロード用)を取得(キャッシュ済みの場合は同一URLとなるため、ETagも再発行まで変わらない)
+                SIGNED_URL = self._get_signed_url(S3_CLIENT=self.S3_CLIENT, CLIENT_METHOD='get_object', EXPIRATION=EXPIRATION, OBJECT_KEY=RECORD.url)
+                ETAG = self._get_image_etag(RECORD=RECORD, SIGNED_URL=SIGNED_URL)
+                if not RESPONSE_HEADERS is None: RESPONSE_HEADERS['ETag'] = ETAG
+                if self._is_match_etag(ETAG=ETAG, IF_NONE_MATCH=IF_NONE_MATCH):
+                    ret_value = HTTPStatus.NOT_MODIFIED
+                else:
+                    # 署名付きURL(画像ダウンロード用)をAPI応答内容dictに設定
+                    cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=SIGNED_URL, KEY=cCommonFunc.API_RESP_DICT_KEY_URL)
             except Exception as e:
+                self._reset_bootstrap_state(ERROR=e)
                 ret_value = HTTPStatus.INTERNAL_SERVER_ERROR
                 # 例外内容をAPI処理結果詳細に設定
                 cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'{type(e).__name__}, {e}')
-                self.LOGGER_WRAPPER.output(MSG=f'self:<{self}>, ID:{ID}, EXPIRATION:{EXPIRATION}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+                self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, ID:{ID}, EXPIRATION:{EXPIRATION}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+        elif ret_value == HTTPStatus.BAD_REQUEST:
+            # リクエストデータに不正がある旨をAPI処理結果詳細に設定
+            cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'ID is not exist in table!\n\tID:{ID}')
         else:
+            # 内部変数に不正がある旨をAPI処理結果詳細に設定
+            cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'image table is not available!\n\tID:{ID}')
+        self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, ID:{ID}, EXPIRATION:{EXPIRATION}, ret_value:{ret_value}', PREFIX='::Leave')
+        return ret_value
+
+    def get_signed_url_for_converted_object_to_id(self, ID:str, FORMAT:str, API_RESULT_DATAS:dict[str, str], EXPIRATION:int=3600) -> int:
+        """IDに該当する電子ペーパー向けに変換した画像の署名付きURL(ダウンロード用)を取得する
+        ※GetItem 1回(取得属性を限定)で画像URL・画像フォーマット変換状態・変換して格納した出力形式名を取得し、変換可能かつ指定の出力形式を格納済みの画像のみ署名付きURLを発行する
+
+        Args:
+            ID (str): 画像ID
+            FORMAT (str): 出力形式名(png:インデックスカラーのPNG, raw/rle/zlib:ヘッダ付きのフレームバッファ(無圧縮/RLE圧縮/zlib圧縮))
+            API_RESULT_DATAS (dict[str, str]): API応答内容dict
+            EXPIRATION (int, optional): 有効期限(単位:秒). Defaults to 3600.
+
+        Returns:
+            int: httpステータスコード(画像フォーマット変換状態が変換可能以外の場合は409、指定の出力形式が格納されていない場合は404)
+        """
+        self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, ID:{ID}, FORMAT:{FORMAT}, EXPIRATION:{EXPIRATION}', PREFIX='::Enter')
+        if not FORMAT in self.CONVERTED_OBJECT_EXTENSIONS:
+            ret_value = HTTPStatus.BAD_REQUEST
+            # リクエストデータに不正がある旨をAPI処理結果詳細に設定
+            cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'format is invalid!\n\tFORMAT:{FORMAT}, FORMATS:{list(self.CONVERTED_OBJECT_EXTENSIONS.keys())}')
+            self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, ID:{ID}, FORMAT:{FORMAT}, ret_value:{ret_value}', PREFIX='::Leave')
+            return ret_value
+        CONVERTED_FORMATS:set[str] = set()
+        RECORD:cImageRecord = self._get_image_mng_record(ID=ID, CONVERTED_FORMATS=CONVERTED_FORMATS)
+        ret_value = HTTPStatus.OK if not RECORD is None and len(RECORD.id) > 0 else HTTPStatus.BAD_REQUEST if not RECORD is None else HTTPStatus.INTERNAL_SERVER_ERROR
+        if ret_value == HTTPStatus.OK and RECORD.convertible != eImageConvertibleKind.ENABLED:
+            ret_value = HTTPStatus.CONFLICT
+            # 変換した画像が存在しない旨をAPI処理結果詳細に設定
+            cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'image is not converted!\n\tID:{ID}, CONVERTIBLE:{eImageConvertibleKind.get_name_from_value(VALUE=RECORD.convertible)}')
+            cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=eImageConvertibleKind.get_name_from_value(VALUE=RECORD.convertible), KEY=cCommonFunc.API_RESP_DICT_KEY_CONVERTIBLE)
+        elif ret_value == HTTPStatus.OK and not FORMAT in CONVERTED_FORMATS:
+            # 変換可能状態を手動で変更した・変換処理の導入前に登録した等、指定の出力形式を格納していない画像は署名付きURLを発行しない
+            ret_value = HTTPStatus.NOT_FOUND
+            # 変換した画像が存在しない旨をAPI処理結果詳細に設定
+            cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'converted image is not found!\n\tID:{ID}, FORMAT:{FORMAT}, CONVERTED_FORMATS:{sorted(CONVERTED_FORMATS)}')
+        elif ret_value == HTTPStatus.OK:
+            try:
+                SIGNED_URL = self._get_signed_url(S3_CLIENT=self.S3_CLIENT, CLIENT_METHOD='get_object', EXPIRATION=EXPIRATION, OBJECT_KEY=self.get_converted_object_key(FILE_URL=RECORD.url, FORMAT=FORMAT))
+                # 署名付きURL(変換した画像のダウンロード用)をAPI応答内容dictに設定
+                cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=SIGNED_URL, KEY=cCommonFunc.API_RESP_DICT_KEY_URL)
+            except Exception as e:
+                self._reset_bootstrap_state(ERROR=e)
+                ret_value = HTTPStatus.INTERNAL_SERVER_ERROR
+                # 例外内容をAPI処理結果詳細に設定
+                cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'{type(e).__name__}, {e}')
+                self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, ID:{ID}, FORMAT:{FORMAT}, EXPIRATION:{EXPIRATION}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+        elif ret_value == HTTPStatus.BAD_REQUEST:
             # リクエストデータに不正がある旨をAPI処理結果詳細に設定
             cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'ID is not exist in table!\n\tID:{ID}')
-        self.LOGGER_WRAPPER.output(MSG=f'self:<{self}>, ID:{ID}, EXPIRATION:{EXPIRATION}, ret_value:{ret_value}', PREFIX='::Leave')
+        else:
+            # 内部変数に不正がある旨をAPI処理結果詳細に設定
+            cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'image table is not available!\n\tID:{ID}')
+        self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, ID:{ID}, FORMAT:{FORMAT}, EXPIRATION:{EXPIRATION}, ret_value:{ret_value}', PREFIX='::Leave')
         return ret_value
 
-    def update_hash_table_image_convertible_state(self, ID:str, CONVERTIBLE:str, API_RESULT_DATAS:dict[str, str]) -> int:
+    def update_hash_table_image_convertible_state(self, ID:str, CONVERTIBLE:str, API_RESULT_DATAS:dict[str, str], EXPECTED:str = '') -> int:
         """画像ID・画像変換状態・画像URLのhash-tableの画像変換状態を更新
+        ※IDの存在確認(および現在の画像変換状態の比較)を条件とした1回の条件付き書き込みで更新する
 
         Args:
             ID (str): 画像ID
             CONVERTIBLE (str): 画像変換状態(ex:'UNDETERMINED')
             API_RESULT_DATAS (dict[str, str]): API応答内容dict
+            EXPECTED (str, optional): 更新前に期待する画像変換状態(ex:'UNDETERMINED' ※一致する場合のみ更新、空文字の場合は比較しない). Defaults to ''.
 
         Returns:
-            int: httpステータスコード
+            int: httpステータスコード(IDが存在しない場合は400、現在の画像変換状態が期待する状態と異なる場合は409)
         """
-        self.LOGGER_WRAPPER.output(MSG=f'self:<{self}>, ID:{ID}, CONVERTIBLE:{CONVERTIBLE}', PREFIX='::Enter')
-        # IDがhash-table内に存在するか
-        ret_value = HTTPStatus.OK if self._is_exist_id_in_dynamodb_image_mng_table(ID=ID) else HTTPStatus.BAD_REQUEST
+        self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, ID:{ID}, CONVERTIBLE:{CONVERTIBLE}, EXPECTED:{EXPECTED}', PREFIX='::Enter')
+        # 画像IDが指定されている(カタログバージョン管理用アイテムは画像として扱わない) かつ 期待する画像変換状態が空 または 既知の名称
+        ret_value = HTTPStatus.OK if not cCommonFunc.is_none_or_empty(ID) and ID != self.CATALOG_VERSION_ID and (cCommonFunc.is_none_or_empty(EXPECTED) or eImageConvertibleKind.is_exist_name(NAME=EXPECTED)) else HTTPStatus.BAD_REQUEST
+        if ret_value == HTTPStatus.OK and self.ImageMngDynamoDbResource is None:
+            ret_value = HTTPStatus.INTERNAL_SERVER_ERROR
+        current_convertible:int = None
         if ret_value == HTTPStatus.OK:
             try:
+                KEY_SRC_ID = '#attr_id'
                 KEY_SRC_CONVERTIBLE = '#attr_convertible'
                 KEY_DST_CONVERTIBLE = ':newConvertible'
+                KEY_EXPECTED_CONVERTIBLE = ':expectedConvertible'
                 DB_TABLE = self.ImageMngDynamoDbResource.Table(self.DYNAMO_DB_IMAGE_MNG_TABLE_NAME)
                 OPTION = {
                     'Key': {cCommonFunc.API_RESP_DICT_KEY_ID:ID},
-                    'ExpressionAttributeNames': {KEY_SRC_CONVERTIBLE:cCommonFunc.API_RESP_DICT_KEY_CONVERTIBLE},
+                    'ExpressionAttributeNames': {KEY_SRC_ID:cCommonFunc.API_RESP_DICT_KEY_ID, KEY_SRC_CONVERTIBLE:cCommonFunc.API_RESP_DICT_KEY_CONVERTIBLE},
                     'ExpressionAttributeValues': {f'{KEY_DST_CONVERTIBLE}': eImageConvertibleKind.get_value_from_name(NAME=CONVERTIBLE)},
-                    'UpdateExpression': f'set {KEY_SRC_CONVERTIBLE} = {KEY_DST_CONVERTIBLE}'
+                    'UpdateExpression': f'set {KEY_SRC_CONVERTIBLE} = {KEY_DST_CONVERTIBLE}',
+                    # 存在しないIDへの更新(アイテムの新規作成)を防ぐ
+                    'ConditionExpression': f'attribute_exists({KEY_SRC_ID})',
+                    # 条件不一致時に現在のアイテムを返す(不存在と状態不一致の判別用)
+                    'ReturnValuesOnConditionCheckFailure': 'ALL_OLD',
                 }
+                if not cCommonFunc.is_none_or_empty(EXPECTED):
+                    OPTION['ExpressionAttributeValues'][KEY_EXPECTED_CONVERTIBLE] = eImageConvertibleKind.get_value_from_name(NAME=EXPECTED)
+                    OPTION['ConditionExpression'] += f' AND {KEY_SRC_CONVERTIBLE} = {KEY_EXPECTED_CONVERTIBLE}'
                 DB_TABLE.update_item(**OPTION)
+                self._bump_catalog_version()
+            except ClientError as e:
+                if e.response.get('Error', {}).get('Code', '') == 'ConditionalCheckFailedException':
+                    # 条件不一致時のアイテムはDynamoDB JSON形式で返される(アイテムが存在しない場合は無し)
+                    OLD_ITEM:dict = e.response.get('Item', None)
+                    current_convertible = None if OLD_ITEM is None else cImageRecord.from_wire(ITEM=OLD_ITEM).convertible
+                    ret_value = HTTPStatus.BAD_REQUEST if current_convertible is None else HTTPStatus.CONFLICT
+                else:
+                    self._reset_bootstrap_state(ERROR=e)
+                    ret_value = HTTPStatus.INTERNAL_SERVER_ERROR
+                    # 例外内容をAPI処理結果詳細に設定
+                    cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'{type(e).__name__}, {e}')
+                    self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, ID:{ID}, CONVERTIBLE:{CONVERTIBLE}, EXPECTED:{EXPECTED}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
             except Exception as e:
+                self._reset_bootstrap_state(ERROR=e)
                 ret_value = HTTPStatus.INTERNAL_SERVER_ERROR
                 # 例外内容をAPI処理結果詳細に設定
                 cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'{type(e).__name__}, {e}')
-                self.LOGGER_WRAPPER.output(MSG=f'self:<{self}>, ID:{ID}, CONVERTIBLE:{CONVERTIBLE}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
-        else:
+                self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, ID:{ID}, CONVERTIBLE:{CONVERTIBLE}, EXPECTED:{EXPECTED}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+        if ret_value == HTTPStatus.CONFLICT:
+            # 現在の画像変換状態が期待する状態と異なる旨をAPI処理結果詳細に設定
+            cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'convertible is not expected state!\n\tID:{ID}, EXPECTED:{EXPECTED}, CURRENT:{eImageConvertibleKind.get_name_from_value(VALUE=current_convertible)}')
+            cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=eImageConvertibleKind.get_name_from_value(VALUE=current_convertible), KEY=cCommonFunc.API_RESP_DICT_KEY_CONVERTIBLE)
+        elif ret_value == HTTPStatus.BAD_REQUEST and not cCommonFunc.is_none_or_empty(EXPECTED) and not eImageConvertibleKind.is_exist_name(NAME=EXPECTED):
+            # リクエストデータに不正がある旨をAPI処理結果詳細に設定
+            cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'EXPECTED is invalid!\n\tEXPECTED:{EXPECTED}')
+        elif ret_value == HTTPStatus.BAD_REQUEST:
             # リクエストデータに不正がある旨をAPI処理結果詳細に設定
             cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'ID is not exist in table!\n\tID:{ID}')
-        self.LOGGER_WRAPPER.output(MSG=f'self:<{self}>, ID:{ID}, CONVERTIBLE:{CONVERTIBLE}, ret_value:{ret_value}', PREFIX='::Leave')
+        self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, ID:{ID}, CONVERTIBLE:{CONVERTIBLE}, EXPECTED:{EXPECTED}, ret_value:{ret_value}', PREFIX='::Leave')
         return ret_value
 
-    def putitem_to_dynamodb_image_mng_table(self, FILE_URL:str, LAST_MODIFIED:str, API_RESULT_DATAS:dict[str, str], id:str = None, CONVERTIBLE:eImageConvertibleKind = eImageConvertibleKind.UNDETERMINED, dynamo_table = None) -> int:
-        """AWS DynamoDBの画像IDと画像URL管理テーブルにアイテムを追加
+    def get_converted_object_key(self, FILE_URL:str, FORMAT:str = 'png') -> str:
+        """画像URLから電子ペーパー向けに変換した画像のファイル名を取得
+        ※拡張子のみ異なる画像(ex:～.jpg, ～.png)の変換結果が衝突しないよう、元画像のファイル名(拡張子を含む)に出力形式の拡張子を付加する。
 
         Args:
-            FILE_URL (str): 画像URL
-            LAST_MODIFIED (str): 最終更新日時
+            FILE_URL (str): 画像URL(S3ファイルパス、ex:images/2024/05/～.jpeg)
+            FORMAT (str, optional): 出力形式名(png, raw, rle, zlib). Defaults to 'png'.
+
+        Returns:
+            str: 変換した画像のファイル名(ex:converted/images/2024/05/～.jpeg.png、converted/images/2024/05/～.jpeg.zlib.fb)
+        """
+        return f'{self.S3_CONVERTED_PREFIX}/{FILE_URL}{self.CONVERTED_OBJECT_EXTENSIONS[FORMAT]}'
+
+    def get_converted_object_keys(self, FILE_URL:str) -> list[str]:
+        """画像URLから電子ペーパー向けに変換した画像の全出力形式のファイル名を取得
+
+        Args:
+            FILE_URL (str): 画像URL(S3ファイルパス)
+
+        Returns:
+            list[str]: 変換した画像のファイル名リスト
+        """
+        return [self.get_converted_object_key(FILE_URL=FILE_URL, FORMAT=FORMAT) for FORMAT in self.CONVERTED_OBJECT_EXTENSIONS.keys()]
+
+    def convert_images_for_epaper(self, ITEMS:list[dict[str, str]], CONVERTER, API_RESULT_DATAS:dict[str, str], FAILED_URLS:set[str] = None) -> int:
+        """アップロードされた画像を電子ペーパー向けに変換して全出力形式をS3へ格納し、アイテムの画像フォーマット変換状態を設定
+        ※変換できた画像は変換可能、画像として読み込めない等で変換できなかった画像は変換不可をITEMSの各アイテムに設定する(DBへの書き込みは行わない)。
+        コンテナ内で反映済みのイベント(再配信) および 反映済みの削除より古いイベント・S3から削除済みの画像は変換しない(画像フォーマット変換状態を設定しない)。
+        他のコンテナで反映済みのイベントも変換しないよう、画像のダウンロード前に登録済みアイテムのシーケンサーを一括取得(BatchGetItem)し、登録済みより新しいイベントのみ変換する。
+
+        Args:
+            ITEMS (list[dict[str, str]]): 追加するアイテムリスト(ex:[{'url':'images/～', 'last_modified':'2024/01/01 12:34:56.000', 'sequencer':'0055AED6DCD90281E5'}, ...])
+            CONVERTER (_type_): 7色電子ペーパー向け画像変換クラス(cEpaperConverter)のインスタンス
             API_RESULT_DATAS (dict[str, str]): API応答内容dict
-            id (str, optional): 画像ID. Defaults to None.
-            CONVERTIBLE (eImageConvertibleKind, optional): 画像フォーマット変換状態. Defaults to eImageConvertibleKind.UNDETERMINED.
-            dynamo_table (_type_, optional): DynamoDBの画像IDと画像URL管理テーブルのインスタンス. Defaults to None.
+            FAILED_URLS (set[str], optional): 変換に失敗した(S3の読み書きに失敗した)画像URLの設定先(Noneの場合は設定しない). Defaults to None.
 
         Returns:
-            int: httpステータスコード
+            int: httpステータスコード(1件でも変換に失敗した場合は500)
+        """
+        self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, len(ITEMS):{-1 if ITEMS is None else len(ITEMS)}, CONVERTER:<{CONVERTER}>', PREFIX='::Enter')
+        ret_value = HTTPStatus.OK if not ITEMS is None and not CONVERTER is None and CONVERTER.ENABLED and not self.S3_CLIENT is None else HTTPStatus.INTERNAL_SERVER_ERROR
+        failed_urls:set[str] = set()
+        converted_count = 0
+        invalid_count = 0
+        skipped_count = 0
+        if ret_value == HTTPStatus.OK:
+            SEQUENCER_KEY = self.SEQUENCER_ATTRIBUTE_NAME
+
+            def _is_processed(FILE_URL:str, SEQUENCER:str) -> bool:
+                # コンテナ内で反映済みのイベント(再配信) または 反映済みの削除より古いイベント
+                return len(SEQUENCER) > 0 and (self.EventDedupeCache.contains(OBJECT_KEY=FILE_URL, SEQUENCER=SEQUENCER) or SEQUENCER <= self.EventDedupeCache.get_removed_sequencer(OBJECT_KEY=FILE_URL))
+
+            # 登録済みアイテムのシーケンサー・最終更新日時(変換対象の画像URLのみ一括取得)
+            STORED_ITEMS:dict[str, dict] = self._get_stored_image_mng_versions(FILE_URLS=list(dict.fromkeys(ITEM.get(cCommonFunc.API_RESP_DICT_KEY_URL, '') for ITEM in ITEMS if not cCommonFunc.is_none_or_empty(ITEM.get(cCommonFunc.API_RESP_DICT_KEY_URL, '')) and not _is_processed(FILE_URL=ITEM.get(cCommonFunc.API_RESP_DICT_KEY_URL, ''), SEQUENCER=self._normalize_sequencer(SEQUENCER=ITEM.get(SEQUENCER_KEY, ''))))))
+            CONVERTED_FORMATS_KEY = self.CONVERTED_FORMATS_ATTRIBUTE_NAME
+            # 変換済みの画像URL → 画像フォーマット変換状態(同一画像URLは1回のみ変換する)
+            CONVERTIBLES:dict[str, int] = {}
+            # 変換済みの画像URL → 格納した出力形式名
+            CONVERTED_FORMATS:dict[str, set[str]] = {}
+            for ITEM in ITEMS:
+                FILE_URL = ITEM.get(cCommonFunc.API_RESP_DICT_KEY_URL, '')
+                if FILE_URL in CONVERTIBLES:
+                    ITEM[cCommonFunc.API_RESP_DICT_KEY_CONVERTIBLE] = CONVERTIBLES[FILE_URL]
+                    if FILE_URL in CONVERTED_FORMATS: ITEM[CONVERTED_FORMATS_KEY] = CONVERTED_FORMATS[FILE_URL]
+                    continue
+                SEQUENCER = self._normalize_sequencer(SEQUENCER=ITEM.get(SEQUENCER_KEY, ''))
+                if cCommonFunc.is_none_or_empty(FILE_URL) or _is_processed(FILE_URL=FILE_URL, SEQUENCER=SEQUENCER):
+                    continue
+                # 他のコンテナで反映済みのイベント(登録済みアイテムより新しくない)はダウンロード・変換しない
+                if not self._is_newer_than_stored(STORED_ITEM=STORED_ITEMS.get(FILE_URL, None), SEQUENCER=SEQUENCER, LAST_MODIFIED=ITEM.get(cCommonFunc.API_RESP_DICT_KEY_LAST_MODIFIED, '')):
+                    skipped_count += 1
+                    continue
+                try:
+                    try:
+                        SRC:bytes = self.S3_CLIENT.get_object(Bucket=self.S3_BUCKET_NAME, Key=FILE_URL)['Body'].read()
+                    except ClientError as e:
+                        # 通知の処理前に削除された画像は変換しない
+                        if e.response.get('Error', {}).get('Code', '') in ('NoSuchKey', '404'): continue
+                        raise
+                    CONVERTED = CONVERTER.convert(SRC=SRC)
+                    if CONVERTED is None:
+                        CONVERTIBLES[FILE_URL] = eImageConvertibleKind.INVALID
+                        invalid_count += 1
+                    else:
+                        for FORMAT, BODY in CONVERTED.items():
+                            self.S3_CLIENT.put_object(Bucket=self.S3_BUCKET_NAME, Key=self.get_converted_object_key(FILE_URL=FILE_URL, FORMAT=FORMAT), Body=BODY, ContentType='image/png' if FORMAT == 'png' else 'application/octet-stream')
+                        CONVERTIBLES[FILE_URL] = eImageConvertibleKind.ENABLED
+                        CONVERTED_FORMATS[FILE_URL] = set(CONVERTED.keys())
+                        ITEM[CONVERTED_FORMATS_KEY] = CONVERTED_FORMATS[FILE_URL]
+                        converted_count += 1
+                    ITEM[cCommonFunc.API_RESP_DICT_KEY_CONVERTIBLE] = CONVERTIBLES[FILE_URL]
+                except Exception as e:
+                    # 失敗したアイテムのみ記録し、残りの変換を継続する
+                    failed_urls.add(FILE_URL)
+                    cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'{type(e).__name__}, {e}')
+                    self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, FILE_URL:{FILE_URL}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+            if len(failed_urls) > 0: ret_value = HTTPStatus.INTERNAL_SERVER_ERROR
+        if not FAILED_URLS is None: FAILED_URLS.update(failed_urls)
+        self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, len(ITEMS):{-1 if ITEMS is None else len(ITEMS)}, converted_count:{converted_count}, invalid_count:{invalid_count}, skipped_count:{skipped_count}, len(FAILED_URLS):{len(failed_urls)}, ret_value:{ret_value}', PREFIX='::Leave')
+        return ret_value
+
+    def putitems_to_dynamodb_image_mng_table(self, ITEMS:list[dict[str, str]], API_RESULT_DATAS:dict[str, str], FAILED_URLS:set[str] = None) -> int:
+        """AWS DynamoDBの画像IDと画像URL管理テーブルにアイテムを一括追加(冪等)
+        ※画像IDは画像URLから決定的に生成し、S3イベントのシーケンサーが既存アイテムより新しい場合のみ書き込む条件付きPutItemで追加する。
+        同一画像URLが複数含まれる場合はシーケンサーが最も新しいものを採用し、コンテナ内で反映済みのイベント(画像URL・シーケンサー)は書き込まない。
+        書き込み前に登録済みアイテムのシーケンサーを一括取得(BatchGetItem)し、登録済みより新しくないイベント(他のコンテナで反映済みの再配信等)は書き込まない。
+        画像IDを画像URLから生成する前に登録した同一画像URLのアイテムは、画像URLから生成した画像IDのアイテムへ置き換える。
+        書き込みに失敗した画像URLはFAILED_URLSに設定し、残りの書き込みは継続する。
+
+        Args:
+            ITEMS (list[dict[str, str]]): 追加するアイテムリスト(ex:[{'url':'images/～', 'last_modified':'2024/01/01 12:34:56.000', 'sequencer':'0055AED6DCD90281E5'}, ...])
+            API_RESULT_DATAS (dict[str, str]): API応答内容dict
+            FAILED_URLS (set[str], optional): 書き込みに失敗した画像URLの設定先(Noneの場合は設定しない). Defaults to None.
+
+        Returns:
+            int: httpステータスコード(1件でも書き込みに失敗した場合は500)
         """
-        ret_value = HTTPStatus.OK if not self.ImageMngDynamoDbResource is None and not cCommonFunc.is_none_or_empty(FILE_URL) else HTTPStatus.INTERNAL_SERVER_ERROR
+        self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, len(ITEMS):{-1 if ITEMS is None else len(ITEMS)}', PREFIX='::Enter')
+        ret_value = HTTPStatus.OK if not ITEMS is None and not self.DynamoDBClient is None else HTTPStatus.INTERNAL_SERVER_ERROR
+        failed_urls:set[str] = set()
+        written_count = 0
+        skipped_count = 0
         if ret_value == HTTPStatus.OK:
             try:
-                if id is None: id = str(uuid4())
-                if dynamo_table is None: dynamo_table = self.ImageMngDynamoDbResource.Table(self.DYNAMO_DB_IMAGE_MNG_TABLE_NAME)
-                ITEM = {cCommonFunc.API_RESP_DICT_KEY_ID:id, cCommonFunc.API_RESP_DICT_KEY_URL:FILE_URL, cCommonFunc.API_RESP_DICT_KEY_LAST_MODIFIED:LAST_MODIFIED, cCommonFunc.API_RESP_DICT_KEY_CONVERTIBLE:CONVERTIBLE}
-                dynamo_table.put_item(Item=ITEM)
+                SEQUENCER_KEY = self.SEQUENCER_ATTRIBUTE_NAME
+                # 画像URLで重複排除(シーケンサーが最も新しいものを採用)
+                UNIQUE_ITEMS:dict[str, dict[str, str]] = {}
+                for ITEM in ITEMS:
+                    FILE_URL = ITEM.get(cCommonFunc.API_RESP_DICT_KEY_URL, '')
+                    if cCommonFunc.is_none_or_empty(FILE_URL): continue
+                    PREV_ITEM = UNIQUE_ITEMS.get(FILE_URL, None)
+                    if PREV_ITEM is None or self._normalize_sequencer(SEQUENCER=PREV_ITEM.get(SEQUENCER_KEY, '')) <= self._normalize_sequencer(SEQUENCER=ITEM.get(SEQUENCER_KEY, '')):
+                        UNIQUE_ITEMS[FILE_URL] = ITEM
+                TARGET_ITEMS:dict[str, dict[str, str]] = {}
+                for FILE_URL, ITEM in UNIQUE_ITEMS.items():
+                    SEQUENCER = self._normalize_sequencer(SEQUENCER=ITEM.get(SEQUENCER_KEY, ''))
+                    # コンテナ内で反映済みのイベント(再配信) および 反映済みの削除より古いイベントは書き込まない
+                    if len(SEQUENCER) > 0 and (self.EventDedupeCache.contains(OBJECT_KEY=FILE_URL, SEQUENCER=SEQUENCER) or SEQUENCER <= self.EventDedupeCache.get_removed_sequencer(OBJECT_KEY=FILE_URL)):
+                        skipped_count += 1
+                        continue
+                    TARGET_ITEMS[FILE_URL] = ITEM
+                STORED_ITEMS:dict[str, dict] = self._get_stored_image_mng_versions(FILE_URLS=list(TARGET_ITEMS.keys()))
+                for FILE_URL, ITEM in TARGET_ITEMS.items():
+                    SEQUENCER = self._normalize_sequencer(SEQUENCER=ITEM.get(SEQUENCER_KEY, ''))
+                    LAST_MODIFIED = ITEM.get(cCommonFunc.API_RESP_DICT_KEY_LAST_MODIFIED, '')
+                    # 登録済みアイテムより新しくないイベントは書き込まない
+                    if not self._is_newer_than_stored(STORED_ITEM=STORED_ITEMS.get(FILE_URL, None), SEQUENCER=SEQUENCER, LAST_MODIFIED=LAST_MODIFIED):
+                        skipped_count += 1
+                        self.EventDedupeCache.put(OBJECT_KEY=FILE_URL, SEQUENCER=SEQUENCER)
+                        continue
+                    try:
+                        # 画像URLから生成した画像IDのアイテムが登録済みの場合は、同一画像URLのアイテムを増やさないため画像URLインデックスの確認を省略する
+                        if self._put_image_mng_item_if_newer(FILE_URL=FILE_URL, LAST_MODIFIED=LAST_MODIFIED, SEQUENCER=SEQUENCER, CONVERTIBLE=ITEM.get(cCommonFunc.API_RESP_DICT_KEY_CONVERTIBLE, eImageConvertibleKind.UNDETERMINED), CONVERTED_FORMATS=ITEM.get(self.CONVERTED_FORMATS_ATTRIBUTE_NAME, None), LOOKUP_LEGACY=not FILE_URL in STORED_ITEMS):
+                            written_count += 1
+                        else:
+                            skipped_count += 1
+                        self.EventDedupeCache.put(OBJECT_KEY=FILE_URL, SEQUENCER=SEQUENCER)
+                    except Exception as e:
+                        # 失敗したアイテムのみ記録し、残りの書き込みを継続する
+                        failed_urls.add(FILE_URL)
+                        cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'{type(e).__name__}, {e}')
+                        self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, FILE_URL:{FILE_URL}, SEQUENCER:{SEQUENCER}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+                if written_count > 0: self._bump_catalog_version()
+                if len(failed_urls) > 0: ret_value = HTTPStatus.INTERNAL_SERVER_ERROR
             except Exception as e:
+                self._reset_bootstrap_state(ERROR=e)
                 ret_value = HTTPStatus.INTERNAL_SERVER_ERROR
+                failed_urls.update(ITEM.get(cCommonFunc.API_RESP_DICT_KEY_URL, '') for ITEM in ITEMS)
                 # 例外内容をAPI処理結果詳細に設定
                 cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'{type(e).__name__}, {e}')
-                self.LOGGER_WRAPPER.output(MSG=f'self:<{self}>, FILE_URL:{FILE_URL}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+                self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, len(ITEMS):{len(ITEMS)}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+        if not FAILED_URLS is None: FAILED_URLS.update(failed_urls)
+        self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, len(ITEMS):{-1 if ITEMS is None else len(ITEMS)}, written_count:{written_count}, skipped_count:{skipped_count}, len(FAILED_URLS):{len(failed_urls)}, ret_value:{ret_value}', PREFIX='::Leave')
+        return ret_value
+
+    def get_image_id_from_url(self, FILE_URL:str) -> str:
+        """画像URLから画像IDを生成(同一バケット・同一画像URLであれば常に同じ画像IDとなる)
+
+        Args:
+            FILE_URL (str): 画像URL(S3ファイルパス)
+
+        Returns:
+            str: 画像ID(UUID形式)
+        """
+        return str(uuid5(NAMESPACE_URL, f's3://{self.S3_BUCKET_NAME}/{FILE_URL}'))
+
+    def _put_image_mng_item_if_newer(self, FILE_URL:str, LAST_MODIFIED:str, SEQUENCER:str = '', CONVERTIBLE:int = eImageConvertibleKind.UNDETERMINED, CONVERTED_FORMATS:set[str] = None, LOOKUP_LEGACY:bool = True) -> bool:
+        """画像IDと画像URL管理テーブルへの条件付き追加(画像URLインデックスへのQuery 1回 + PutItem 1回)
+        ※シーケンサー指定時はアイテムが存在しない または 既存アイテムのシーケンサーより新しい場合のみ書き込む
+        (シーケンサーを持たない既存アイテムは最終更新日時で比較する)。シーケンサー未指定時はアイテムが存在しない場合のみ書き込む。
+        画像IDを画像URLから生成する前に登録した同一画像URLのアイテムが存在する場合は、画像URLから生成した画像IDのアイテムの追加と
+        既存アイテムの削除を1回のトランザクションで行い(既存アイテムの方が新しい場合は何もしない)、同一画像URLのアイテムを増やさない。
+
+        Args:
+            FILE_URL (str): 画像URL
+            LAST_MODIFIED (str): 最終更新日時
+            SEQUENCER (str, optional): 正規化済みのS3イベントのシーケンサー. Defaults to ''.
+            CONVERTIBLE (int, optional): 画像フォーマット変換状態. Defaults to eImageConvertibleKind.UNDETERMINED.
+            CONVERTED_FORMATS (set[str], optional): 電子ペーパー向けに変換して格納した出力形式名(Noneの場合は設定しない). Defaults to None.
+            LOOKUP_LEGACY (bool, optional): 画像IDを画像URLから生成する前に登録したアイテムを画像URLインデックスで確認するか. Defaults to True.
+
+        Returns:
+            bool: 書き込んだ場合はTrue、条件不成立(重複・古いイベント)で書き込まなかった場合はFalse ※通信エラー等は例外を送出する
+        """
+        ITEM = {cCommonFunc.API_RESP_DICT_KEY_ID:self.get_image_id_from_url(FILE_URL=FILE_URL), cCommonFunc.API_RESP_DICT_KEY_URL:FILE_URL, cCommonFunc.API_RESP_DICT_KEY_LAST_MODIFIED:LAST_MODIFIED, cCommonFunc.API_RESP_DICT_KEY_CONVERTIBLE:CONVERTIBLE}
+        OPTION = {'TableName':self.DYNAMO_DB_IMAGE_MNG_TABLE_NAME, 'Item':ITEM, 'ConditionExpression':'attribute_not_exists(#attr_id)', 'ExpressionAttributeNames':{'#attr_id':cCommonFunc.API_RESP_DICT_KEY_ID}}
+        # 空の文字列セットは書き込めないため、出力形式を格納した場合のみ設定する
+        if not CONVERTED_FORMATS is None and len(CONVERTED_FORMATS) > 0:
+            ITEM[self.CONVERTED_FORMATS_ATTRIBUTE_NAME] = set(CONVERTED_FORMATS)
+        if len(SEQUENCER) > 0:
+            ITEM[self.SEQUENCER_ATTRIBUTE_NAME] = SEQUENCER
+            OPTION['ConditionExpression'] = 'attribute_not_exists(#attr_id) OR #attr_sequencer < :sequencer OR (attribute_not_exists(#attr_sequencer) AND #attr_last_modified < :lastModified)'
+            OPTION['ExpressionAttributeNames'].update({'#attr_sequencer':self.SEQUENCER_ATTRIBUTE_NAME, '#attr_last_modified':cCommonFunc.API_RESP_DICT_KEY_LAST_MODIFIED})
+            OPTION['ExpressionAttributeValues'] = {':sequencer':SEQUENCER, ':lastModified':LAST_MODIFIED}
+        # 画像IDを画像URLから生成する前に登録したアイテム(インデックスが利用できない場合は対象なし)
+        LEGACY_RECORDS:list[cImageRecord] = [RECORD for RECORD in (self._query_image_mng_records_by_url(FILE_URL=FILE_URL) if LOOKUP_LEGACY else None) or [] if RECORD.id != ITEM[cCommonFunc.API_RESP_DICT_KEY_ID]]
+        try:
+            if len(LEGACY_RECORDS) <= 0:
+                self.DynamoDBClient.put_item(**OPTION)
+            else:
+                # 変換状態が未確定の場合は既存アイテムの変換状態を引き継ぐ
+                if CONVERTIBLE == eImageConvertibleKind.UNDETERMINED: ITEM[cCommonFunc.API_RESP_DICT_KEY_CONVERTIBLE] = LEGACY_RECORDS[0].convertible
+                # 既存アイテムが本イベントより新しい場合は削除しない(トランザクション全体を取り消す)
+                DELETE_OPTION = {'TableName':self.DYNAMO_DB_IMAGE_MNG_TABLE_NAME, 'ConditionExpression':'attribute_exists(#attr_id) AND (attribute_not_exists(#attr_last_modified) OR #attr_last_modified <= :lastModified)', 'ExpressionAttributeNames':{'#attr_id':cCommonFunc.API_RESP_DICT_KEY_ID, '#attr_last_modified':cCommonFunc.API_RESP_DICT_KEY_LAST_MODIFIED}, 'ExpressionAttributeValues':{':lastModified':LAST_MODIFIED}}
+                if len(SEQUENCER) > 0:
+                    DELETE_OPTION['ConditionExpression'] = 'attribute_exists(#attr_id) AND (#attr_sequencer < :sequencer OR (attribute_not_exists(#attr_sequencer) AND (attribute_not_exists(#attr_last_modified) OR #attr_last_modified <= :lastModified)))'
+                    DELETE_OPTION['ExpressionAttributeNames']['#attr_sequencer'] = self.SEQUENCER_ATTRIBUTE_NAME
+                    DELETE_OPTION['ExpressionAttributeValues'][':sequencer'] = SEQUENCER
+                self.DynamoDBClient.transact_write_items(TransactItems=[{'Put':OPTION}] + [{'Delete':{**DELETE_OPTION, 'Key':{cCommonFunc.API_RESP_DICT_KEY_ID:RECORD.id}}} for RECORD in LEGACY_RECORDS[:99]])
+        except ClientError as e:
+            CODE:str = e.response.get('Error', {}).get('Code', '')
+            if CODE == 'ConditionalCheckFailedException':
+                return False
+            if CODE == 'TransactionCanceledException' and any(REASON.get('Code', '') == 'ConditionalCheckFailed' for REASON in e.response.get('CancellationReasons', [])):
+                return False
+            raise
+        return True
+
+    def _get_stored_image_mng_versions(self, FILE_URLS:list[str]) -> dict[str, dict]:
+        """画像URLから生成した画像IDの登録済みアイテムのシーケンサー・最終更新日時を一括取得(BatchGetItem、100件単位)
+        ※書き込み・変換前の事前確認用のため、取得に失敗した場合は空のdictを返す(条件付き書き込みで判定する)
+
+        Args:
+            FILE_URLS (list[str]): 画像URLリスト(重複なし)
+
+        Returns:
+            dict[str, dict]: 画像URLをキーとした登録済みアイテムdict(未登録・未処理の画像URLは含まない)
+        """
+        ret_value:dict[str, dict] = {}
+        if len(FILE_URLS) > 0:
+            try:
+                IDS:dict[str, str] = {self.get_image_id_from_url(FILE_URL=URL):URL for URL in FILE_URLS}
+                ITEMS = self._batch_get_image_mng_items(IDS=list(IDS.keys()), ATTRIBUTE_NAMES=[cCommonFunc.API_RESP_DICT_KEY_ID, cCommonFunc.API_RESP_DICT_KEY_URL, cCommonFunc.API_RESP_DICT_KEY_LAST_MODIFIED, self.SEQUENCER_ATTRIBUTE_NAME])
+                ret_value = {IDS[ID]:ITEM for ID, ITEM in ITEMS.items() if ITEM.get(cCommonFunc.API_RESP_DICT_KEY_URL, '') == IDS.get(ID, None)}
+            except Exception as e:
+                self._reset_bootstrap_state(ERROR=e)
+                self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, len(FILE_URLS):{len(FILE_URLS)}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
         return ret_value
 
-    def deleteitem_to_dynamodb_image_mng_table(self, API_RESULT_DATAS:dict[str, str], ids:list, dynamo_table = None) -> int:
-        """AWS DynamoDBの画像IDと画像URL管理テーブルからアイテムを削除
+    def _is_newer_than_stored(self, STORED_ITEM:dict, SEQUENCER:str, LAST_MODIFIED:str) -> bool:
+        """イベントが登録済みアイテムより新しいか(_put_image_mng_item_if_newerの書き込み条件と同じ判定)
+
+        Args:
+            STORED_ITEM (dict): 登録済みアイテム(未登録の場合はNone)
+            SEQUENCER (str): 正規化済みのS3イベントのシーケンサー
+            LAST_MODIFIED (str): 最終更新日時
+
+        Returns:
+            bool: 未登録 または 登録済みアイテムより新しい場合はTrue、それ以外はFalse
+        """
+        if STORED_ITEM is None:
+            return True
+        if len(SEQUENCER) <= 0:
+            return False
+        STORED_SEQUENCER:str = STORED_ITEM.get(self.SEQUENCER_ATTRIBUTE_NAME, None)
+        if not STORED_SEQUENCER is None:
+            return STORED_SEQUENCER < SEQUENCER
+        return STORED_ITEM.get(cCommonFunc.API_RESP_DICT_KEY_LAST_MODIFIED, '') < LAST_MODIFIED
+
+    @classmethod
+    def _normalize_sequencer(cls, SEQUENCER:str) -> str:
+        """S3イベントのシーケンサーを文字列比較可能な形式へ正規化
+        ※シーケンサーは16進数文字列で長さが異なる場合があるため、大文字化して先頭を0埋めした固定長にする
+
+        Args:
+            SEQUENCER (str): S3イベントのシーケンサー
+
+        Returns:
+            str: 正規化したシーケンサー(未指定の場合は空文字)
+        """
+        return '' if cCommonFunc.is_none_or_empty(SEQUENCER) else str(SEQUENCER).upper().rjust(32, '0')
+
+    def deleteitems_by_url_to_dynamodb_image_mng_table(self, ITEMS:list[dict[str, str]], API_RESULT_DATAS:dict[str, str], FAILED_URLS:set[str] = None) -> int:
+        """AWS DynamoDBの画像IDと画像URL管理テーブルから画像URLに該当するアイテムを削除(S3のObjectRemovedイベント用、冪等)
+        ※画像URLから決定的に生成した画像IDで、画像URLが一致し かつ 既存アイテムのシーケンサーが削除イベントより古い場合のみ削除する条件付きDeleteItemを行う。
+        削除イベントより新しい追加イベントで登録済みのアイテム・削除済みのアイテムは削除しない(重複・順序逆転したイベントは無視される)。
+        削除したアイテムの電子ペーパー向けに変換した画像もS3から削除する。
 
         Args:
+            ITEMS (list[dict[str, str]]): 削除するアイテムリスト(ex:[{'url':'images/～', 'sequencer':'0055AED6DCD90281E5'}, ...])
             API_RESULT_DATAS (dict[str, str]): API応答内容dict
-            ids (list, optional): 画像IDリスト
-            dynamo_table (_type_, optional): DynamoDBの画像IDと画像URL管理テーブルのインスタンス. Defaults to None.
+            FAILED_URLS (set[str], optional): 削除に失敗した画像URLの設定先(Noneの場合は設定しない). Defaults to None.
 
         Returns:
-            int: httpステータスコード
-            list: API出力結果
+            int: httpステータスコード(1件でも削除に失敗した場合は500)
         """
-        ret_value = HTTPStatus.OK if not self.ImageMngDynamoDbResource is None else HTTPStatus.INTERNAL_SERVER_ERROR
+        self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, len(ITEMS):{-1 if ITEMS is None else len(ITEMS)}', PREFIX='::Enter')
+        ret_value = HTTPStatus.OK if not ITEMS is None and not self.DynamoDBClient is None else HTTPStatus.INTERNAL_SERVER_ERROR
+        failed_urls:set[str] = set()
+        deleted_urls:list[str] = []
+        deleted_count = 0
+        skipped_count = 0
         if ret_value == HTTPStatus.OK:
-            API_RESULT_DATAS['result'] = []
-            # 複数IDを受け取り時に一部の不備を検知して400を返す
-            is_warned = False
-
-            # idsを参照してDynamoDBから削除
             try:
-                self.LOGGER_WRAPPER.output(MSG=f'delete_dynamodb_images', PREFIX='::Enter')
-                for id in ids:
+                SEQUENCER_KEY = self.SEQUENCER_ATTRIBUTE_NAME
+                # 画像URLで重複排除(シーケンサーが最も新しいものを採用)
+                UNIQUE_SEQUENCERS:dict[str, str] = {}
+                for ITEM in ITEMS:
+                    FILE_URL = ITEM.get(cCommonFunc.API_RESP_DICT_KEY_URL, '')
+                    if cCommonFunc.is_none_or_empty(FILE_URL): continue
+                    UNIQUE_SEQUENCERS[FILE_URL] = max(UNIQUE_SEQUENCERS.get(FILE_URL, ''), self._normalize_sequencer(SEQUENCER=ITEM.get(SEQUENCER_KEY, '')))
+                for FILE_URL, SEQUENCER in UNIQUE_SEQUENCERS.items():
+                    # コンテナ内で反映済みのイベント(再配信)は削除しない
+                    if len(SEQUENCER) > 0 and self.EventDedupeCache.contains(OBJECT_KEY=FILE_URL, SEQUENCER=SEQUENCER):
+                        skipped_count += 1
+                        continue
                     try:
-                        ret_value = HTTPStatus.OK if self._is_exist_id_in_dynamodb_image_mng_table(ID=id) else HTTPStatus.BAD_REQUEST
-                        if ret_value == HTTPStatus.OK:
-                            if dynamo_table is None: dynamo_table = self.ImageMngDynamoDbResource.Table(self.DYNAMO_DB_IMAGE_MNG_TABLE_NAME)
-                            ITEM = {cCommonFunc.API_RESP_DICT_KEY_ID:id}
-                            res = dynamo_table.delete_item(Key=ITEM)
-                            API_RESULT_DATAS['result'].append('OK')
-                            ret_value = HTTPStatus.BAD_REQUEST if is_warned == True else HTTPStatus.OK  
+                        if self._delete_image_mng_item_if_older(FILE_URL=FILE_URL, SEQUENCER=SEQUENCER):
+                            deleted_count += 1
+                            deleted_urls.append(FILE_URL)
+                            self.SignedUrlCache.invalidate(OBJECT_KEY=FILE_URL)
                         else:
-                            # 入力IDが存在しない場合に発火
-                            is_warned = True
-                            API_RESULT_DATAS['result'].append('NG')
-                            cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'{'An invalid ID was detected.'}')
-                            self.LOGGER_WRAPPER.output(MSG=f'self:<{self}>, {'An invalid ID was detected.'}', LEVEL=logging.WARN)
-                    # 不正なIDが入力された際に発火
-                    except (ClientError, IndexError) as e:
-                        is_warned = True
-                        ret_value = HTTPStatus.BAD_REQUEST
-                        API_RESULT_DATAS['result'].append('NG')
-                        # 例外内容をAPI処理結果詳細に設定
-                        cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'{type(e).__name__}, {'An invalid ID was detected.'}')
-                        self.LOGGER_WRAPPER.output(MSG=f'self:<{self}>, len(ids):{-1 if ids is None else len(ids)}, {type(e).__name__}! {'An invalid ID was detected.'}', LEVEL=logging.WARN)
-                        self.LOGGER_WRAPPER.output(MSG=f'self:<{self}>, len(ids):{-1 if ids is None else len(ids)}, ret_value:{ret_value}', PREFIX='::Leave')
-                        pass
-            
-                self.LOGGER_WRAPPER.output(MSG=f'delete_dynamodb_images', PREFIX='::Leave')
+                            skipped_count += 1
+                        self.EventDedupeCache.put(OBJECT_KEY=FILE_URL, SEQUENCER=SEQUENCER)
+                        self.EventDedupeCache.put_removed(OBJECT_KEY=FILE_URL, SEQUENCER=SEQUENCER)
+                    except Exception as e:
+                        # 失敗したアイテムのみ記録し、残りの削除を継続する
+                        failed_urls.add(FILE_URL)
+                        cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'{type(e).__name__}, {e}')
+                        self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, FILE_URL:{FILE_URL}, SEQUENCER:{SEQUENCER}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+                if deleted_count > 0:
+                    self._bump_catalog_version()
+                    try:
+                        # 電子ペーパー向けに変換した画像も削除する(失敗してもアイテムの削除結果には影響させない)
+                        self._delete_s3_objects(OBJECT_KEYS=[KEY for FILE_URL in deleted_urls for KEY in self.get_converted_object_keys(FILE_URL=FILE_URL)])
+                    except Exception as e:
+                        self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, len(deleted_urls):{len(deleted_urls)}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+                if len(failed_urls) > 0: ret_value = HTTPStatus.INTERNAL_SERVER_ERROR
+            except Exception as e:
+                self._reset_bootstrap_state(ERROR=e)
+                ret_value = HTTPStatus.INTERNAL_SERVER_ERROR
+                failed_urls.update(ITEM.get(cCommonFunc.API_RESP_DICT_KEY_URL, '') for ITEM in ITEMS)
+                # 例外内容をAPI処理結果詳細に設定
+                cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'{type(e).__name__}, {e}')
+                self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, len(ITEMS):{len(ITEMS)}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+        if not FAILED_URLS is None: FAILED_URLS.update(failed_urls)
+        self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, len(ITEMS):{-1 if ITEMS is None else len(ITEMS)}, deleted_count:{deleted_count}, skipped_count:{skipped_count}, len(FAILED_URLS):{len(failed_urls)}, ret_value:{ret_value}', PREFIX='::Leave')
+        return ret_value
+
+    def _delete_image_mng_item_if_older(self, FILE_URL:str, SEQUENCER:str = '') -> bool:
+        """画像IDと画像URL管理テーブルからの条件付き削除(DeleteItem 1回)
+        ※画像URLが一致し、シーケンサー指定時は既存アイテムがシーケンサーを持たない または 削除イベントより古い場合のみ削除する。
+        画像URLから生成した画像IDで削除できなかった場合は、画像URLインデックスで画像IDを画像URLから生成する前に登録したアイテムを検索して同じ条件で削除する。
+
+        Args:
+            FILE_URL (str): 画像URL
+            SEQUENCER (str, optional): 正規化済みの削除イベントのシーケンサー. Defaults to ''.
+
+        Returns:
+            bool: 削除した場合はTrue、条件不成立(削除済み・新しい追加イベントで登録済み)で削除しなかった場合はFalse ※通信エラー等は例外を送出する
+        """
+        ID = self.get_image_id_from_url(FILE_URL=FILE_URL)
+        OPTION = {'TableName':self.DYNAMO_DB_IMAGE_MNG_TABLE_NAME, 'Key':{cCommonFunc.API_RESP_DICT_KEY_ID:ID}, 'ConditionExpression':'#attr_url = :url', 'ExpressionAttributeNames':{'#attr_url':cCommonFunc.API_RESP_DICT_KEY_URL}, 'ExpressionAttributeValues':{':url':FILE_URL}}
+        if len(SEQUENCER) > 0:
+            OPTION['ConditionExpression'] = '#attr_url = :url AND (attribute_not_exists(#attr_sequencer) OR #attr_sequencer < :sequencer)'
+            OPTION['ExpressionAttributeNames']['#attr_sequencer'] = self.SEQUENCER_ATTRIBUTE_NAME
+            OPTION['ExpressionAttributeValues'][':sequencer'] = SEQUENCER
+
+        def _delete(KEY_ID:str) -> bool:
+            OPTION['Key'] = {cCommonFunc.API_RESP_DICT_KEY_ID:KEY_ID}
+            try:
+                self.DynamoDBClient.delete_item(**OPTION)
+            except ClientError as e:
+                if e.response.get('Error', {}).get('Code', '') == 'ConditionalCheckFailedException':
+                    return False
+                raise
+            return True
+
+        ret_value = _delete(KEY_ID=ID)
+        if not ret_value:
+            # 画像IDを画像URLから生成する前に登録したアイテム(インデックスが利用できない場合は対象なし)
+            for RECORD in self._query_image_mng_records_by_url(FILE_URL=FILE_URL) or []:
+                if RECORD.id != ID and _delete(KEY_ID=RECORD.id): ret_value = True
+        return ret_value
+
+    def delete_images(self, IDS:list[str], API_RESULT_DATAS:dict[str, str|list]) -> int:
+        """画像の一括削除(S3オブジェクトおよび画像IDと画像URL管理テーブルのアイテム)
+        ※BatchGetItemで全IDのURLを取得し、S3はdelete_objects(1000件単位)、DBはbatch_writerでまとめて削除する
+
+        Args:
+            IDS (list[str]): 削除対象の画像IDリスト
+            API_RESULT_DATAS (dict[str, str|list]): API応答内容dict ※本dict内の"result"キーにIDごとの処理結果('OK'/'NG')リストが設定される(スループット超過で未処理のIDは"unprocessed_ids"キーにも設定される)
+
+        Returns:
+            int: httpステータスコード(スループット超過で未処理のIDがある場合は503、S3オブジェクトの削除に失敗した場合は500、不正なIDのみの場合は400)
+        """
+        self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, len(IDS):{-1 if IDS is None else len(IDS)}', PREFIX='::Enter')
+        ret_value = HTTPStatus.OK if not cCommonFunc.is_none_or_empty(IDS) and isinstance(IDS, list) else HTTPStatus.BAD_REQUEST
+        if ret_value != HTTPStatus.OK:
+            # リクエストデータに不正がある旨をAPI処理結果詳細に設定
+            cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'The input image file path list is empty or there is no URL storage location.')
+        elif not self._create_s3_bucket(S3_CLIENT=self.S3_CLIENT, API_RESULT_DATAS=API_RESULT_DATAS) or self.ImageMngDynamoDbResource is None:
+            ret_value = HTTPStatus.INTERNAL_SERVER_ERROR
+
+        if ret_value == HTTPStatus.OK:
+            try:
+                VALID_IDS:list[str] = list(dict.fromkeys(ID for ID in IDS if isinstance(ID, str) and len(ID) > 0 and ID != self.CATALOG_VERSION_ID))
+                # 全IDのURLを一括取得
+                UNPROCESSED_IDS:set[str] = set()
+                ITEMS:dict[str, dict] = self._batch_get_image_mng_items(IDS=VALID_IDS, UNPROCESSED_IDS=UNPROCESSED_IDS)
+                URLS:dict[str, str] = {ID:ITEM.get(cCommonFunc.API_RESP_DICT_KEY_URL, '') for ID, ITEM in ITEMS.items()}
+                # S3オブジェクトを電子ペーパー向けに変換した画像とあわせて一括削除(削除に失敗したキーを取得)
+                OBJECT_KEYS:list[str] = [URL for URL in URLS.values() if len(URL) > 0]
+                FAILED_KEYS:set[str] = self._delete_s3_objects(OBJECT_KEYS=OBJECT_KEYS + [KEY for URL in OBJECT_KEYS for KEY in self.get_converted_object_keys(FILE_URL=URL)])
+                DELETE_IDS:list[str] = [ID for ID, URL in URLS.items() if not URL in FAILED_KEYS]
+                # 画像IDと画像URL管理テーブルのアイテムを一括削除
+                DYNAMO_TABLE = self.ImageMngDynamoDbResource.Table(self.DYNAMO_DB_IMAGE_MNG_TABLE_NAME)
+                with DYNAMO_TABLE.batch_writer() as BATCH:
+                    for ID in DELETE_IDS:
+                        BATCH.delete_item(Key={cCommonFunc.API_RESP_DICT_KEY_ID:ID})
+                if len(DELETE_IDS) > 0: self._bump_catalog_version()
+                for ID in DELETE_IDS:
+                    self.SignedUrlCache.invalidate(OBJECT_KEY=URLS[ID])
+                # 入力IDの順にIDごとの処理結果を設定
+                DELETED_IDS:set[str] = set(DELETE_IDS)
+                RESULTS:list[str] = ['OK' if isinstance(ID, str) and ID in DELETED_IDS else 'NG' for ID in IDS]
+                API_RESULT_DATAS[cCommonFunc.API_RESP_DICT_KEY_RESULT] = RESULTS
+                if len(UNPROCESSED_IDS) > 0:
+                    # スループット超過で未処理のIDは不正なIDと区別し、再試行可能な503を返す
+                    ret_value = HTTPStatus.SERVICE_UNAVAILABLE
+                    API_RESULT_DATAS[cCommonFunc.API_RESP_DICT_KEY_UNPROCESSED_IDS] = [ID for ID in VALID_IDS if ID in UNPROCESSED_IDS]
+                    cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'Throughput exceeded. Retry the unprocessed IDs.\n\tlen(UNPROCESSED_IDS):{len(UNPROCESSED_IDS)}')
+                    self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, Throughput exceeded. len(IDS):{len(IDS)}, len(DELETED_IDS):{len(DELETED_IDS)}, len(FAILED_KEYS):{len(FAILED_KEYS)}, len(UNPROCESSED_IDS):{len(UNPROCESSED_IDS)}', LEVEL=logging.WARN)
+                elif len(FAILED_KEYS) > 0:
+                    # S3オブジェクトの削除に失敗したIDは不正なIDではないため500を返す
+                    ret_value = HTTPStatus.INTERNAL_SERVER_ERROR
+                    cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'Failed to delete S3 objects.\n\tlen(FAILED_KEYS):{len(FAILED_KEYS)}')
+                    self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, Failed to delete S3 objects. len(IDS):{len(IDS)}, len(DELETED_IDS):{len(DELETED_IDS)}, len(FAILED_KEYS):{len(FAILED_KEYS)}', LEVEL=logging.WARN)
+                elif 'NG' in RESULTS:
+                    # 複数IDを受け取り時に一部の不備を検知して400を返す
+                    ret_value = HTTPStatus.BAD_REQUEST
+                    cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'An invalid ID was detected.')
+                    self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, An invalid ID was detected. len(IDS):{len(IDS)}, len(DELETED_IDS):{len(DELETED_IDS)}', LEVEL=logging.WARN)
             except Exception as e:
+                self._reset_bootstrap_state(ERROR=e)
                 ret_value = HTTPStatus.INTERNAL_SERVER_ERROR
-                API_RESULT_DATAS['result'].append('NG')
+                API_RESULT_DATAS[cCommonFunc.API_RESP_DICT_KEY_RESULT] = ['NG'] * len(IDS)
                 # 例外内容をAPI処理結果詳細に設定
                 cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'{type(e).__name__}, {e}')
-                self.LOGGER_WRAPPER.output(MSG=f'self:<{self}>, {type(e).__name__}! {e}', LEVEL=logging.WARN)
-                self.LOGGER_WRAPPER.output(MSG=f'self:<{self}>, ret_value:{ret_value}', PREFIX='::Leave')
-            
-        return ret_value, API_RESULT_DATAS
+                self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, len(IDS):{len(IDS)}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+        self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, len(IDS):{-1 if IDS is None else len(IDS)}, ret_value:{ret_value}', PREFIX='::Leave')
+        return ret_value
+
+    def _batch_get_image_mng_items(self, IDS:list[str], ATTRIBUTE_NAMES:list[str] = [cCommonFunc.API_RESP_DICT_KEY_ID, cCommonFunc.API_RESP_DICT_KEY_URL], UNPROCESSED_IDS:set[str] = None) -> dict[str, dict]:
+        """画像IDと画像URL管理テーブルからアイテムを一括取得(BatchGetItem、100件単位)
+        ※未処理キー(スループット超過)は指数バックオフ(フルジッター)で待機して再取得し、最大試行回数を超えても未処理のIDはUNPROCESSED_IDSに設定する
+
+        Args:
+            IDS (list[str]): 画像IDリスト(重複なし)
+            ATTRIBUTE_NAMES (list[str], optional): 取得する属性名リスト. Defaults to ['id', 'url'].
+            UNPROCESSED_IDS (set[str], optional): 取得できなかった(未処理のままの)画像IDを追加するset. Defaults to None.
+
+        Returns:
+            dict[str, dict]: 画像IDをキーとしたアイテムdict(テーブルに存在しないID・未処理のIDは含まない)
+        """
+        ret_value:dict[str, dict] = {}
+        PROJECTION_NAMES = {f'#attr{INDEX}':NAME for INDEX, NAME in enumerate(ATTRIBUTE_NAMES)}
+        for START in range(0, len(IDS), 100):
+            request_items:dict = {self.DYNAMO_DB_IMAGE_MNG_TABLE_NAME:{'Keys':[{cCommonFunc.API_RESP_DICT_KEY_ID:ID} for ID in IDS[START:START+100]], 'ProjectionExpression':', '.join(PROJECTION_NAMES.keys()), 'ExpressionAttributeNames':PROJECTION_NAMES}}
+            for ATTEMPT in range(self.BATCH_GET_MAX_ATTEMPTS):
+                if ATTEMPT > 0:
+                    time.sleep(random.uniform(0.0, min(self.BATCH_GET_BACKOFF_MAX, self.BATCH_GET_BACKOFF_BASE * (2 ** (ATTEMPT - 1)))))
+                RESPONSE:dict = self.ImageMngDynamoDbResource.batch_get_item(RequestItems=request_items)
+                for ITEM in RESPONSE.get('Responses', {}).get(self.DYNAMO_DB_IMAGE_MNG_TABLE_NAME, []):
+                    ret_value[ITEM.get(cCommonFunc.API_RESP_DICT_KEY_ID, '')] = ITEM
+                request_items = RESPONSE.get('UnprocessedKeys', {})
+                if cCommonFunc.is_none_or_empty(request_items): break
+            if not cCommonFunc.is_none_or_empty(request_items):
+                KEYS:list[dict] = request_items.get(self.DYNAMO_DB_IMAGE_MNG_TABLE_NAME, {}).get('Keys', [])
+                if not UNPROCESSED_IDS is None: UNPROCESSED_IDS.update(KEY.get(cCommonFunc.API_RESP_DICT_KEY_ID, '') for KEY in KEYS)
+                self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, UnprocessedKeys remain! len(KEYS):{len(KEYS)}, MAX_ATTEMPTS:{self.BATCH_GET_MAX_ATTEMPTS}', LEVEL=logging.WARN)
+        return ret_value
+
+    def _delete_s3_objects(self, OBJECT_KEYS:list[str]) -> set[str]:
+        """S3オブジェクトの一括削除(delete_objects、1000件単位)
+
+        Args:
+            OBJECT_KEYS (list[str]): 削除対象のファイル名リスト
+
+        Returns:
+            set[str]: 削除に失敗したファイル名
+        """
+        ret_value:set[str] = set()
+        for START in range(0, len(OBJECT_KEYS), 1000):
+            RESPONSE:dict = self.S3_CLIENT.delete_objects(Bucket=self.S3_BUCKET_NAME, Delete={'Objects':[{'Key':KEY} for KEY in OBJECT_KEYS[START:START+1000]], 'Quiet':True})
+            for ERROR in RESPONSE.get('Errors', []):
+                ret_value.add(ERROR.get('Key', ''))
+                self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, ERROR:{ERROR}', LEVEL=logging.WARN)
+        return ret_value
+
+    def _create_dynamodb_resource(self):
+        """AWS DynamoDBリソースのインスタンス生成(生成済みの場合は生成済みのインスタンスを返す)
+
+        Returns:
+            _type_: AWS DynamoDBリソースのインスタンス
+        """
+        if self._dynamodb_img_mng_resource is None:
+            try:
+                self._dynamodb_img_mng_resource = self.AwsClientFactory.get_resource(SERVICE_NAME='dynamodb')
+                self.AwsCallTracer.attach(CLIENT=self._dynamodb_img_mng_resource.meta.client)
+                self.ImageRecordDecoder.attach(CLIENT=self._dynamodb_img_mng_resource.meta.client)
+            except Exception as e:
+                self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+        return self._dynamodb_img_mng_resource
 
-    def _create_dynamo_db_table(self, DB_RESOURCE, TABLE_NAME:str = '', KEY_SCHEMA:list[dict] = [], ATTRIBUTE_DEFINITIONS:list[dict] = [], PROVISIONED_THROUGHPUT:dict[str, int] = {}) -> bool:
+    def _create_dynamo_db_table(self, DB_RESOURCE, TABLE_NAME:str = '', KEY_SCHEMA:list[dict] = [], ATTRIBUTE_DEFINITIONS:list[dict] = [], PROVISIONED_THROUGHPUT:dict[str, int] = {}, GLOBAL_SECONDARY_INDEXES:list[dict] = []) -> bool:
         """AWS DynamoDBのテーブル作成
+        ※テーブルが存在する場合は、不足しているグローバルセカンダリインデックスのみ追加する
 
         Args:
             DB_RESOURCE (_type_): AWS DynamoDBリソースのインスタンス
@@ -467,6 +1357,7 @@ class cAwsAccessMng:
             KEY_SCHEMA (list[dict], optional): キースキーマ. Defaults to [].
             ATTRIBUTE_DEFINITIONS (list[dict], optional): 属性. Defaults to [].
             PROVISIONED_THROUGHPUT (dict[str, int], optional): テーブルのスループット. Defaults to {}.
+            GLOBAL_SECONDARY_INDEXES (list[dict], optional): グローバルセカンダリインデックス. Defaults to [].
 
         Returns:
             bool: 成功時はTrue、それ以外はFalse
@@ -475,12 +1366,44 @@ class cAwsAccessMng:
         # DBテーブルが不存在
         if ret_value and not self._is_exist_dynamodb_table(TABLE_NAME=TABLE_NAME):
             try:
-                TABLE = DB_RESOURCE.create_table(TableName=TABLE_NAME, KeySchema=KEY_SCHEMA, AttributeDefinitions=ATTRIBUTE_DEFINITIONS, ProvisionedThroughput=PROVISIONED_THROUGHPUT)
+                OPTION = {'TableName':TABLE_NAME, 'KeySchema':KEY_SCHEMA, 'AttributeDefinitions':ATTRIBUTE_DEFINITIONS, 'ProvisionedThroughput':PROVISIONED_THROUGHPUT}
+                if not cCommonFunc.is_none_or_empty(GLOBAL_SECONDARY_INDEXES): OPTION['GlobalSecondaryIndexes'] = GLOBAL_SECONDARY_INDEXES
+                TABLE = DB_RESOURCE.create_table(**OPTION)
                 # テーブルが作成されるまで待つ
                 TABLE.meta.client.get_waiter('table_exists').wait(TableName=TABLE_NAME)
             except Exception as e:
                 ret_value = False
-                self.LOGGER_WRAPPER.output(MSG=f'self:<{self}>, TABLE_NAME:{TABLE_NAME}, KEY_SCHEMA:{KEY_SCHEMA}, ATTRIBUTE_DEFINITIONS:{ATTRIBUTE_DEFINITIONS}, PROVISIONED_THROUGHPUT:{PROVISIONED_THROUGHPUT}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+                self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, TABLE_NAME:{TABLE_NAME}, KEY_SCHEMA:{KEY_SCHEMA}, ATTRIBUTE_DEFINITIONS:{ATTRIBUTE_DEFINITIONS}, PROVISIONED_THROUGHPUT:{PROVISIONED_THROUGHPUT}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+        elif ret_value and not cCommonFunc.is_none_or_empty(GLOBAL_SECONDARY_INDEXES):
+            self._create_global_secondary_indexes(TABLE_NAME=TABLE_NAME, ATTRIBUTE_DEFINITIONS=ATTRIBUTE_DEFINITIONS, GLOBAL_SECONDARY_INDEXES=GLOBAL_SECONDARY_INDEXES)
+        return ret_value
+
+    def _create_global_secondary_indexes(self, TABLE_NAME:str, ATTRIBUTE_DEFINITIONS:list[dict], GLOBAL_SECONDARY_INDEXES:list[dict]) -> bool:
+        """既存のDynamoDBテーブルへ不足しているグローバルセカンダリインデックスを追加
+        ※インデックスの作成(既存アイテムのバックフィル)完了は待たない。作成中・作成失敗時もテーブルは利用可能なため、インデックスを参照する処理は代替手段で処理する。
+
+        Args:
+            TABLE_NAME (str): DynamoDBテーブル名
+            ATTRIBUTE_DEFINITIONS (list[dict]): 属性
+            GLOBAL_SECONDARY_INDEXES (list[dict]): グローバルセカンダリインデックス
+
+        Returns:
+            bool: 全インデックスが存在する または 追加を開始した場合はTrue、それ以外はFalse
+        """
+        ret_value = not self.DynamoDBClient is None
+        if ret_value:
+            try:
+                TABLE:dict = self.DynamoDBClient.describe_table(TableName=TABLE_NAME).get('Table', {})
+                INDEX_NAMES:set[str] = {INDEX.get('IndexName', '') for INDEX in TABLE.get('GlobalSecondaryIndexes', [])}
+                for INDEX in GLOBAL_SECONDARY_INDEXES:
+                    if INDEX.get('IndexName', '') in INDEX_NAMES: continue
+                    # 1回の更新で追加できるインデックスは1つのため、残りは次回のコンテナ起動時に追加する
+                    self.DynamoDBClient.update_table(TableName=TABLE_NAME, AttributeDefinitions=ATTRIBUTE_DEFINITIONS, GlobalSecondaryIndexUpdates=[{'Create':INDEX}])
+                    self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, TABLE_NAME:{TABLE_NAME}, create index:{INDEX.get("IndexName", "")}', LEVEL=logging.INFO)
+                    break
+            except Exception as e:
+                ret_value = False
+                self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, TABLE_NAME:{TABLE_NAME}, GLOBAL_SECONDARY_INDEXES:{GLOBAL_SECONDARY_INDEXES}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
         return ret_value
 
     def _is_exist_dynamodb_table(self, TABLE_NAME:str) -> bool:
@@ -492,21 +1415,26 @@ class cAwsAccessMng:
         Returns:
             bool: DynamoDBに指定したテーブルが存在する場合はTrue
         """
+        # 画像IDとURL管理テーブルがコンテナ内で存在確認済み
+        if (self._is_dynamodb_table_ready or self._is_dynamodb_table_exist) and TABLE_NAME == self.DYNAMO_DB_IMAGE_MNG_TABLE_NAME:
+            return True
         ret_value = not self.DynamoDBClient is None and not cCommonFunc.is_none_or_empty(TABLE_NAME)
         if ret_value:
             try:
                 TABLES:dict = self.DynamoDBClient.list_tables()
                 ret_value = (TABLE_NAME in TABLES.get('TableNames', []))
+                # テーブル準備完了(インデックスの追加)はImageMngDynamoDbResourceで行うため、存在確認結果のみ保持する
+                if ret_value and TABLE_NAME == self.DYNAMO_DB_IMAGE_MNG_TABLE_NAME: self._is_dynamodb_table_exist = True
             except Exception as e:
                 ret_value = False
-                self.LOGGER_WRAPPER.output(MSG=f'self:<{self}>, TABLE_NAME:{TABLE_NAME}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+                self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, TABLE_NAME:{TABLE_NAME}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
         return ret_value
 
-    def _set_image_url_hash_table_from_db(self, IMAGE_HASH_TABLES:list[dict[str, str|int]]) -> bool:
+    def _set_image_url_hash_table_from_db(self, IMAGE_HASH_TABLES:list[cImageRecord]) -> bool:
         """DBから画像ID・画像変換状態・画像URLのhash-tableリスト設定
 
         Args:
-            IMAGE_HASH_TABLES (list[dict[str, str | int]]): 画像ID・画像変換状態・画像URLのhash-tableリスト
+            IMAGE_HASH_TABLES (list[cImageRecord]): 画像ID・画像変換状態・画像URLのhash-tableリスト(画像レコード)
 
         Returns:
             bool: 成功時はTrue、それ以外はFalse
@@ -517,14 +1445,140 @@ class cAwsAccessMng:
         # 管理DB(画像IDとURL)が存在する
         if ret_value and self._is_exist_dynamodb_table(TABLE_NAME=self.DYNAMO_DB_IMAGE_MNG_TABLE_NAME):
             try:
+                CATALOG_VERSION_ID = self.CATALOG_VERSION_ID
                 PAGINATOR = self.DynamoDBClient.get_paginator('scan')
-                for PAGE in PAGINATOR.paginate(TableName=self.DYNAMO_DB_IMAGE_MNG_TABLE_NAME):
-                    for PAGE_ITEM in PAGE.get('Items', {}):
-                        ITEM = {k:self.Deserializer.deserialize(v) for k, v in PAGE_ITEM.items()}
-                        IMAGE_HASH_TABLES.append(ITEM)
+                with self.ImageRecordDecoder.decoding():
+                    for PAGE in PAGINATOR.paginate(TableName=self.DYNAMO_DB_IMAGE_MNG_TABLE_NAME):
+                        # カタログバージョン管理用アイテムは除外
+                        IMAGE_HASH_TABLES.extend(RECORD for RECORD in self._get_image_records(RESPONSE=PAGE) if RECORD.id != CATALOG_VERSION_ID)
+            except Exception as e:
+                self._reset_bootstrap_state(ERROR=e)
+                ret_value = False
+                self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, len(IMAGE_HASH_TABLES):{len(IMAGE_HASH_TABLES)}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+        return ret_value
+
+    def _set_image_url_hash_table_page_from_db(self, IMAGE_HASH_TABLES:list[cImageRecord], LIMIT:int = 0, EXCLUSIVE_START_KEY:dict = None) -> tuple[bool, dict]:
+        """DBから画像ID・画像変換状態・画像URLのhash-tableリストを1ページ分設定
+
+        Args:
+            IMAGE_HASH_TABLES (list[cImageRecord]): 画像ID・画像変換状態・画像URLのhash-tableリスト(画像レコード)
+            LIMIT (int, optional): 取得件数(0の場合は末尾まで取得). Defaults to 0.
+            EXCLUSIVE_START_KEY (dict, optional): 取得開始キー(空の場合は先頭から取得). Defaults to None.
+
+        Returns:
+            tuple[bool, dict]: [0]:成功時はTrue、それ以外はFalse, [1]:次ページの取得開始キー(末尾まで取得した場合はNone)
+        """
+        ret_value = not IMAGE_HASH_TABLES is None and LIMIT >= 0
+        last_evaluated_key:dict = None
+        # hash-tableリストクリア
+        if not IMAGE_HASH_TABLES is None: IMAGE_HASH_TABLES.clear()
+        # 管理DB(画像IDとURL)が存在する
+        if ret_value and self._is_exist_dynamodb_table(TABLE_NAME=self.DYNAMO_DB_IMAGE_MNG_TABLE_NAME):
+            try:
+                CATALOG_VERSION_ID = self.CATALOG_VERSION_ID
+                last_evaluated_key = EXCLUSIVE_START_KEY if not cCommonFunc.is_none_or_empty(EXCLUSIVE_START_KEY) else None
+                while True:
+                    OPTION = {'TableName':self.DYNAMO_DB_IMAGE_MNG_TABLE_NAME}
+                    # 読み取り量がページサイズに比例するよう、残り件数をLimitに指定する
+                    if LIMIT > 0: OPTION['Limit'] = LIMIT - len(IMAGE_HASH_TABLES)
+                    if not last_evaluated_key is None: OPTION['ExclusiveStartKey'] = last_evaluated_key
+                    with self.ImageRecordDecoder.decoding():
+                        RESPONSE:dict = self.DynamoDBClient.scan(**OPTION)
+                    # カタログバージョン管理用アイテムは除外(除外分は残り件数として次のスキャンで補う)
+                    IMAGE_HASH_TABLES.extend(RECORD for RECORD in self._get_image_records(RESPONSE=RESPONSE) if RECORD.id != CATALOG_VERSION_ID)
+                    last_evaluated_key = RESPONSE.get('LastEvaluatedKey', None)
+                    if last_evaluated_key is None or (LIMIT > 0 and len(IMAGE_HASH_TABLES) >= LIMIT):
+                        break
+            except Exception as e:
+                self._reset_bootstrap_state(ERROR=e)
+                ret_value = False
+                last_evaluated_key = None
+                self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, LIMIT:{LIMIT}, len(IMAGE_HASH_TABLES):{len(IMAGE_HASH_TABLES)}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+        return ret_value, last_evaluated_key
+
+    def _get_catalog_version(self) -> int:
+        """カタログバージョンの取得(強い整合性の読み込み、GetItem 1回)
+
+        Returns:
+            int: カタログバージョン(管理用アイテムが存在しない場合は0、取得失敗時はNone)
+        """
+        ret_value:int = None
+        if self._is_exist_dynamodb_table(TABLE_NAME=self.DYNAMO_DB_IMAGE_MNG_TABLE_NAME):
+            try:
+                RESPONSE:dict = self.DynamoDBClient.get_item(TableName=self.DYNAMO_DB_IMAGE_MNG_TABLE_NAME, Key={cCommonFunc.API_RESP_DICT_KEY_ID:self.CATALOG_VERSION_ID}, ConsistentRead=True, ProjectionExpression='#attr_version', ExpressionAttributeNames={'#attr_version':self.CATALOG_VERSION_ATTRIBUTE_NAME})
+                ret_value = int(RESPONSE.get('Item', {}).get(self.CATALOG_VERSION_ATTRIBUTE_NAME, 0))
+            except Exception as e:
+                self._reset_bootstrap_state(ERROR=e)
+                ret_value = None
+                self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+        return ret_value
+
+    def _bump_catalog_version(self) -> bool:
+        """カタログバージョンの更新(UpdateItemのADDによるアトミックな加算)
+        ※画像IDと画像URL管理テーブルへの書き込み後に呼び出し、全コンテナの画像カタログキャッシュを無効化する
+
+        Returns:
+            bool: 成功時はTrue、それ以外はFalse
+        """
+        self.CatalogCache.clear()
+        ret_value = not self.DynamoDBClient is None
+        if ret_value:
+            try:
+                self.DynamoDBClient.update_item(TableName=self.DYNAMO_DB_IMAGE_MNG_TABLE_NAME, Key={cCommonFunc.API_RESP_DICT_KEY_ID:self.CATALOG_VERSION_ID}, UpdateExpression='ADD #attr_version :increment', ExpressionAttributeNames={'#attr_version':self.CATALOG_VERSION_ATTRIBUTE_NAME}, ExpressionAttributeValues={':increment':1})
             except Exception as e:
                 ret_value = False
-                self.LOGGER_WRAPPER.output(MSG=f'self:<{self}>, len(IMAGE_HASH_TABLES):{len(IMAGE_HASH_TABLES)}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+                self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+        return ret_value
+
+    def _get_image_records(self, RESPONSE:dict) -> list[cImageRecord]:
+        """Scan応答から画像レコードリストを取得
+
+        Args:
+            RESPONSE (dict): Scan応答(1ページ分)
+
+        Returns:
+            list[cImageRecord]: 画像レコードリスト(高速デコード済みの場合はそのまま、それ以外はItemsから変換)
+        """
+        RECORDS:list[cImageRecord] = RESPONSE.get(cImageRecordDecoder.RESPONSE_KEY_RECORDS, None)
+        return RECORDS if not RECORDS is None else [cImageRecord.from_item(ITEM=ITEM) for ITEM in RESPONSE.get('Items', [])]
+
+    def _encode_continuation_token(self, LAST_EVALUATED_KEY:dict) -> str:
+        """DynamoDBの取得開始キーから継続トークンを生成
+
+        Args:
+            LAST_EVALUATED_KEY (dict): 次ページの取得開始キー
+
+        Returns:
+            str: 継続トークン(DynamoDB JSON形式の取得開始キーをURLセーフなbase64文字列化したもの、取得開始キーが空の場合は空文字)
+        """
+        ret_value = ''
+        if not cCommonFunc.is_none_or_empty(LAST_EVALUATED_KEY):
+            try:
+                KEY:dict = {k:self.Serializer.serialize(v) for k, v in LAST_EVALUATED_KEY.items()}
+                ret_value = base64.urlsafe_b64encode(json.dumps(KEY, separators=(',', ':')).encode('utf-8')).decode('ascii').rstrip('=')
+            except Exception as e:
+                ret_value = ''
+                self.LOGGER_WRAPPER.output(MSG=lambda: f'LAST_EVALUATED_KEY:{LAST_EVALUATED_KEY}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+        return ret_value
+
+    def _decode_continuation_token(self, TOKEN:str) -> dict:
+        """継続トークンからDynamoDBの取得開始キーを復元
+
+        Args:
+            TOKEN (str): 継続トークン
+
+        Returns:
+            dict: 取得開始キー(トークンが空の場合は空dict、トークンが不正な場合はNone)
+        """
+        ret_value:dict = {}
+        if not cCommonFunc.is_none_or_empty(TOKEN):
+            try:
+                KEY:dict = json.loads(base64.urlsafe_b64decode(TOKEN + '=' * (-len(TOKEN) % 4)).decode('utf-8'))
+                # 取得開始キーは主キー(id)のみを含むDynamoDB JSON形式であること
+                ret_value = {k:self.Deserializer.deserialize(v) for k, v in KEY.items()} if isinstance(KEY, dict) and list(KEY.keys()) == [cCommonFunc.API_RESP_DICT_KEY_ID] and isinstance(KEY[cCommonFunc.API_RESP_DICT_KEY_ID], dict) else None
+            except Exception as e:
+                ret_value = None
+                self.LOGGER_WRAPPER.output(MSG=lambda: f'TOKEN:{TOKEN}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
         return ret_value
 
     def _create_s3_bucket(self, S3_CLIENT, API_RESULT_DATAS:dict[str, str]) -> bool:
@@ -545,10 +1599,11 @@ class cAwsAccessMng:
                 S3_CLIENT.put_public_access_block(Bucket=self.S3_BUCKET_NAME, PublicAccessBlockConfiguration={'BlockPublicAcls': False,'IgnorePublicAcls': False,'BlockPublicPolicy': False,'RestrictPublicBuckets': False})
                 S3_CLIENT.put_bucket_acl(ACL='public-read',Bucket=self.S3_BUCKET_NAME)
                 S3_CLIENT.put_bucket_policy(Bucket=self.S3_BUCKET_NAME, Policy=f'{{"Version": "2012-10-17", "Statement": [{{ "Sid": "public","Effect": "Allow","Principal": "*", "Action": ["s3:GetObject"], "Resource": ["arn:aws:s3:::{self.S3_BUCKET_NAME}/*"] }} ]}}')
+                self._is_s3_bucket_ready = True
             except Exception as e:
                 ret_value = False
                 cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'{type(e).__name__}, {e}')
-                self.LOGGER_WRAPPER.output(MSG=f'self:<{self}>, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+                self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, {type(e).__name__}! {e}', LEVEL=logging.WARN)
         return ret_value
 
     def _is_exist_s3_bucket(self, S3_CLIENT, API_RESULT_DATAS:dict[str, str]) -> bool:
@@ -561,20 +1616,45 @@ class cAwsAccessMng:
         Returns:
             bool: S3バケットが存在する場合はTrue、それ以外はFalse
         """
+        # S3バケットがコンテナ内で存在確認済み
+        if self._is_s3_bucket_ready:
+            return True
         ret_value = not S3_CLIENT is None
         if ret_value:
             try:
                 S3_CLIENT.head_bucket(Bucket=self.S3_BUCKET_NAME)
+                self._is_s3_bucket_ready = True
             except ClientError as e:
                 ret_value = False
                 # 404エラー(バケット不存在)以外のエラーの場合はAPI処理結果詳細にメッセージを設定する
                 if e.response['Error']['Code'] != '404':
                     cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'{type(e).__name__}, {e}')
-                    self.LOGGER_WRAPPER.output(MSG=f'self:<{self}>, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+                    self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, {type(e).__name__}! {e}', LEVEL=logging.WARN)
             except Exception as e:
                 ret_value = False
                 cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'{type(e).__name__}, {e}')
-                self.LOGGER_WRAPPER.output(MSG=f'self:<{self}>, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+                self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+        return ret_value
+
+    def _reset_bootstrap_state(self, ERROR:Exception) -> bool:
+        """AWSリソース不存在エラー時にS3バケット・DynamoDBテーブルの存在確認済み状態をリセット
+
+        Args:
+            ERROR (Exception): 発生した例外
+
+        Returns:
+            bool: リセットした場合はTrue、それ以外はFalse
+        """
+        ret_value = False
+        if isinstance(ERROR, ClientError):
+            CODE:str = ERROR.response.get('Error', {}).get('Code', '')
+            if CODE == 'ResourceNotFoundException':
+                ret_value = self._is_dynamodb_table_ready or self._is_dynamodb_table_exist
+                self._is_dynamodb_table_ready = False
+                self._is_dynamodb_table_exist = False
+            elif CODE == 'NoSuchBucket':
+                ret_value = self._is_s3_bucket_ready
+                self._is_s3_bucket_ready = False
         return ret_value
 
     def _get_adjust_s3_naming_convention(self, SRC:str, PREFIX_LENGTH:int = 0) -> str:
@@ -598,7 +1678,7 @@ class cAwsAccessMng:
                 # 「フォルダ+ファイルパス」で1024文字以内に収める
                 ret_value = ret_value[:self.MAX_S3_FILE_PATH_LENGTH]
             except Exception as e:
-                self.LOGGER_WRAPPER.output(MSG=f'SRC:{SRC}, PREFIX_LENGTH:{PREFIX_LENGTH}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+                self.LOGGER_WRAPPER.output(MSG=lambda: f'SRC:{SRC}, PREFIX_LENGTH:{PREFIX_LENGTH}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
         return ret_value
 
     def _get_signed_url(self, S3_CLIENT, CLIENT_METHOD:str, EXPIRATION:int, OBJECT_KEY:str) -> str:
@@ -616,284 +1696,398 @@ class cAwsAccessMng:
         url:str = ''
         if not S3_CLIENT is None and not cCommonFunc.is_none_or_empty(OBJECT_KEY):
             try:
-                url = S3_CLIENT.generate_presigned_url(ClientMethod=CLIENT_METHOD, Params={'Bucket': self.S3_BUCKET_NAME, 'Key': f'{OBJECT_KEY}'}, ExpiresIn=EXPIRATION)
+                IS_CACHEABLE = CLIENT_METHOD in self.SIGNED_URL_CACHEABLE_METHODS
+                # ダウンロード用URLはキャッシュ済みかつ再発行閾値内であれば再利用
+                if IS_CACHEABLE: url = self.SignedUrlCache.get(CLIENT_METHOD=CLIENT_METHOD, OBJECT_KEY=OBJECT_KEY, EXPIRATION=EXPIRATION)
+                if cCommonFunc.is_none_or_empty(url):
+                    with self.AwsCallTracer.measure(OPERATION='s3.Presign'):
+                        url = S3_CLIENT.generate_presigned_url(ClientMethod=CLIENT_METHOD, Params={'Bucket': self.S3_BUCKET_NAME, 'Key': f'{OBJECT_KEY}'}, ExpiresIn=EXPIRATION)
+                    if IS_CACHEABLE: self.SignedUrlCache.put(CLIENT_METHOD=CLIENT_METHOD, OBJECT_KEY=OBJECT_KEY, EXPIRATION=EXPIRATION, URL=url)
             except Exception as e:
-                self.LOGGER_WRAPPER.output(MSG=f'self:<{self}>, CLIENT_METHOD:{CLIENT_METHOD}, EXPIRATION:{EXPIRATION}, OBJECT_KEY:{OBJECT_KEY}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+                self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, CLIENT_METHOD:{CLIENT_METHOD}, EXPIRATION:{EXPIRATION}, OBJECT_KEY:{OBJECT_KEY}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
         return url
 
-    def delete_object_for_S3backet(self, API_RESULT_DATAS:dict[str, str|list], ids:list[str], EXPIRATION:int=3600) -> int:
-        """S3バケット内のオブジェクトを削除する
+    def get_bulk_signed_urls(self, CLIENT_METHOD:str, OBJECT_KEYS:list[str], EXPIRATION:int=3600) -> list[str]:
+        """署名付きURLの一括取得
+        ※署名キー等はバッチ単位で1回だけ算出する。ダウンロード用URLは署名付きURLキャッシュを併用し、キャッシュミス分のみ発行する。
 
         Args:
-            API_RESULT_DATAS (dict[str, str|list]): API応答内容dict 
-            ids (list[str]): 削除対象IDキー
+            CLIENT_METHOD (str): S3へのリクエストで利用するAPI(ex:"put_object", "get_object")
+            OBJECT_KEYS (list[str]): ファイル名リスト
             EXPIRATION (int, optional): 有効期限(単位:秒). Defaults to 3600.
 
         Returns:
-            int: httpステータスコード
-            list: API出力結果
+            list[str]: 署名付きURLリスト(OBJECT_KEYSと同順、発行できなかったものは空文字)
         """
-        self.LOGGER_WRAPPER.output(MSG=f'self:<{self}>, len(ids):{-1 if ids is None else len(ids)}, EXPIRATION:{EXPIRATION}', PREFIX='::Enter')
-        ret_value = HTTPStatus.OK if not cCommonFunc.is_none_or_empty(ids) else HTTPStatus.BAD_REQUEST if cCommonFunc.is_none_or_empty(ids) else HTTPStatus.INTERNAL_SERVER_ERROR
-        if ret_value != HTTPStatus.OK:
-            # リクエストデータに不正がある旨をAPI処理結果詳細に設定
-            cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'The input image file path list is empty or there is no URL storage location.')
-        elif not self._create_s3_bucket(S3_CLIENT=self.S3_CLIENT, API_RESULT_DATAS=API_RESULT_DATAS):
-            ret_value = HTTPStatus.INTERNAL_SERVER_ERROR
+        ret_value:list[str] = [''] * (0 if OBJECT_KEYS is None else len(OBJECT_KEYS))
+        if not self.S3_CLIENT is None and not cCommonFunc.is_none_or_empty(OBJECT_KEYS):
+            try:
+                IS_CACHEABLE = CLIENT_METHOD in self.SIGNED_URL_CACHEABLE_METHODS
+                MISS_INDEXES:list[int] = []
+                for INDEX, OBJECT_KEY in enumerate(OBJECT_KEYS):
+                    if cCommonFunc.is_none_or_empty(OBJECT_KEY): continue
+                    if IS_CACHEABLE: ret_value[INDEX] = self.SignedUrlCache.get(CLIENT_METHOD=CLIENT_METHOD, OBJECT_KEY=OBJECT_KEY, EXPIRATION=EXPIRATION)
+                    if cCommonFunc.is_none_or_empty(ret_value[INDEX]): MISS_INDEXES.append(INDEX)
+                with self.AwsCallTracer.measure(OPERATION='s3.BulkPresign'):
+                    URLS = cBulkPresigner(S3_CLIENT=self.S3_CLIENT, BUCKET_NAME=self.S3_BUCKET_NAME, LOGGER_WRAPPER=self.LOGGER_WRAPPER).presign(CLIENT_METHOD=CLIENT_METHOD, OBJECT_KEYS=[OBJECT_KEYS[INDEX] for INDEX in MISS_INDEXES], EXPIRATION=EXPIRATION)
+                for INDEX, URL in zip(MISS_INDEXES, URLS):
+                    ret_value[INDEX] = URL
+                    if IS_CACHEABLE: self.SignedUrlCache.put(CLIENT_METHOD=CLIENT_METHOD, OBJECT_KEY=OBJECT_KEYS[INDEX], EXPIRATION=EXPIRATION, URL=URL)
+            except Exception as e:
+                self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, CLIENT_METHOD:{CLIENT_METHOD}, EXPIRATION:{EXPIRATION}, len(OBJECT_KEYS):{len(OBJECT_KEYS)}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+        return ret_value
+
+    def _iter_s3_file_lists(self, PREFIX:str = '', MAX_WORKERS:int = 1) -> Iterator[cS3ObjectRecord]:
+        """AWS S3内ファイルパス一覧を逐次取得
+        ※list_objects_v2のページ(最大1000件)単位で取得し、サイズが0より大きいオブジェクトのみ返す。
+        MAX_WORKERSが2以上の場合は「images/yyyy/mm/」単位のプレフィックスを並列に取得する(返却順は不定)。
+
+        Args:
+            PREFIX (str, optional): 取得対象のプレフィックス(空の場合は"images/"). Defaults to ''.
+            MAX_WORKERS (int, optional): 並列取得数. Defaults to 1.
+
+        Yields:
+            Iterator[cS3ObjectRecord]: S3オブジェクト情報(ファイルパス・サイズ・最終更新日時)
+        """
+        ROOT_PREFIX:str = PREFIX if not cCommonFunc.is_none_or_empty(PREFIX) else f'{self.S3_PREFIX}/'
+        if MAX_WORKERS <= 1:
+            yield from self._iter_s3_objects(PREFIX=ROOT_PREFIX)
+            return
+        # 「images/yyyy/」→「images/yyyy/mm/」の順にプレフィックスを列挙(各階層の直下のファイルはその場で返す)
+        prefixes:list[str] = [ROOT_PREFIX]
+        for _ in range(2):
+            CHILD_PREFIXES:list[str] = []
+            for PARENT_PREFIX in prefixes:
+                PAGINATOR = self.S3_CLIENT.get_paginator('list_objects_v2')
+                for PAGE in PAGINATOR.paginate(Bucket=self.S3_BUCKET_NAME, Prefix=PARENT_PREFIX, Delimiter='/'):
+                    yield from self._get_s3_object_records(PAGE=PAGE)
+                    CHILD_PREFIXES.extend(COMMON_PREFIX.get('Prefix', '') for COMMON_PREFIX in PAGE.get('CommonPrefixes', []))
+            prefixes = CHILD_PREFIXES
+        yield from self._iter_s3_objects_parallel(PREFIXES=prefixes, MAX_WORKERS=MAX_WORKERS)
+
+    def _iter_s3_objects(self, PREFIX:str) -> Iterator[cS3ObjectRecord]:
+        """プレフィックス配下のS3オブジェクト情報を逐次取得
+
+        Args:
+            PREFIX (str): 取得対象のプレフィックス
+
+        Yields:
+            Iterator[cS3ObjectRecord]: S3オブジェクト情報(ファイルパス・サイズ・最終更新日時)
+        """
+        PAGINATOR = self.S3_CLIENT.get_paginator('list_objects_v2')
+        for PAGE in PAGINATOR.paginate(Bucket=self.S3_BUCKET_NAME, Prefix=PREFIX):
+            yield from self._get_s3_object_records(PAGE=PAGE)
 
-        ret_value = HTTPStatus.OK if not ids is None else HTTPStatus.BAD_REQUEST
-        # バケットが存在する場合
-        if ret_value == HTTPStatus.OK and self._is_exist_s3_bucket(S3_CLIENT=self.S3_CLIENT, API_RESULT_DATAS=API_RESULT_DATAS):
-            if not self.S3_CLIENT is None :
+    def _iter_s3_objects_parallel(self, PREFIXES:list[str], MAX_WORKERS:int) -> Iterator[cS3ObjectRecord]:
+        """複数プレフィックス配下のS3オブジェクト情報を並列に取得
+        ※取得済みページは上限付きのキューで受け渡すため、保持するページ数は並列数に比例する
+
+        Args:
+            PREFIXES (list[str]): 取得対象のプレフィックスリスト
+            MAX_WORKERS (int): 並列取得数
+
+        Yields:
+            Iterator[cS3ObjectRecord]: S3オブジェクト情報(ファイルパス・サイズ・最終更新日時)
+        """
+        if len(PREFIXES) <= 0:
+            return
+        PAGE_QUEUE:Queue = Queue(maxsize=MAX_WORKERS * 2)
+        STOP_EVENT = Event()
+        DONE = object()
+
+        def _put(ITEM) -> None:
+            # 呼び出し元が中断した場合に待ち続けないよう、停止要求を確認しながら格納する
+            while not STOP_EVENT.is_set():
                 try:
-                    self.LOGGER_WRAPPER.output(MSG=f'delete_object_for_s3backet', PREFIX='::Enter')
-                    DB_TABLE = self.ImageMngDynamoDbResource.Table(self.DYNAMO_DB_IMAGE_MNG_TABLE_NAME)
-
-                    API_RESULT_DATAS['result'] = []
-                    TABLE_RESULTS = []
-                    ITEMS = []
-                    DATA = {}
-                    OBJECT = []
-                    # 複数IDを受け取り時に一部の不備を検知して400を返す
-                    is_warned = False
-
-                    # idsを参照してS3バケットから削除
-                    for id in ids:
-                        try:
-                            # リスト初期化
-                            TABLE_RESULTS = list()
-                            ITEMS = list()
-                            DATA.clear()
-                            OBJECT = list()
-                            
-                            ret_value = HTTPStatus.OK if self._is_exist_id_in_dynamodb_image_mng_table(ID=id) else HTTPStatus.BAD_REQUEST
-                            TABLE_RESULTS.append(DB_TABLE.query(KeyConditionExpression=Key(cCommonFunc.API_RESP_DICT_KEY_ID).eq(id)))
-                            ITEMS.append(TABLE_RESULTS[0].get('Items', []))
-                            DATA = ITEMS[0] if not cCommonFunc.is_none_or_empty(ITEMS) else {}
-                            OBJECT.append(DATA[0].get('url', []))
-
-                            res = self.S3_CLIENT.delete_object(Bucket=self.S3_BUCKET_NAME, Key=OBJECT[0])
-                            ret_value = HTTPStatus.OK if res.get('ResponseMetadata', {}).get('HTTPStatusCode', {}) == 204 else HTTPStatus.INTERNAL_SERVER_ERROR
-                            API_RESULT_DATAS['result'].append('OK') if ret_value == HTTPStatus.OK else API_RESULT_DATAS['result'].append('NG')
-                            ret_value = HTTPStatus.BAD_REQUEST if is_warned == True else HTTPStatus.OK
-                        # 不正なIDが入力された際に発火
-                        except (ClientError, IndexError) as e:
-                            is_warned = True
-                            ret_value = HTTPStatus.BAD_REQUEST
-                            API_RESULT_DATAS['result'].append('NG')
-                            # 例外内容をAPI処理結果詳細に設定
-                            cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'{type(e).__name__}, {'An invalid ID was detected.'}')
-                            self.LOGGER_WRAPPER.output(MSG=f'self:<{self}>, len(ids):{-1 if ids is None else len(ids)}, EXPIRATION:{EXPIRATION}, {type(e).__name__}! {'An invalid ID was detected.'}', LEVEL=logging.WARN)
-                            self.LOGGER_WRAPPER.output(MSG=f'self:<{self}>, len(ids):{-1 if ids is None else len(ids)}, EXPIRATION:{EXPIRATION}, ret_value:{ret_value}', PREFIX='::Leave')
-                            pass
-                    
-                    self.LOGGER_WRAPPER.output(MSG=f'delete_object_for_s3backet', PREFIX='::Leave')
-                except Exception as e:
-                    ret_value = HTTPStatus.INTERNAL_SERVER_ERROR
-                    API_RESULT_DATAS['result'].append('NG')
-                    # 例外内容をAPI処理結果詳細に設定
-                    cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'{type(e).__name__}, {e}')
-                    self.LOGGER_WRAPPER.output(MSG=f'self:<{self}>, len(ids):{-1 if ids is None else len(ids)}, EXPIRATION:{EXPIRATION}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
-                    self.LOGGER_WRAPPER.output(MSG=f'self:<{self}>, len(ids):{-1 if ids is None else len(ids)}, EXPIRATION:{EXPIRATION}, ret_value:{ret_value}', PREFIX='::Leave')
-        return ret_value, API_RESULT_DATAS
+                    PAGE_QUEUE.put(ITEM, timeout=0.1)
+                    break
+                except Full:
+                    continue
 
-    def _get_s3_file_lists(self, API_RESULT_DATAS:dict[str, str], IMAGE_FILE_PATHS:list[dict]) -> int:
-        """AWS S3内ファイルパス一覧を取得
+        def _list_prefix(PREFIX:str) -> None:
+            try:
+                PAGINATOR = self.S3_CLIENT.get_paginator('list_objects_v2')
+                for PAGE in PAGINATOR.paginate(Bucket=self.S3_BUCKET_NAME, Prefix=PREFIX):
+                    if STOP_EVENT.is_set(): break
+                    _put(self._get_s3_object_records(PAGE=PAGE))
+            except Exception as e:
+                _put(e)
+            finally:
+                _put(DONE)
+
+        EXECUTOR = ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(PREFIXES)))
+        try:
+            for PREFIX in PREFIXES:
+                EXECUTOR.submit(_list_prefix, PREFIX)
+            remaining = len(PREFIXES)
+            while remaining > 0:
+                ITEM = PAGE_QUEUE.get()
+                if ITEM is DONE:
+                    remaining -= 1
+                elif isinstance(ITEM, Exception):
+                    raise ITEM
+                else:
+                    yield from ITEM
+        finally:
+            STOP_EVENT.set()
+            EXECUTOR.shutdown(wait=True, cancel_futures=True)
+
+    def _get_s3_object_records(self, PAGE:dict) -> list[cS3ObjectRecord]:
+        """list_objects_v2の応答ページからS3オブジェクト情報リストを取得
 
         Args:
-            API_RESULT_DATAS (dict[str, str]): API応答内容dict
-            IMAGE_FILE_PATHS (list[dict]): AWS S3内ファイルパス一覧
+            PAGE (dict): list_objects_v2の応答ページ
+                ex:{'IsTruncated': True, 'Contents': [{'Key': '(ファイルパス)', 'LastModified': datetime.datetime(2024, 5, 30, 3, 40, 35, tzinfo=tzutc()), 'ETag': '"～"', 'Size': (ファイルサイズ), 'StorageClass': 'STANDARD'}, ...], 'Name': '(S3バケット名)', 'Prefix': '(プレフィックス)', 'MaxKeys': 1000, 'KeyCount': 1000, 'NextContinuationToken': '～'}
 
         Returns:
-            int: httpステータスコード
+            list[cS3ObjectRecord]: S3オブジェクト情報リスト(サイズが0より大きいもののみ)
         """
-        self.LOGGER_WRAPPER.output(MSG=f'', PREFIX='::Enter')
-        ret_value = HTTPStatus.OK if not IMAGE_FILE_PATHS is None else HTTPStatus.INTERNAL_SERVER_ERROR
-        # バケットが存在する場合
-        if ret_value == HTTPStatus.OK and self._is_exist_s3_bucket(S3_CLIENT=self.S3_CLIENT, API_RESULT_DATAS=API_RESULT_DATAS):
-            try:
-                IMAGE_FILE_PATHS.clear()
-                # S3内のファイル一覧を取得
-                OBJECTS = self.S3_CLIENT.list_objects(Bucket=self.S3_BUCKET_NAME, Prefix=self.S3_PREFIX)
-                '''
-                OBJECTSのデータ例:
-                {
-                    'ResponseMetadata':
-                    {
-                        (レスポンスの定義情報)
-                    },
-                    'IsTruncated': False,
-                    'Marker': '',
-                    'Contents': [
-                        {
-                            'Key': '(ファイルパス)',
-                            'LastModified': datetime.datetime(2024, 5, 30, 3, 40, 35, tzinfo=tzlocal()),
-                            'ETag': '"～"',
-                            'Size': (ファイルサイズ),
-                            'StorageClass': 'STANDARD',
-                            'Owner':
-                            {
-                                'DisplayName': 'webfile',
-                                'ID': '～'
-                            }
-                        },
-                        ...
-                    ],
-                    'Name': '(S3バケット名 ※"self.S3_BUCKET_NAME"の値)',
-                    'Prefix': '(プレフィックス ※"self.S3_PREFIX"の値)',
-                    'MaxKeys': 1000,
-                    'EncodingType': 'url'
-                }
-                '''
-                for CONTENT in OBJECTS.get('Contents', []):
-                    if 'Key' in CONTENT and CONTENT.get('Size', -1) > 0:
-                        IMAGE_FILE_PATHS.append({cCommonFunc.API_RESP_DICT_KEY_URL:CONTENT['Key'], cCommonFunc.API_RESP_DICT_KEY_LAST_MODIFIED:CONTENT.get("LastModified", "")})
-            except Exception as e:
-                ret_value = HTTPStatus.INTERNAL_SERVER_ERROR
-                # 例外内容をAPI処理結果詳細に設定
-                cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'{type(e).__name__}, {e}')
-                self.LOGGER_WRAPPER.output(MSG=f'len(IMAGE_FILE_PATHS):{len(IMAGE_FILE_PATHS)}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
-        self.LOGGER_WRAPPER.output(MSG=f'len(IMAGE_FILE_PATHS):{len(IMAGE_FILE_PATHS)}, ret_value:{ret_value}', PREFIX='::Leave')
-        return ret_value
+        return [cS3ObjectRecord(CONTENT['Key'], CONTENT['Size'], CONTENT.get('LastModified', datetime.min)) for CONTENT in PAGE.get('Contents', []) if 'Key' in CONTENT and CONTENT.get('Size', -1) > 0]
 
-    def _append_hash_tables_from_s3(self, API_RESULT_DATAS:dict[str, str], S3_IMAGE_FILE_PATH_DICTS:list[dict]) -> tuple[int, list[dict[str, str|int]]]:
-        """画像ID・画像変換状態・画像URLのhash-tableリストにS3画像ファイルパスからテーブルを追加
+    def _get_hash_table_diff_from_s3(self, API_RESULT_DATAS:dict[str, str], S3_RECORDS:Iterable[cS3ObjectRecord]) -> tuple[int, list[dict[str, str|int]], list[cImageRecord]]:
+        """S3画像ファイルパスとDB(画像ID・画像変換状態・画像URLのhash-tableリスト)の差分を取得
+        ※URLの集合演算で差分を求め、DBに存在する画像の画像IDおよび画像変換状態は変更しない。
+        同一URLのアイテムが複数存在する場合(重複登録)は、画像URLから生成した画像IDのアイテム(無い場合は最終更新日時が最も新しいアイテム)のみ残し、残りは削除対象とする
 
         Args:
             API_RESULT_DATAS (dict[str, str]): API応答内容dict
-            S3_IMAGE_FILE_PATHS (list[dict]): AWS S3内画像ファイルパスと最終更新日時リスト
+            S3_RECORDS (Iterable[cS3ObjectRecord]): AWS S3内画像ファイル情報(逐次取得)
 
         Returns:
-            tuple[int, list[dict[str, str|int]]]: [0]:httpステータスコード, [1]:画像ID・画像変換状態・画像URLのhash-tableリスト
+            tuple[int, list[dict[str, str|int]], list[cImageRecord]]: [0]:httpステータスコード, [1]:追加するhash-tableリスト, [2]:削除する画像レコードリスト
         """
-        ret_value = HTTPStatus.OK if not S3_IMAGE_FILE_PATH_DICTS is None else HTTPStatus.INTERNAL_SERVER_ERROR
+        ret_value = HTTPStatus.OK if not S3_RECORDS is None else HTTPStatus.INTERNAL_SERVER_ERROR
 
-        image_hash_table:list[dict[str, str|int]] = []
+        put_tables:list[dict[str, str|int]] = []
+        delete_tables:list[cImageRecord] = []
+        image_hash_table:list[cImageRecord] = []
         # 引数正常 かつ DBからデータ取得成功
         if ret_value == HTTPStatus.OK and self._set_image_url_hash_table_from_db(IMAGE_HASH_TABLES=image_hash_table):
             try:
-                FILE_PATHS:list[str] = []
-                for FILE_PATH_DICT in S3_IMAGE_FILE_PATH_DICTS:
-                    FILE_PATH:str = FILE_PATH_DICT.get(cCommonFunc.API_RESP_DICT_KEY_URL, "")
-                    FILE_PATHS.append(FILE_PATH)
-                    LAST_MODIFIED = FILE_PATH_DICT.get(cCommonFunc.API_RESP_DICT_KEY_LAST_MODIFIED, datetime.min)
+                # URL → 画像レコードリスト
+                DB_RECORDS:dict[str, list[cImageRecord]] = {}
+                for RECORD in image_hash_table:
+                    DB_RECORDS.setdefault(RECORD.url, []).append(RECORD)
+                DB_FILE_PATHS:set[str] = set(DB_RECORDS.keys())
+                S3_FILE_PATHS:set[str] = set()
+                for RECORD in S3_RECORDS:
+                    FILE_PATH:str = RECORD.key
+                    # 同一パスの重複は除外
+                    if FILE_PATH in S3_FILE_PATHS: continue
+                    S3_FILE_PATHS.add(FILE_PATH)
                     # hash-tableに存在しない画像ファイルパスの場合
-                    if not self._is_exist_value_in_hash_table(IMAGE_HASH_TABLE=image_hash_table, KEY=cCommonFunc.API_RESP_DICT_KEY_URL, DST_VALUE=FILE_PATH):
+                    if not FILE_PATH in DB_FILE_PATHS:
+                        LAST_MODIFIED:datetime = RECORD.last_modified
                         TABLE:dict[str, str] = {}
-                        TABLE[cCommonFunc.API_RESP_DICT_KEY_ID] = str(uuid4())
+                        TABLE[cCommonFunc.API_RESP_DICT_KEY_ID] = self.get_image_id_from_url(FILE_URL=FILE_PATH)
                         TABLE[cCommonFunc.API_RESP_DICT_KEY_URL] = FILE_PATH
                         TABLE[cCommonFunc.API_RESP_DICT_KEY_LAST_MODIFIED] = LAST_MODIFIED.strftime("%Y/%m/%d %H:%M:%S.%f")[:-3]
                         TABLE[cCommonFunc.API_RESP_DICT_KEY_CONVERTIBLE] = eImageConvertibleKind.UNDETERMINED
-                        image_hash_table.append(TABLE)
-                # S3バケット内に存在するファイルのみ残す
-                image_hash_table = [i for i in image_hash_table if i.get(cCommonFunc.API_RESP_DICT_KEY_URL, '') in FILE_PATHS]
+                        put_tables.append(TABLE)
+                # S3バケット内に存在しないファイルは削除対象
+                delete_tables = [RECORD for RECORD in image_hash_table if not RECORD.url in S3_FILE_PATHS]
+                # 同一URLの重複アイテムは1件のみ残して削除対象
+                for URL, RECORDS in DB_RECORDS.items():
+                    if len(RECORDS) <= 1 or not URL in S3_FILE_PATHS: continue
+                    ID = self.get_image_id_from_url(FILE_URL=URL)
+                    KEEP = max(RECORDS, key=lambda RECORD: (RECORD.id == ID, RECORD.last_modified))
+                    delete_tables.extend(RECORD for RECORD in RECORDS if not RECORD is KEEP)
             except Exception as e:
+                # S3内ファイル一覧の取得(並列取得を含む)でバケットが削除されていた場合は、次回呼び出し時に存在確認からやり直す
+                self._reset_bootstrap_state(ERROR=e)
                 ret_value = HTTPStatus.INTERNAL_SERVER_ERROR
                 # 例外内容をAPI処理結果詳細に設定
                 cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'{type(e).__name__}, {e}')
-                self.LOGGER_WRAPPER.output(MSG=f'self:<{self}>, len(API_RESULT_DATAS):{-1 if API_RESULT_DATAS is None else len(API_RESULT_DATAS)}, len(S3_IMAGE_FILE_PATH_DICTS):{-1 if S3_IMAGE_FILE_PATH_DICTS is None else len(S3_IMAGE_FILE_PATH_DICTS)}, len(image_hash_table):{-1 if image_hash_table is None else len(image_hash_table)}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+                self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, len(put_tables):{len(put_tables)}, len(image_hash_table):{len(image_hash_table)}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
         else:
-            cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'hash-tables is None or parameter is invalid!\n, len(S3_IMAGE_FILE_PATHS):{-1 if S3_IMAGE_FILE_PATH_DICTS is None else len(S3_IMAGE_FILE_PATH_DICTS)}')
+            ret_value = HTTPStatus.INTERNAL_SERVER_ERROR
+            cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'hash-tables is None or parameter is invalid!')
 
-        return ret_value, image_hash_table
+        return ret_value, put_tables, delete_tables
 
-    def _force_update_db_from_hash_table(self, API_RESULT_DATAS:dict[str, str], IMAGE_HASH_TABLE:list[dict[str, str|int]]) -> int:
-        """画像IDと画像URL管理DB強制更新(※DBが存在しない場合は新規作成)
+    def _apply_hash_table_diff_to_db(self, API_RESULT_DATAS:dict[str, str], PUT_TABLES:list[dict[str, str|int]], DELETE_TABLES:list[cImageRecord]) -> int:
+        """画像IDと画像URL管理DBに差分(追加・削除)のみをバッチ書き込みで反映(※DBが存在しない場合は新規作成)
 
         Args:
             API_RESULT_DATAS (dict[str, str]): API応答内容dict
-            IMAGE_HASH_TABLE (list[dict[str, str | int]]): 画像ID・画像変換状態・画像URLのhash-tableリスト
+            PUT_TABLES (list[dict[str, str | int]]): 追加するhash-tableリスト
+            DELETE_TABLES (list[cImageRecord]): 削除する画像レコードリスト
 
         Returns:
             int: httpステータスコード
         """
-        # ※テーブルを一旦削除する
-        ret_value = HTTPStatus.OK if not IMAGE_HASH_TABLE is None and self._delete_dynamodb_table_items(TABLE_NAME=self.DYNAMO_DB_IMAGE_MNG_TABLE_NAME) and not self.ImageMngDynamoDbResource is None else HTTPStatus.INTERNAL_SERVER_ERROR
-        if ret_value == HTTPStatus.OK:
+        ret_value = HTTPStatus.OK if not PUT_TABLES is None and not DELETE_TABLES is None and not self.ImageMngDynamoDbResource is None else HTTPStatus.INTERNAL_SERVER_ERROR
+        if ret_value == HTTPStatus.OK and (len(PUT_TABLES) > 0 or len(DELETE_TABLES) > 0):
             try:
                 DYNAMO_TABLE = self.ImageMngDynamoDbResource.Table(self.DYNAMO_DB_IMAGE_MNG_TABLE_NAME)
-                PUT_RESULTS:list[int] = []
-                for TABLE in IMAGE_HASH_TABLE:
-                    PUT_RESULTS.append(self.putitem_to_dynamodb_image_mng_table(FILE_URL=TABLE.get(cCommonFunc.API_RESP_DICT_KEY_URL, ''), LAST_MODIFIED=TABLE.get(cCommonFunc.API_RESP_DICT_KEY_LAST_MODIFIED, datetime.min.strftime("%Y/%m/%d %H:%M:%S.%f")[:-3]), CONVERTIBLE=TABLE.get(cCommonFunc.API_RESP_DICT_KEY_CONVERTIBLE, eImageConvertibleKind.UNDETERMINED), API_RESULT_DATAS=API_RESULT_DATAS, id=TABLE.get(cCommonFunc.API_RESP_DICT_KEY_ID, str(uuid4())), dynamo_table=DYNAMO_TABLE))
-                ret_value = max(PUT_RESULTS)
+                # batch_writerは25件単位でBatchWriteItemを発行し、未処理アイテムは自動で再送する
+                with DYNAMO_TABLE.batch_writer() as BATCH:
+                    for RECORD in DELETE_TABLES:
+                        BATCH.delete_item(Key={cCommonFunc.API_RESP_DICT_KEY_ID:RECORD.id})
+                    for TABLE in PUT_TABLES:
+                        BATCH.put_item(Item=TABLE)
+                self._bump_catalog_version()
+                for RECORD in DELETE_TABLES:
+                    self.SignedUrlCache.invalidate(OBJECT_KEY=RECORD.url)
             except Exception as e:
+                self._reset_bootstrap_state(ERROR=e)
                 ret_value = HTTPStatus.INTERNAL_SERVER_ERROR
                 # 例外内容をAPI処理結果詳細に設定
                 cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'{type(e).__name__}, {e}')
-                self.LOGGER_WRAPPER.output(MSG=f'self:<{self}>, {type(e).__name__}! {e}', LEVEL=logging.WARN)
-        else:
+                self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, len(PUT_TABLES):{len(PUT_TABLES)}, len(DELETE_TABLES):{len(DELETE_TABLES)}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+        elif ret_value != HTTPStatus.OK:
             # 内部変数に不正がある旨をAPI処理結果詳細に設定
-            cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'hash-tables is None or internal parameter is invalid!, len(self.S3_BUCKET_NAME):{len(self.S3_BUCKET_NAME)}, len(self.S3_DB_NAME):{len(self.S3_DB_NAME)}')
+            cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'hash-tables is None or internal parameter is invalid!, len(self.S3_BUCKET_NAME):{len(self.S3_BUCKET_NAME)}')
         return ret_value
 
-    def _delete_dynamodb_table_items(self, TABLE_NAME:str) -> bool:
-        """AWS DynamoDBのテーブル内アイテム全削除
+    def _get_image_mng_record(self, ID:str, CONVERTED_FORMATS:set[str] = None) -> cImageRecord:
+        """画像IDと画像URL管理テーブルから画像レコードを取得(GetItem 1回、取得属性を限定)
 
         Args:
-            TABLE_NAME (str): テーブル名
+            ID (str): 画像ID
+            CONVERTED_FORMATS (set[str], optional): 電子ペーパー向けに変換して格納した出力形式名の設定先(Noneの場合は取得しない). Defaults to None.
 
         Returns:
-            bool: 成功時はTrue、それ以外はFalse
+            cImageRecord: 画像レコード(IDが存在しない場合は画像IDが空の画像レコード、取得失敗時はNone)
         """
-        ret_value = not cCommonFunc.is_none_or_empty(TABLE_NAME)
-        # テーブルが存在する
-        if ret_value and self._is_exist_dynamodb_table(TABLE_NAME=TABLE_NAME) and not self.ImageMngDynamoDbResource is None:
+        # カタログバージョン管理用アイテムは画像として扱わない
+        if cCommonFunc.is_none_or_empty(ID) or not isinstance(ID, str) or ID == self.CATALOG_VERSION_ID:
+            return cImageRecord()
+        ret_value:cImageRecord = None
+        if not self.ImageMngDynamoDbResource is None:
             try:
-                DELETE_ITEMS:list[dict] = []
-                PAGINATOR = self.DynamoDBClient.get_paginator('scan')
-                for PAGE in PAGINATOR.paginate(TableName=self.DYNAMO_DB_IMAGE_MNG_TABLE_NAME):
-                    DELETE_ITEMS.extend(PAGE.get('Items', {}))
-
-                DYNAMO_TABLE = self.ImageMngDynamoDbResource.Table(self.DYNAMO_DB_IMAGE_MNG_TABLE_NAME)
-                KEY_NAMES = [ x.get('AttributeName', "") for x in DYNAMO_TABLE.key_schema ]
-                DELETE_KEYS = [ { k:v for k,v in x.items() if k in KEY_NAMES } for x in DELETE_ITEMS ]
-
-                with DYNAMO_TABLE.batch_writer() as BATCH:
-                    for DEL_KEY in DELETE_KEYS:
-                        for KEY, VALUE in DEL_KEY.items():
-                            BATCH.delete_item(Key = {KEY:self.Deserializer.deserialize(VALUE)})
+                NAMES = {f'#attr{INDEX}':NAME for INDEX, NAME in enumerate(cImageRecord.__slots__ + (() if CONVERTED_FORMATS is None else (self.CONVERTED_FORMATS_ATTRIBUTE_NAME,)))}
+                RESPONSE:dict = self.DynamoDBClient.get_item(TableName=self.DYNAMO_DB_IMAGE_MNG_TABLE_NAME, Key={cCommonFunc.API_RESP_DICT_KEY_ID:ID}, ProjectionExpression=', '.join(NAMES.keys()), ExpressionAttributeNames=NAMES)
+                ITEM:dict = RESPONSE.get('Item', None)
+                ret_value = cImageRecord() if ITEM is None else cImageRecord.from_item(ITEM=ITEM)
+                if not CONVERTED_FORMATS is None and not ITEM is None: CONVERTED_FORMATS.update(ITEM.get(self.CONVERTED_FORMATS_ATTRIBUTE_NAME, None) or ())
             except Exception as e:
-                ret_value = False
-                self.LOGGER_WRAPPER.output(MSG=f'self:{self}, TABLE_NAME:{TABLE_NAME}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+                self._reset_bootstrap_state(ERROR=e)
+                ret_value = None
+                self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, ID:{ID}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
         return ret_value
 
-    def _is_exist_id_in_dynamodb_image_mng_table(self, ID:str) -> bool:
-        """指定したIDがDynamoDBの「画像IDとURL管理テーブル」に存在するか
+    def get_by_url(self, FILE_URL:str) -> cImageRecord:
+        """画像URLから画像レコードを取得(画像URLインデックスへのQuery 1回)
+        ※インデックスが利用できない(作成中等)場合は、画像URLから生成した画像IDでのGetItemで取得する(画像IDを画像URLから生成する前に登録したアイテムは取得できない)
 
         Args:
-            ID (str): 画像ID
+            FILE_URL (str): 画像URL(S3ファイルパス)
 
         Returns:
-            bool: 指定したIDがDynamoDBの「画像IDとURL管理テーブル」に存在する場合はTrue、それ以外はFalse
+            cImageRecord: 画像レコード(画像URLが存在しない場合は画像IDが空の画像レコード、取得失敗時はNone)
         """
-        ret_value = not self.ImageMngDynamoDbResource is None
-        if ret_value:
+        if cCommonFunc.is_none_or_empty(FILE_URL) or not isinstance(FILE_URL, str):
+            return cImageRecord()
+        ret_value:cImageRecord = None
+        if not self.ImageMngDynamoDbResource is None:
             try:
-                TABLE = self.ImageMngDynamoDbResource.Table(self.DYNAMO_DB_IMAGE_MNG_TABLE_NAME)
-                RESPONSE:dict = TABLE.query(KeyConditionExpression=Key(cCommonFunc.API_RESP_DICT_KEY_ID).eq(ID))
-                COUNT = RESPONSE.get('Count', 0)
-                ret_value = COUNT > 0
+                RECORDS = self._query_image_mng_records_by_url(FILE_URL=FILE_URL)
+                if RECORDS is None:
+                    RECORD = self._get_image_mng_record(ID=self.get_image_id_from_url(FILE_URL=FILE_URL))
+                    ret_value = RECORD if RECORD is None or RECORD.url == FILE_URL else cImageRecord()
+                else:
+                    # 同一画像URLのアイテムが複数ある場合は、画像URLから生成した画像IDのアイテムを優先する
+                    ID = self.get_image_id_from_url(FILE_URL=FILE_URL)
+                    ret_value = next((RECORD for RECORD in RECORDS if RECORD.id == ID), RECORDS[0] if len(RECORDS) > 0 else cImageRecord())
             except Exception as e:
-                ret_value = False
-                self.LOGGER_WRAPPER.output(MSG=f'self:<{self}>, ID:{ID}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+                self._reset_bootstrap_state(ERROR=e)
+                ret_value = None
+                self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, FILE_URL:{FILE_URL}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
         return ret_value
 
-    def _is_exist_value_in_hash_table(self, IMAGE_HASH_TABLE:list[dict[str, str|int]], KEY:str, DST_VALUE:str) -> bool:
-        """hash-tableの該当keyに値が存在するかチェック
+    def batch_get_by_url(self, FILE_URLS:list[str], INCLUDE_LEGACY:bool = True) -> dict[str, cImageRecord]:
+        """画像URLリストから画像レコードを一括取得
+        ※画像URLから生成した画像IDでBatchGetItem(100件単位)を行い、該当しなかった画像URLのみ画像URLインデックスへQueryする。
+        Queryは画像URLごとに1回(テーブルに存在しない画像URLを含む)のため、該当しなかった画像URLがN件の場合はN回のQuery(並列数:URL_QUERY_MAX_WORKERS)が追加で発生する。
+        画像IDを画像URLから生成する前に登録したアイテムが存在しないことが分かっている場合は、INCLUDE_LEGACYにFalseを指定してQueryを省略する(BatchGetItemで未処理のままの画像IDのみQueryする)。
 
         Args:
-            IMAGE_HASH_TABLE (list[dict[str, str | int]]): 画像ID・画像変換状態・画像URLのhash-tableリスト
-            KEY (str): hash-tableキー名
-            DST_VALUE (str): 検索対象値
+            FILE_URLS (list[str]): 画像URL(S3ファイルパス)リスト
+            INCLUDE_LEGACY (bool, optional): 画像IDを画像URLから生成する前に登録したアイテムも取得するか. Defaults to True.
 
         Returns:
-            bool: hash-tableの該当keyに値が存在する場合はTrue、それ以外はFalse
+            dict[str, cImageRecord]: 画像URLをキーとした画像レコードdict(存在しない画像URLは含まない、取得失敗時はNone)
         """
-        ret_value = not IMAGE_HASH_TABLE is None
-        if ret_value:
+        self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, len(FILE_URLS):{-1 if FILE_URLS is None else len(FILE_URLS)}', PREFIX='::Enter')
+        ret_value:dict[str, cImageRecord] = {} if not FILE_URLS is None and not self.ImageMngDynamoDbResource is None else None
+        if not ret_value is None:
             try:
-                ret_value = any(DST_VALUE == HASH_TABLE.get(KEY, '') for HASH_TABLE in IMAGE_HASH_TABLE)
+                URLS:list[str] = list(dict.fromkeys(URL for URL in FILE_URLS if isinstance(URL, str) and len(URL) > 0))
+                IDS:dict[str, str] = {self.get_image_id_from_url(FILE_URL=URL):URL for URL in URLS}
+                UNPROCESSED_IDS:set[str] = set()
+                for ID, ITEM in self._batch_get_image_mng_items(IDS=list(IDS.keys()), ATTRIBUTE_NAMES=list(cImageRecord.__slots__), UNPROCESSED_IDS=UNPROCESSED_IDS).items():
+                    RECORD = cImageRecord.from_item(ITEM=ITEM)
+                    if RECORD.url == IDS.get(ID, None): ret_value[RECORD.url] = RECORD
+                # 画像IDを画像URLから生成する前に登録したアイテム および BatchGetItemで未処理のままの画像IDは画像URLインデックスで取得する
+                UNPROCESSED_URLS:set[str] = {IDS[ID] for ID in UNPROCESSED_IDS if ID in IDS}
+                MISSED_URLS:list[str] = [URL for URL in URLS if not URL in ret_value and (INCLUDE_LEGACY or URL in UNPROCESSED_URLS)]
+                if len(MISSED_URLS) > 0:
+                    # 先頭の1件でインデックスが利用可能か確認してから、残りを並列でQueryする
+                    RESULTS:list[list[cImageRecord]] = [self._query_image_mng_records_by_url(FILE_URL=MISSED_URLS[0])]
+                    if not RESULTS[0] is None and len(MISSED_URLS) > 1:
+                        with ThreadPoolExecutor(max_workers=min(self.URL_QUERY_MAX_WORKERS, len(MISSED_URLS) - 1)) as EXECUTOR:
+                            RESULTS.extend(EXECUTOR.map(lambda URL: self._query_image_mng_records_by_url(FILE_URL=URL), MISSED_URLS[1:]))
+                    for URL, RECORDS in zip(MISSED_URLS, RESULTS):
+                        if not RECORDS is None and len(RECORDS) > 0: ret_value[URL] = RECORDS[0]
+                    # インデックスが利用できず、未処理のままの画像IDの存在有無を判定できない場合は取得失敗とする
+                    if RESULTS[0] is None and any(not URL in ret_value for URL in UNPROCESSED_URLS):
+                        raise RuntimeError(f'UnprocessedKeys remain and {self.URL_INDEX_NAME} is not available! len(UNPROCESSED_URLS):{len(UNPROCESSED_URLS)}')
             except Exception as e:
-                ret_value = False
-                self.LOGGER_WRAPPER.output(MSG=f'len(IMAGE_HASH_TABLE):{len(IMAGE_HASH_TABLE)}, KEY:{KEY}, DST_VALUE:{DST_VALUE}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+                self._reset_bootstrap_state(ERROR=e)
+                ret_value = None
+                self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, len(FILE_URLS):{len(FILE_URLS)}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+        self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, len(FILE_URLS):{-1 if FILE_URLS is None else len(FILE_URLS)}, len(ret_value):{-1 if ret_value is None else len(ret_value)}', PREFIX='::Leave')
         return ret_value
+
+    def _query_image_mng_records_by_url(self, FILE_URL:str) -> list[cImageRecord]:
+        """画像URLインデックスから画像URLに該当する画像レコードを取得(Query 1回)
+
+        Args:
+            FILE_URL (str): 画像URL(S3ファイルパス)
+
+        Returns:
+            list[cImageRecord]: 画像レコードリスト(インデックスが利用できない場合はNone) ※通信エラー等は例外を送出する
+        """
+        NAMES = {f'#attr{INDEX}':NAME for INDEX, NAME in enumerate(cImageRecord.__slots__)}
+        NAMES['#attr_url'] = cCommonFunc.API_RESP_DICT_KEY_URL
+        try:
+            RESPONSE:dict = self.DynamoDBClient.query(TableName=self.DYNAMO_DB_IMAGE_MNG_TABLE_NAME, IndexName=self.URL_INDEX_NAME, KeyConditionExpression='#attr_url = :url', ProjectionExpression=', '.join(NAME for NAME in NAMES.keys() if NAME != '#attr_url'), ExpressionAttributeNames=NAMES, ExpressionAttributeValues={':url':FILE_URL})
+        except ClientError as e:
+            # インデックスが存在しない・作成中
+            if e.response.get('Error', {}).get('Code', '') in ('ValidationException', 'ResourceNotFoundException'):
+                self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, FILE_URL:{FILE_URL}, INDEX_NAME:{self.URL_INDEX_NAME}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+                return None
+            raise
+        return [cImageRecord.from_item(ITEM=ITEM) for ITEM in RESPONSE.get('Items', [])]
+
+    @classmethod
+    def _get_image_etag(cls, RECORD:cImageRecord, SIGNED_URL:str) -> str:
+        """画像レコードと署名付きURLからETagを生成
+        ※署名付きURLは発行日時・有効期限を含むため、アイテムの更新時および署名付きURLの再発行時に値が変わる
+
+        Args:
+            RECORD (cImageRecord): 画像レコード
+            SIGNED_URL (str): 署名付きURL
+
+        Returns:
+            str: ETag(ダブルクォートで囲んだ文字列)
+        """
+        SRC = '\n'.join((RECORD.id, RECORD.url, RECORD.last_modified, str(RECORD.convertible), SIGNED_URL))
+        return f'"{hashlib.sha256(SRC.encode("utf-8")).hexdigest()[:32]}"'
+
+    @classmethod
+    def _is_match_etag(cls, ETAG:str, IF_NONE_MATCH:str) -> bool:
+        """ETagがリクエストヘッダ"If-None-Match"の値と一致するか(弱い比較)
+
+        Args:
+            ETAG (str): ETag
+            IF_NONE_MATCH (str): リクエストヘッダ"If-None-Match"の値(カンマ区切りの複数指定、"*"に対応)
+
+        Returns:
+            bool: 一致する場合はTrue、それ以外はFalse
+        """
+        if cCommonFunc.is_none_or_empty(IF_NONE_MATCH) or cCommonFunc.is_none_or_empty(ETAG):
+            return False
+        TAGS = [TAG.strip() for TAG in IF_NONE_MATCH.split(',')]
+        return '*' in TAGS or ETAG.removeprefix('W/') in (TAG.removeprefix('W/') for TAG in TAGS)
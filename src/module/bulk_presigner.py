@@ -0,0 +1,178 @@
+"""署名付きURL一括発行処理
+"""
+from hashlib import sha256
+from urllib.parse import quote, unquote, urlsplit
+
+import hmac
+import logging
+
+from module.logger_wrapper import cLoggerWrapper
+
+class cBulkPresigner:
+    """署名付きURL一括発行クラス
+    ※バッチ先頭の1件のみbotocoreで署名付きURLを発行し、そのURLからエンドポイント・日時・認証スコープを取得する。
+    署名キー(SigV4)および正規リクエストの共通部分はバッチ単位で1回だけ算出し、残りのオブジェクトキーはHMAC計算のみで署名する。
+    先頭1件の署名がbotocoreの結果と一致しない場合は、バッチ全体をbotocoreによる1件ずつの発行に切り替える。
+    """
+
+    HTTP_METHODS:dict[str, str] = {'get_object':'GET', 'put_object':'PUT'}
+    """一括発行対象のAPIとhttpメソッドの対応
+    """
+
+    SIGNATURE_PARAM:str = 'X-Amz-Signature'
+    """署名のクエリパラメータ名
+    """
+
+    def __init__(self, S3_CLIENT, BUCKET_NAME:str, LOGGER_WRAPPER:cLoggerWrapper = None) -> None:
+        """署名付きURL一括発行クラスのコンストラクタ
+
+        Args:
+            S3_CLIENT (_type_): S3クライアントのインスタンス
+            BUCKET_NAME (str): AWS S3バケット名
+            LOGGER_WRAPPER (cLoggerWrapper, optional): ログ出力管理クラスのインスタンス. Defaults to None.
+        """
+        self._s3_client = S3_CLIENT
+        self._bucket_name = BUCKET_NAME
+        self._logger_wrapper = cLoggerWrapper() if LOGGER_WRAPPER is None else LOGGER_WRAPPER
+
+    def presign(self, CLIENT_METHOD:str, OBJECT_KEYS:list[str], EXPIRATION:int) -> list[str]:
+        """署名付きURLの一括発行
+
+        Args:
+            CLIENT_METHOD (str): S3へのリクエストで利用するAPI(ex:"put_object", "get_object")
+            OBJECT_KEYS (list[str]): ファイル名リスト
+            EXPIRATION (int): 有効期限(単位:秒)
+
+        Returns:
+            list[str]: 署名付きURLリスト(OBJECT_KEYSと同順)
+        """
+        if len(OBJECT_KEYS) <= 0:
+            return []
+        FIRST_URL:str = self._presign_one(CLIENT_METHOD=CLIENT_METHOD, OBJECT_KEY=OBJECT_KEYS[0], EXPIRATION=EXPIRATION)
+        CONTEXT:dict = self._create_batch_context(CLIENT_METHOD=CLIENT_METHOD, FIRST_OBJECT_KEY=OBJECT_KEYS[0], FIRST_URL=FIRST_URL)
+        if CONTEXT is None:
+            # 一括発行不可(未対応API・認証情報不明・botocoreとの不一致)の場合は1件ずつ発行
+            return [FIRST_URL] + [self._presign_one(CLIENT_METHOD=CLIENT_METHOD, OBJECT_KEY=KEY, EXPIRATION=EXPIRATION) for KEY in OBJECT_KEYS[1:]]
+        return [FIRST_URL] + [self._sign(CONTEXT=CONTEXT, OBJECT_KEY=KEY) for KEY in OBJECT_KEYS[1:]]
+
+    def _presign_one(self, CLIENT_METHOD:str, OBJECT_KEY:str, EXPIRATION:int) -> str:
+        """botocoreによる署名付きURLの発行(1件)
+
+        Args:
+            CLIENT_METHOD (str): S3へのリクエストで利用するAPI(ex:"put_object", "get_object")
+            OBJECT_KEY (str): ファイル名
+            EXPIRATION (int): 有効期限(単位:秒)
+
+        Returns:
+            str: 署名付きURL
+        """
+        return self._s3_client.generate_presigned_url(ClientMethod=CLIENT_METHOD, Params={'Bucket': self._bucket_name, 'Key': f'{OBJECT_KEY}'}, ExpiresIn=EXPIRATION)
+
+    def _create_batch_context(self, CLIENT_METHOD:str, FIRST_OBJECT_KEY:str, FIRST_URL:str) -> dict:
+        """バッチ共通の署名情報を算出
+
+        Args:
+            CLIENT_METHOD (str): S3へのリクエストで利用するAPI
+            FIRST_OBJECT_KEY (str): バッチ先頭のファイル名
+            FIRST_URL (str): バッチ先頭のbotocoreによる署名付きURL
+
+        Returns:
+            dict: バッチ共通の署名情報(一括発行できない場合はNone)
+        """
+        ret_value:dict = None
+        HTTP_METHOD = self.HTTP_METHODS.get(CLIENT_METHOD, '')
+        CREDENTIALS = self._get_frozen_credentials()
+        if len(HTTP_METHOD) <= 0 or CREDENTIALS is None:
+            return ret_value
+        try:
+            PARTS = urlsplit(FIRST_URL)
+            QUOTED_KEY = quote(FIRST_OBJECT_KEY, safe='/~')
+            PAIRS = [PAIR.partition('=') for PAIR in PARTS.query.split('&')]
+            PARAMS = {KEY:unquote(VALUE) for KEY, _, VALUE in PAIRS}
+            EXPECTED_SIGNATURE = PARAMS.pop(self.SIGNATURE_PARAM, '')
+            # 認証スコープ(アクセスキー/日付/リージョン/サービス/aws4_request)
+            ACCESS_KEY, DATE, REGION, SERVICE, TERMINATOR = PARAMS.get('X-Amz-Credential', '').split('/')
+            if not PARTS.path.endswith(QUOTED_KEY) or ACCESS_KEY != CREDENTIALS.access_key or TERMINATOR != 'aws4_request' or len(EXPECTED_SIGNATURE) <= 0:
+                return ret_value
+            SIGNING_KEY = self._hmac(f'AWS4{CREDENTIALS.secret_key}'.encode('utf-8'), DATE)
+            SIGNING_KEY = self._hmac(SIGNING_KEY, REGION)
+            SIGNING_KEY = self._hmac(SIGNING_KEY, SERVICE)
+            SIGNING_KEY = self._hmac(SIGNING_KEY, TERMINATOR)
+            CANONICAL_QUERY = '&'.join(f'{KEY}={VALUE}' for KEY, VALUE in sorted((quote(KEY, safe='-_.~'), quote(VALUE, safe='-_.~')) for KEY, VALUE in PARAMS.items()))
+            context = {
+                'signing_key': SIGNING_KEY,
+                'url_prefix': f'{PARTS.scheme}://{PARTS.netloc}{PARTS.path[:len(PARTS.path) - len(QUOTED_KEY)]}',
+                'path_prefix': PARTS.path[:len(PARTS.path) - len(QUOTED_KEY)],
+                'query': '&'.join(f'{KEY}={VALUE}' for KEY, _, VALUE in PAIRS if KEY != self.SIGNATURE_PARAM),
+                'canonical_request_head': f'{HTTP_METHOD}\n',
+                'canonical_request_tail': f'\n{CANONICAL_QUERY}\nhost:{self._get_canonical_host(PARTS)}\n\nhost\nUNSIGNED-PAYLOAD',
+                'string_to_sign_head': f'AWS4-HMAC-SHA256\n{PARAMS.get("X-Amz-Date", "")}\n{DATE}/{REGION}/{SERVICE}/{TERMINATOR}\n',
+            }
+            # botocoreと同一の署名になることを先頭1件で検証
+            if self._sign(CONTEXT=context, OBJECT_KEY=FIRST_OBJECT_KEY) == FIRST_URL:
+                ret_value = context
+            else:
+                self._logger_wrapper.output(MSG=lambda: f'CLIENT_METHOD:{CLIENT_METHOD}, signature mismatch with botocore, fallback to per-call presigning.', LEVEL=logging.WARN)
+        except Exception as e:
+            ret_value = None
+            self._logger_wrapper.output(MSG=lambda: f'CLIENT_METHOD:{CLIENT_METHOD}, FIRST_OBJECT_KEY:{FIRST_OBJECT_KEY}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+        return ret_value
+
+    def _sign(self, CONTEXT:dict, OBJECT_KEY:str) -> str:
+        """バッチ共通の署名情報を用いた署名付きURLの発行(1件)
+
+        Args:
+            CONTEXT (dict): バッチ共通の署名情報
+            OBJECT_KEY (str): ファイル名
+
+        Returns:
+            str: 署名付きURL
+        """
+        QUOTED_KEY = quote(OBJECT_KEY, safe='/~')
+        CANONICAL_REQUEST = f'{CONTEXT["canonical_request_head"]}{CONTEXT["path_prefix"]}{QUOTED_KEY}{CONTEXT["canonical_request_tail"]}'
+        STRING_TO_SIGN = f'{CONTEXT["string_to_sign_head"]}{sha256(CANONICAL_REQUEST.encode("utf-8")).hexdigest()}'
+        SIGNATURE = hmac.new(CONTEXT['signing_key'], STRING_TO_SIGN.encode('utf-8'), sha256).hexdigest()
+        return f'{CONTEXT["url_prefix"]}{QUOTED_KEY}?{CONTEXT["query"]}&{self.SIGNATURE_PARAM}={SIGNATURE}'
+
+    def _get_frozen_credentials(self):
+        """S3クライアントの認証情報取得
+
+        Returns:
+            _type_: 認証情報(アクセスキー・シークレットキー・トークン、取得できない場合はNone)
+        """
+        ret_value = None
+        try:
+            CREDENTIALS = getattr(getattr(self._s3_client, '_request_signer', None), '_credentials', None)
+            ret_value = None if CREDENTIALS is None else CREDENTIALS.get_frozen_credentials()
+        except Exception as e:
+            self._logger_wrapper.output(MSG=lambda: f'{type(e).__name__}! {e}', LEVEL=logging.WARN)
+        return ret_value
+
+    @classmethod
+    def _get_canonical_host(cls, PARTS) -> str:
+        """署名対象のhostヘッダー値取得(既定ポートは除外)
+
+        Args:
+            PARTS (_type_): urlsplitの結果
+
+        Returns:
+            str: hostヘッダー値
+        """
+        HOST:str = PARTS.hostname
+        if ':' in HOST: HOST = f'[{HOST}]'
+        if PARTS.port is not None and PARTS.port != {'http':80, 'https':443}.get(PARTS.scheme):
+            HOST = f'{HOST}:{PARTS.port}'
+        return HOST
+
+    @classmethod
+    def _hmac(cls, KEY:bytes, MSG:str) -> bytes:
+        """HMAC-SHA256の算出
+
+        Args:
+            KEY (bytes): キー
+            MSG (str): メッセージ
+
+        Returns:
+            bytes: HMAC-SHA256値
+        """
+        return hmac.new(KEY, MSG.encode('utf-8'), sha256).digest()
@@ -0,0 +1,128 @@
+"""画像カタログキャッシュ管理クラス定義
+"""
+from module.image_record import cImageRecord
+from threading import Lock
+
+class cCatalogCache:
+    """画像カタログキャッシュ管理クラス
+    ※Lambdaコンテナ内で画像IDと画像URL管理テーブルの全件(スキャン結果)を、取得直前に読み込んだカタログバージョンと組で保持する。
+    テーブルへの書き込み時にカタログバージョンが更新されるため、保持中のバージョンと一致する場合のみ有効なキャッシュとして扱う。
+    """
+
+    def __init__(self, MAX_ITEMS:int = 50000) -> None:
+        """画像カタログキャッシュ管理クラスのコンストラクタ
+
+        Args:
+            MAX_ITEMS (int, optional): 最大保持件数(超過する場合は保持しない、0以下の場合はキャッシュしない). Defaults to 50000.
+        """
+        self._max_items:int = max(0, MAX_ITEMS)
+        self._version:int = None
+        self._items:list[cImageRecord] = []
+        # 画像ID → 保持リスト内の位置(継続トークンからの再開位置の検索用)
+        self._indexes:dict[str, int] = {}
+        self._lock:Lock = Lock()
+        self._hit_count:int = 0
+        self._miss_count:int = 0
+
+    def __str__(self) -> str:
+        """現在のオブジェクトを表す文字列を返す
+
+        Returns:
+            str: 現在のオブジェクトを表す文字列
+        """
+        return f'MAX_ITEMS:{self.MAX_ITEMS}, VERSION:{self.VERSION}, SIZE:{len(self._items)}, HIT_COUNT:{self.HIT_COUNT}, MISS_COUNT:{self.MISS_COUNT}'
+
+    @property
+    def ENABLED(self) -> bool:
+        """キャッシュの有効/無効 取得
+
+        Returns:
+            bool: 有効時はTrue、それ以外はFalse
+        """
+        return self._max_items > 0
+
+    @property
+    def MAX_ITEMS(self) -> int:
+        """最大保持件数 取得
+
+        Returns:
+            int: 最大保持件数
+        """
+        return self._max_items
+
+    @property
+    def VERSION(self) -> int:
+        """保持中のカタログバージョン 取得
+
+        Returns:
+            int: 保持中のカタログバージョン(未保持の場合はNone)
+        """
+        return self._version
+
+    @property
+    def HIT_COUNT(self) -> int:
+        """キャッシュヒット数 取得
+
+        Returns:
+            int: キャッシュヒット数
+        """
+        return self._hit_count
+
+    @property
+    def MISS_COUNT(self) -> int:
+        """キャッシュミス数 取得
+
+        Returns:
+            int: キャッシュミス数
+        """
+        return self._miss_count
+
+    def get_page(self, VERSION:int, LIMIT:int = 0, START_ID:str = '') -> tuple[list[cImageRecord], str]:
+        """保持中のカタログから1ページ分を取得
+
+        Args:
+            VERSION (int): 現在のカタログバージョン
+            LIMIT (int, optional): 取得件数(0の場合は末尾まで取得). Defaults to 0.
+            START_ID (str, optional): 取得開始位置の画像ID(この画像IDの次から取得、空の場合は先頭から取得). Defaults to ''.
+
+        Returns:
+            tuple[list[cImageRecord], str]: [0]:画像レコードリスト(バージョン不一致 または 取得開始位置の画像IDを保持していない場合はNone), [1]:次ページの取得開始位置の画像ID(末尾まで取得した場合は空文字)
+        """
+        with self._lock:
+            START = 0 if not START_ID else self._indexes.get(START_ID, -2) + 1
+            if VERSION is None or VERSION != self._version or START < 0:
+                self._miss_count += 1
+                return None, ''
+            self._hit_count += 1
+            END = len(self._items) if LIMIT <= 0 else min(START + LIMIT, len(self._items))
+            ITEMS = self._items[START:END]
+            NEXT_ID = '' if END >= len(self._items) or len(ITEMS) <= 0 else ITEMS[-1].id
+        return ITEMS, NEXT_ID
+
+    def put(self, VERSION:int, ITEMS:list[cImageRecord]) -> bool:
+        """カタログの登録
+
+        Args:
+            VERSION (int): カタログの取得直前に読み込んだカタログバージョン
+            ITEMS (list[cImageRecord]): 画像レコードリスト(全件)
+
+        Returns:
+            bool: 登録した場合はTrue、それ以外(無効・最大保持件数超過)はFalse
+        """
+        if not self.ENABLED or VERSION is None or ITEMS is None or len(ITEMS) > self._max_items:
+            return False
+        ITEMS = list(ITEMS)
+        INDEXES = {RECORD.id:INDEX for INDEX, RECORD in enumerate(ITEMS)}
+        with self._lock:
+            self._version = VERSION
+            self._items = ITEMS
+            self._indexes = INDEXES
+        return True
+
+    def clear(self) -> None:
+        """保持中のカタログの破棄
+        """
+        with self._lock:
+            self._version = None
+            self._items = []
+            self._indexes = {}
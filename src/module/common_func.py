@@ -26,12 +26,11 @@ class eImageConvertibleKind(IntEnum):
         Returns:
             str: 列挙型の値に合致する名称
         """
-        ret_value = cls.UNDETERMINED.name.lower()
-        for CLS_VAL in cls:
-            if VALUE == CLS_VAL:
-                ret_value = CLS_VAL.name.lower()
-                break
-        return ret_value
+        try:
+            return _CONVERTIBLE_NAMES_BY_VALUE.get(VALUE, _CONVERTIBLE_DEFAULT_NAME)
+        except TypeError:
+            # ハッシュ化できない値は合致しない
+            return _CONVERTIBLE_DEFAULT_NAME
 
     @classmethod
     def get_value_from_name(cls, NAME:str) -> IntEnum:
@@ -43,14 +42,33 @@ class eImageConvertibleKind(IntEnum):
         Returns:
             IntEnum: 名称に合致する列挙型の値
         """
-        ret_value = cls.UNDETERMINED
-        if not cCommonFunc.is_none_or_empty(NAME):
-            DST_NAME = NAME.lower()
-            for VALUE in cls:
-                if DST_NAME == VALUE.name.lower():
-                    ret_value = VALUE
-                    break
-        return ret_value
+        if cCommonFunc.is_none_or_empty(NAME):
+            return cls.UNDETERMINED
+        return _CONVERTIBLE_VALUES_BY_NAME.get(NAME.lower(), cls.UNDETERMINED)
+
+    @classmethod
+    def is_exist_name(cls, NAME:str) -> bool:
+        """名称に合致する列挙型の値が存在するか
+
+        Args:
+            NAME (str): 名称
+
+        Returns:
+            bool: 名称に合致する列挙型の値が存在する場合はTrue、それ以外はFalse
+        """
+        return not cCommonFunc.is_none_or_empty(NAME) and NAME.lower() in _CONVERTIBLE_VALUES_BY_NAME
+
+_CONVERTIBLE_NAMES_BY_VALUE:dict[int, str] = {VALUE.value:VALUE.name.lower() for VALUE in eImageConvertibleKind}
+"""画像フォーマット変換状態の値 → 名称(小文字)の変換表
+"""
+
+_CONVERTIBLE_VALUES_BY_NAME:dict[str, eImageConvertibleKind] = {VALUE.name.lower():VALUE for VALUE in eImageConvertibleKind}
+"""画像フォーマット変換状態の名称(小文字) → 値の変換表
+"""
+
+_CONVERTIBLE_DEFAULT_NAME:str = eImageConvertibleKind.UNDETERMINED.name.lower()
+"""画像フォーマット変換状態の値が合致しない場合の名称
+"""
 
 class cCommonFunc():
     """共通処理定義クラス
@@ -88,6 +106,14 @@ class cCommonFunc():
     """API応答内容の"URL"キー名
     """
 
+    API_RESP_DICT_KEY_NEXT_TOKEN = 'next_token'
+    """API応答内容の"継続トークン"キー名
+    """
+
+    API_RESP_DICT_KEY_UNPROCESSED_IDS = 'unprocessed_ids'
+    """API応答内容の"未処理の画像IDリスト"キー名
+    """
+
     @classmethod
     def is_none_or_empty(cls, SRC:str | list | dict) -> bool:
         """Noneか空かチェック
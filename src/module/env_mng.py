@@ -1,7 +1,6 @@
 """環境変数管理
 """
 import os
-from dotenv import load_dotenv
 
 class cEnvMng:
     """環境変数管理クラス
@@ -11,7 +10,11 @@ class cEnvMng:
         """環境変数管理クラスのコンストラクタ
         """
         # 環境変数ファイル読み込み
-        load_dotenv(override=True)
+        DOTENV_PATH = self._find_dotenv_path()
+        if not DOTENV_PATH is None:
+            # 環境変数ファイルが存在する場合のみ読み込みモジュールをimportする(Lambda実行環境の初期化時間短縮)
+            from dotenv import load_dotenv
+            load_dotenv(dotenv_path=DOTENV_PATH or None, override=True)
 
     def __str__(self) -> str:
         """現在のオブジェクトを表す文字列を返す
@@ -26,10 +29,41 @@ class cEnvMng:
             ret_value += f', AWS_DYNAMODB_IMAGE_MNG_TABLE_NAME:{self.AWS_DYNAMODB_IMAGE_MNG_TABLE_NAME}'
 
             ret_value += f', LOG_LEVEL:{self.LOG_LEVEL}'
+            ret_value += f', SIGNED_URL_CACHE_SIZE:{self.SIGNED_URL_CACHE_SIZE}'
+            ret_value += f', SIGNED_URL_CACHE_REFRESH_RATIO:{self.SIGNED_URL_CACHE_REFRESH_RATIO}'
+            ret_value += f', S3_LIST_MAX_WORKERS:{self.S3_LIST_MAX_WORKERS}'
+            ret_value += f', AWS_CALL_TRACE_ENABLED:{self.AWS_CALL_TRACE_ENABLED}'
+            ret_value += f', AWS_CLIENT_MAX_POOL_CONNECTIONS:{self.AWS_CLIENT_MAX_POOL_CONNECTIONS}'
+            ret_value += f', AWS_CLIENT_CONNECT_TIMEOUT:{self.AWS_CLIENT_CONNECT_TIMEOUT}'
+            ret_value += f', AWS_CLIENT_READ_TIMEOUT:{self.AWS_CLIENT_READ_TIMEOUT}'
+            ret_value += f', AWS_CLIENT_TCP_KEEPALIVE:{self.AWS_CLIENT_TCP_KEEPALIVE}'
+            ret_value += f', AWS_CLIENT_RETRY_MODE:{self.AWS_CLIENT_RETRY_MODE}'
+            ret_value += f', AWS_CLIENT_MAX_ATTEMPTS:{self.AWS_CLIENT_MAX_ATTEMPTS}'
+            ret_value += f', CATALOG_CACHE_MAX_ITEMS:{self.CATALOG_CACHE_MAX_ITEMS}'
+            ret_value += f', RESPONSE_COMPRESS_MIN_SIZE:{self.RESPONSE_COMPRESS_MIN_SIZE}'
+            ret_value += f', EXPORT_MAX_BYTES:{self.EXPORT_MAX_BYTES}'
+            ret_value += f', EVENT_DEDUPE_CACHE_SIZE:{self.EVENT_DEDUPE_CACHE_SIZE}'
+            ret_value += f', EVENT_DEDUPE_CACHE_TTL:{self.EVENT_DEDUPE_CACHE_TTL}'
+            ret_value += f', EPAPER_CONVERSION_ENABLED:{self.EPAPER_CONVERSION_ENABLED}'
         except Exception as e:
             print(f'{type(e).__name__}! {e}')
         return ret_value
 
+    @classmethod
+    def _find_dotenv_path(cls) -> str | None:
+        """環境変数ファイルのパス取得
+        ※Lambda実行環境ではデプロイパッケージ直下(LAMBDA_TASK_ROOT)のみを対象とし、存在しない場合は読み込まない。
+        それ以外の環境ではpython-dotenvの探索(空文字)に委ねる。
+
+        Returns:
+            str | None: 環境変数ファイルのパス(空文字:python-dotenvの探索に委ねる, None:読み込まない)
+        """
+        TASK_ROOT = os.getenv('LAMBDA_TASK_ROOT', '')
+        if len(TASK_ROOT) <= 0:
+            return ''
+        DOTENV_PATH = os.path.join(TASK_ROOT, '.env')
+        return DOTENV_PATH if os.path.isfile(DOTENV_PATH) else None
+
     @property
     def AWS_REGION(self) -> str:
         """AWSリージョン名 取得
@@ -71,3 +105,220 @@ class cEnvMng:
         except Exception as e:
             print(f'{type(e).__name__}! {e}')
         return dst_value
+
+    @property
+    def SIGNED_URL_CACHE_SIZE(self) -> int:
+        """署名付きURLキャッシュの最大保持件数 取得
+
+        Returns:
+            int: 署名付きURLキャッシュの最大保持件数(0以下:キャッシュしない)
+        """
+        SRC_VALUE = os.getenv('SIGNED_URL_CACHE_SIZE', '4096')
+        dst_value = 4096
+        try:
+            dst_value = dst_value if not SRC_VALUE.isdigit() else int(SRC_VALUE)
+        except Exception as e:
+            print(f'{type(e).__name__}! {e}')
+        return dst_value
+
+    @property
+    def SIGNED_URL_CACHE_REFRESH_RATIO(self) -> float:
+        """署名付きURLを再発行する閾値 取得
+
+        Returns:
+            float: 署名付きURLを再発行する閾値(有効期限に対する経過時間の割合 0.0～1.0)
+        """
+        SRC_VALUE = os.getenv('SIGNED_URL_CACHE_REFRESH_RATIO', '0.5')
+        dst_value = 0.5
+        try:
+            dst_value = float(SRC_VALUE)
+        except Exception as e:
+            print(f'{type(e).__name__}! {e}')
+        return dst_value
+
+    @property
+    def S3_LIST_MAX_WORKERS(self) -> int:
+        """S3内ファイル一覧の並列取得数 取得
+
+        Returns:
+            int: S3内ファイル一覧の並列取得数(1以下:逐次取得)
+        """
+        SRC_VALUE = os.getenv('S3_LIST_MAX_WORKERS', '4')
+        dst_value = 4
+        try:
+            dst_value = dst_value if not SRC_VALUE.isdigit() else int(SRC_VALUE)
+        except Exception as e:
+            print(f'{type(e).__name__}! {e}')
+        return dst_value
+
+    @property
+    def AWS_CALL_TRACE_ENABLED(self) -> bool:
+        """AWS呼び出し計測の有効/無効 取得
+
+        Returns:
+            bool: 有効時はTrue、それ以外はFalse(1:有効, 1以外:無効、未指定時はtemplate.yamlの既定値と同じく有効)
+        """
+        return os.getenv('AWS_CALL_TRACE_ENABLED', '1').strip() == '1'
+
+    @property
+    def AWS_CLIENT_MAX_POOL_CONNECTIONS(self) -> int:
+        """AWSクライアントの接続プールの最大接続数 取得
+
+        Returns:
+            int: AWSクライアントの接続プールの最大接続数
+        """
+        SRC_VALUE = os.getenv('AWS_CLIENT_MAX_POOL_CONNECTIONS', '16')
+        dst_value = 16
+        try:
+            dst_value = dst_value if not SRC_VALUE.isdigit() else int(SRC_VALUE)
+        except Exception as e:
+            print(f'{type(e).__name__}! {e}')
+        return dst_value
+
+    @property
+    def AWS_CLIENT_CONNECT_TIMEOUT(self) -> float:
+        """AWSクライアントの接続タイムアウト 取得
+
+        Returns:
+            float: AWSクライアントの接続タイムアウト(単位:秒)
+        """
+        SRC_VALUE = os.getenv('AWS_CLIENT_CONNECT_TIMEOUT', '3')
+        dst_value = 3.0
+        try:
+            dst_value = float(SRC_VALUE)
+        except Exception as e:
+            print(f'{type(e).__name__}! {e}')
+        return dst_value
+
+    @property
+    def AWS_CLIENT_READ_TIMEOUT(self) -> float:
+        """AWSクライアントの読み込みタイムアウト 取得
+
+        Returns:
+            float: AWSクライアントの読み込みタイムアウト(単位:秒)
+        """
+        SRC_VALUE = os.getenv('AWS_CLIENT_READ_TIMEOUT', '10')
+        dst_value = 10.0
+        try:
+            dst_value = float(SRC_VALUE)
+        except Exception as e:
+            print(f'{type(e).__name__}! {e}')
+        return dst_value
+
+    @property
+    def AWS_CLIENT_TCP_KEEPALIVE(self) -> bool:
+        """AWSクライアントのTCPキープアライブの有効/無効 取得
+
+        Returns:
+            bool: 有効時はTrue、それ以外はFalse(0:無効, 0以外:有効)
+        """
+        return os.getenv('AWS_CLIENT_TCP_KEEPALIVE', '1').strip() != '0'
+
+    @property
+    def AWS_CLIENT_RETRY_MODE(self) -> str:
+        """AWSクライアントのリトライモード 取得
+
+        Returns:
+            str: AWSクライアントのリトライモード("legacy", "standard", "adaptive" ※それ以外の値は"adaptive")
+        """
+        SRC_VALUE = os.getenv('AWS_CLIENT_RETRY_MODE', 'adaptive').strip().lower()
+        return SRC_VALUE if SRC_VALUE in ('legacy', 'standard', 'adaptive') else 'adaptive'
+
+    @property
+    def AWS_CLIENT_MAX_ATTEMPTS(self) -> int:
+        """AWSクライアントの最大試行回数 取得
+
+        Returns:
+            int: AWSクライアントの最大試行回数(初回を含む)
+        """
+        SRC_VALUE = os.getenv('AWS_CLIENT_MAX_ATTEMPTS', '3')
+        dst_value = 3
+        try:
+            dst_value = dst_value if not SRC_VALUE.isdigit() else int(SRC_VALUE)
+        except Exception as e:
+            print(f'{type(e).__name__}! {e}')
+        return dst_value
+
+    @property
+    def CATALOG_CACHE_MAX_ITEMS(self) -> int:
+        """画像カタログキャッシュの最大保持件数 取得
+
+        Returns:
+            int: 画像カタログキャッシュの最大保持件数(0以下:キャッシュしない)
+        """
+        SRC_VALUE = os.getenv('CATALOG_CACHE_MAX_ITEMS', '50000')
+        dst_value = 50000
+        try:
+            dst_value = dst_value if not SRC_VALUE.isdigit() else int(SRC_VALUE)
+        except Exception as e:
+            print(f'{type(e).__name__}! {e}')
+        return dst_value
+
+    @property
+    def RESPONSE_COMPRESS_MIN_SIZE(self) -> int:
+        """API応答を圧縮する最小サイズ 取得
+
+        Returns:
+            int: API応答を圧縮する最小サイズ(単位:byte、応答本文がこのサイズ未満の場合は圧縮しない)
+        """
+        SRC_VALUE = os.getenv('RESPONSE_COMPRESS_MIN_SIZE', '1024')
+        dst_value = 1024
+        try:
+            dst_value = dst_value if not SRC_VALUE.isdigit() else int(SRC_VALUE)
+        except Exception as e:
+            print(f'{type(e).__name__}! {e}')
+        return dst_value
+
+    @property
+    def EXPORT_MAX_BYTES(self) -> int:
+        """画像カタログのエクスポート1回あたりの最大出力サイズ 取得
+
+        Returns:
+            int: 画像カタログのエクスポート1回あたりの最大出力サイズ(単位:byte)
+        """
+        SRC_VALUE = os.getenv('EXPORT_MAX_BYTES', '4194304')
+        dst_value = 4194304
+        try:
+            dst_value = dst_value if not SRC_VALUE.isdigit() else int(SRC_VALUE)
+        except Exception as e:
+            print(f'{type(e).__name__}! {e}')
+        return dst_value
+
+    @property
+    def EVENT_DEDUPE_CACHE_SIZE(self) -> int:
+        """S3イベント重複排除キャッシュの最大保持件数 取得
+
+        Returns:
+            int: S3イベント重複排除キャッシュの最大保持件数(0以下:キャッシュしない)
+        """
+        SRC_VALUE = os.getenv('EVENT_DEDUPE_CACHE_SIZE', '4096')
+        dst_value = 4096
+        try:
+            dst_value = dst_value if not SRC_VALUE.isdigit() else int(SRC_VALUE)
+        except Exception as e:
+            print(f'{type(e).__name__}! {e}')
+        return dst_value
+
+    @property
+    def EVENT_DEDUPE_CACHE_TTL(self) -> float:
+        """S3イベント重複排除キャッシュの保持期間 取得
+
+        Returns:
+            float: S3イベント重複排除キャッシュの保持期間(単位:秒)
+        """
+        SRC_VALUE = os.getenv('EVENT_DEDUPE_CACHE_TTL', '300')
+        dst_value = 300.0
+        try:
+            dst_value = float(SRC_VALUE)
+        except Exception as e:
+            print(f'{type(e).__name__}! {e}')
+        return dst_value
+
+    @property
+    def EPAPER_CONVERSION_ENABLED(self) -> bool:
+        """アップロードされた画像の電子ペーパー向け変換の有効/無効 取得
+
+        Returns:
+            bool: 有効時はTrue、それ以外はFalse(1:有効, 1以外:無効)
+        """
+        return os.getenv('EPAPER_CONVERSION_ENABLED', '1').strip() == '1'
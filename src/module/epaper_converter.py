@@ -0,0 +1,371 @@
+"""7色電子ペーパー向け画像変換処理
+"""
+import io
+import logging
+import struct
+import zlib
+
+from module.logger_wrapper import cLoggerWrapper
+
+# 画像変換は対応モジュールがデプロイパッケージに含まれる場合のみ利用する
+try:
+    import numpy as np
+    from PIL import Image, ImageOps
+except ImportError:
+    np = None
+    Image = None
+    ImageOps = None
+
+class cEpaperConverter:
+    """7色電子ペーパー(5.65inch ACeP 600x448)向け画像変換クラス
+    ※元画像を縦横比を保ったままパネルの解像度へ縮小して余白を白で埋め、7色のパレットへ誤差拡散法(Floyd-Steinberg)で減色する。
+    誤差拡散は左・上の画素の誤差が確定してから処理する必要があるため、同時に処理できる画素(x + 2y が等しい画素)ごとにNumPyでまとめて処理する。
+    変換結果はパレットのインデックスを画素値とするインデックスカラーのPNGと、パネルのフレームバッファ形式(1byteに2画素の色インデックスを格納)で出力する。
+    フレームバッファ形式は無圧縮・RLE(PackBits)・zlibの3形式を出力し、いずれも先頭にヘッダ(幅・高さ・圧縮方式・CRC32)を付与する。
+    """
+
+    FORMAT_PNG:str = 'png'
+    """出力形式名:インデックスカラーのPNG
+    """
+
+    FORMAT_RAW:str = 'raw'
+    """出力形式名:フレームバッファ(無圧縮、ヘッダあり)
+    """
+
+    FORMAT_RLE:str = 'rle'
+    """出力形式名:フレームバッファ(RLE圧縮、ヘッダあり)
+    """
+
+    FORMAT_ZLIB:str = 'zlib'
+    """出力形式名:フレームバッファ(zlib圧縮、ヘッダあり)
+    """
+
+    FRAMEBUFFER_HEADER:struct.Struct = struct.Struct('<4sBBBBHHI')
+    """フレームバッファのヘッダ(16byte、リトルエンディアン)
+    マジックナンバー(4byte:"EPFB"), バージョン(1byte), 圧縮方式(1byte), 1画素あたりのbit数(1byte), 予約(1byte), 幅(2byte), 高さ(2byte), 無圧縮時のCRC32(4byte)
+    """
+
+    FRAMEBUFFER_MAGIC:bytes = b'EPFB'
+    """フレームバッファのマジックナンバー
+    """
+
+    FRAMEBUFFER_VERSION:int = 1
+    """フレームバッファのヘッダのバージョン
+    """
+
+    FRAMEBUFFER_ENCODINGS:dict[str, int] = {FORMAT_RAW:0, FORMAT_RLE:1, FORMAT_ZLIB:2}
+    """出力形式名 → ヘッダの圧縮方式の値
+    """
+
+    PALETTE:tuple[tuple[int, int, int]] = ((0, 0, 0), (255, 255, 255), (0, 255, 0), (0, 0, 255), (255, 0, 0), (255, 255, 0), (255, 128, 0))
+    """パレット(パネルの色インデックス順:黒, 白, 緑, 青, 赤, 黄, 橙)
+    """
+
+    BACKGROUND_INDEX:int = 1
+    """余白の色インデックス(白)
+    """
+
+    def __init__(self, WIDTH:int = 600, HEIGHT:int = 448, LOGGER_WRAPPER:cLoggerWrapper = None) -> None:
+        """7色電子ペーパー向け画像変換クラスのコンストラクタ
+
+        Args:
+            WIDTH (int, optional): 変換後の幅(単位:px). Defaults to 600.
+            HEIGHT (int, optional): 変換後の高さ(単位:px). Defaults to 448.
+            LOGGER_WRAPPER (cLoggerWrapper, optional): ログ出力管理クラスのインスタンス. Defaults to None.
+        """
+        self._width:int = max(1, WIDTH)
+        self._height:int = max(1, HEIGHT)
+        self._logger_wrapper:cLoggerWrapper = LOGGER_WRAPPER
+        self._palette = None if np is None else np.array(self.PALETTE, dtype=np.float32)
+
+    def __str__(self) -> str:
+        """現在のオブジェクトを表す文字列を返す
+
+        Returns:
+            str: 現在のオブジェクトを表す文字列
+        """
+        return f'WIDTH:{self.WIDTH}, HEIGHT:{self.HEIGHT}, ENABLED:{self.ENABLED}'
+
+    @property
+    def ENABLED(self) -> bool:
+        """画像変換の利用可否 取得
+
+        Returns:
+            bool: 利用可能な場合(NumPy・Pillowがデプロイパッケージに含まれる場合)はTrue、それ以外はFalse
+        """
+        return not np is None and not Image is None
+
+    @property
+    def WIDTH(self) -> int:
+        """変換後の幅 取得
+
+        Returns:
+            int: 変換後の幅(単位:px)
+        """
+        return self._width
+
+    @property
+    def HEIGHT(self) -> int:
+        """変換後の高さ 取得
+
+        Returns:
+            int: 変換後の高さ(単位:px)
+        """
+        return self._height
+
+    @property
+    def LOGGER_WRAPPER(self) -> cLoggerWrapper:
+        """ログ出力管理クラスのインスタンス 取得
+
+        Returns:
+            cLoggerWrapper: ログ出力管理クラスのインスタンス
+        """
+        if self._logger_wrapper is None:
+            self._logger_wrapper = cLoggerWrapper()
+        return self._logger_wrapper
+
+    def convert(self, SRC:bytes) -> dict[str, bytes]:
+        """画像ファイルの変換(縮小 → 7色への減色 → 各形式で出力)
+
+        Args:
+            SRC (bytes): 元画像ファイル(JPEG/PNG等、Pillowで読み込める形式)
+
+        Returns:
+            dict[str, bytes]: 出力形式名をキーとした変換後のファイル(png, raw, rle, zlib ※raw/rle/zlibはヘッダ付き、変換できない画像の場合はNone)
+        """
+        if not self.ENABLED or SRC is None:
+            return None
+        try:
+            INDEXES = self.dither(RGB=self.resize(SRC=SRC))
+            RAW = self.pack_framebuffer(INDEXES=INDEXES)
+            return {
+                self.FORMAT_PNG:self.to_png(INDEXES=INDEXES),
+                self.FORMAT_RAW:self.encode_framebuffer(RAW=RAW, WIDTH=INDEXES.shape[1], HEIGHT=INDEXES.shape[0], FORMAT=self.FORMAT_RAW),
+                self.FORMAT_RLE:self.encode_framebuffer(RAW=RAW, WIDTH=INDEXES.shape[1], HEIGHT=INDEXES.shape[0], FORMAT=self.FORMAT_RLE),
+                self.FORMAT_ZLIB:self.encode_framebuffer(RAW=RAW, WIDTH=INDEXES.shape[1], HEIGHT=INDEXES.shape[0], FORMAT=self.FORMAT_ZLIB),
+            }
+        except Exception as e:
+            # 画像として読み込めない・画素数の上限超過等は変換不可として扱う
+            self.LOGGER_WRAPPER.output(MSG=lambda: f'self:<{self}>, len(SRC):{len(SRC)}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+            return None
+
+    def resize(self, SRC:bytes):
+        """画像ファイルを縦横比を保ったまま変換後の解像度へ縮小(余白は白で埋める)
+
+        Args:
+            SRC (bytes): 元画像ファイル
+
+        Returns:
+            _type_: 画素値の配列(numpy.ndarray、shape:(HEIGHT, WIDTH, 3)、dtype:float32)
+        """
+        with Image.open(io.BytesIO(SRC)) as IMAGE:
+            # JPEGは変換後の解像度以上となる範囲で縮小してデコードする(大きな写真のデコード時間・メモリを削減)
+            IMAGE.draft('RGB', (self._width, self._height))
+            # Exifの回転情報を反映し、透過部分は白として扱う
+            SRC_IMAGE = ImageOps.exif_transpose(IMAGE)
+            if SRC_IMAGE.mode in ('RGBA', 'LA', 'P'):
+                SRC_IMAGE = SRC_IMAGE.convert('RGBA')
+                BACKGROUND = Image.new('RGBA', SRC_IMAGE.size, self.PALETTE[self.BACKGROUND_INDEX] + (255,))
+                SRC_IMAGE = Image.alpha_composite(BACKGROUND, SRC_IMAGE)
+            FITTED = ImageOps.contain(SRC_IMAGE.convert('RGB'), (self._width, self._height), method=Image.Resampling.LANCZOS)
+        CANVAS = Image.new('RGB', (self._width, self._height), self.PALETTE[self.BACKGROUND_INDEX])
+        CANVAS.paste(FITTED, ((self._width - FITTED.width) // 2, (self._height - FITTED.height) // 2))
+        return np.asarray(CANVAS, dtype=np.float32)
+
+    def dither(self, RGB):
+        """誤差拡散法(Floyd-Steinberg)で7色のパレットへ減色
+
+        Args:
+            RGB (_type_): 画素値の配列(numpy.ndarray、shape:(高さ, 幅, 3))
+
+        Returns:
+            _type_: 色インデックスの配列(numpy.ndarray、shape:(高さ, 幅)、dtype:uint8)
+        """
+        HEIGHT, WIDTH = RGB.shape[0], RGB.shape[1]
+        PALETTE = self._palette
+        # 誤差の拡散先が範囲外にならないよう、左右に1列・下に1行の余白を持つ作業領域を用意する
+        buffer = np.zeros((HEIGHT + 1, WIDTH + 2, 3), dtype=np.float32)
+        buffer[:HEIGHT, 1:WIDTH + 1] = RGB
+        ret_value = np.empty((HEIGHT, WIDTH), dtype=np.uint8)
+        # 画素(x, y)は左(x-1, y)と上の行(x-1～x+1, y-1)の誤差を受け取るため、x + 2y が等しい画素は互いに依存しない
+        for STEP in range(WIDTH + 2 * (HEIGHT - 1)):
+            YS = np.arange(max(0, (STEP - WIDTH + 2) // 2), min(HEIGHT - 1, STEP // 2) + 1)
+            XS = STEP - 2 * YS
+            OLD = np.clip(buffer[YS, XS + 1], 0.0, 255.0)
+            INDEXES = np.argmin(((OLD[:, None, :] - PALETTE[None, :, :]) ** 2).sum(axis=2), axis=1)
+            ret_value[YS, XS] = INDEXES
+            ERROR = OLD - PALETTE[INDEXES]
+            # 同一の文の中では拡散先が重複しないため、拡散先ごとに加算する
+            buffer[YS, XS + 2] += ERROR * (7 / 16)
+            buffer[YS + 1, XS] += ERROR * (3 / 16)
+            buffer[YS + 1, XS + 1] += ERROR * (5 / 16)
+            buffer[YS + 1, XS + 2] += ERROR * (1 / 16)
+        return ret_value
+
+    def to_png(self, INDEXES) -> bytes:
+        """色インデックスの配列をインデックスカラーのPNGへ変換
+
+        Args:
+            INDEXES (_type_): 色インデックスの配列(numpy.ndarray、shape:(高さ, 幅)、dtype:uint8)
+
+        Returns:
+            bytes: インデックスカラーのPNG
+        """
+        IMAGE = Image.fromarray(INDEXES, mode='P')
+        IMAGE.putpalette([VALUE for COLOR in self.PALETTE for VALUE in COLOR])
+        with io.BytesIO() as OUTPUT:
+            IMAGE.save(OUTPUT, format='PNG', optimize=True)
+            return OUTPUT.getvalue()
+
+    @classmethod
+    def pack_framebuffer(cls, INDEXES) -> bytes:
+        """色インデックスの配列をフレームバッファ形式へ変換
+        ※1byteに2画素(上位4bit:左の画素, 下位4bit:右の画素)を左上から行順に格納する(600x448の場合は134,400byte)。幅が奇数の場合は行末を白で埋める。
+
+        Args:
+            INDEXES (_type_): 色インデックスの配列(numpy.ndarray、shape:(高さ, 幅)、dtype:uint8)
+
+        Returns:
+            bytes: フレームバッファ
+        """
+        if INDEXES.shape[1] % 2 != 0:
+            INDEXES = np.pad(INDEXES, ((0, 0), (0, 1)), constant_values=cls.BACKGROUND_INDEX)
+        return ((INDEXES[:, 0::2] << 4) | INDEXES[:, 1::2]).astype(np.uint8).tobytes()
+
+    @classmethod
+    def unpack_framebuffer(cls, RAW:bytes, WIDTH:int, HEIGHT:int):
+        """フレームバッファ形式を色インデックスの配列へ変換
+
+        Args:
+            RAW (bytes): フレームバッファ
+            WIDTH (int): 幅(単位:px)
+            HEIGHT (int): 高さ(単位:px)
+
+        Returns:
+            _type_: 色インデックスの配列(numpy.ndarray、shape:(高さ, 幅)、dtype:uint8)
+        """
+        PACKED = np.frombuffer(RAW, dtype=np.uint8).reshape(HEIGHT, (WIDTH + 1) // 2)
+        ret_value = np.empty((HEIGHT, PACKED.shape[1] * 2), dtype=np.uint8)
+        ret_value[:, 0::2] = PACKED >> 4
+        ret_value[:, 1::2] = PACKED & 0x0F
+        return ret_value[:, :WIDTH]
+
+    @classmethod
+    def encode_framebuffer(cls, RAW:bytes, WIDTH:int, HEIGHT:int, FORMAT:str) -> bytes:
+        """フレームバッファを圧縮(rawの場合は無圧縮)してヘッダを付与
+
+        Args:
+            RAW (bytes): フレームバッファ
+            WIDTH (int): 幅(単位:px)
+            HEIGHT (int): 高さ(単位:px)
+            FORMAT (str): 出力形式名(raw, rle, zlib)
+
+        Returns:
+            bytes: ヘッダ + フレームバッファ(出力形式に応じて圧縮)
+        """
+        if FORMAT == cls.FORMAT_RLE:
+            PAYLOAD = cls.encode_rle(SRC=RAW)
+        elif FORMAT == cls.FORMAT_ZLIB:
+            PAYLOAD = zlib.compress(RAW, 9)
+        elif FORMAT == cls.FORMAT_RAW:
+            PAYLOAD = RAW
+        else:
+            raise ValueError(f'unknown framebuffer format! FORMAT:{FORMAT}')
+        HEADER = cls.FRAMEBUFFER_HEADER.pack(cls.FRAMEBUFFER_MAGIC, cls.FRAMEBUFFER_VERSION, cls.FRAMEBUFFER_ENCODINGS[FORMAT], 4, 0, WIDTH, HEIGHT, zlib.crc32(RAW))
+        return HEADER + PAYLOAD
+
+    @classmethod
+    def decode_framebuffer(cls, SRC:bytes) -> tuple[bytes, int, int]:
+        """ヘッダ付きのフレームバッファを展開
+
+        Args:
+            SRC (bytes): ヘッダ + フレームバッファ(ヘッダの圧縮方式に応じて圧縮)
+
+        Returns:
+            tuple[bytes, int, int]: [0]:フレームバッファ, [1]:幅(単位:px), [2]:高さ(単位:px) ※ヘッダ・CRC32が不正な場合はValueErrorを送出する
+        """
+        if len(SRC) < cls.FRAMEBUFFER_HEADER.size:
+            raise ValueError(f'framebuffer header is too short! len(SRC):{len(SRC)}')
+        MAGIC, VERSION, ENCODING, BITS_PER_PIXEL, _, WIDTH, HEIGHT, CRC32 = cls.FRAMEBUFFER_HEADER.unpack_from(SRC)
+        if MAGIC != cls.FRAMEBUFFER_MAGIC or VERSION != cls.FRAMEBUFFER_VERSION or BITS_PER_PIXEL != 4:
+            raise ValueError(f'invalid framebuffer header! MAGIC:{MAGIC}, VERSION:{VERSION}, BITS_PER_PIXEL:{BITS_PER_PIXEL}')
+        PAYLOAD = SRC[cls.FRAMEBUFFER_HEADER.size:]
+        if ENCODING == cls.FRAMEBUFFER_ENCODINGS[cls.FORMAT_RLE]:
+            RAW = cls.decode_rle(SRC=PAYLOAD)
+        elif ENCODING == cls.FRAMEBUFFER_ENCODINGS[cls.FORMAT_ZLIB]:
+            RAW = zlib.decompress(PAYLOAD)
+        elif ENCODING == cls.FRAMEBUFFER_ENCODINGS[cls.FORMAT_RAW]:
+            RAW = PAYLOAD
+        else:
+            raise ValueError(f'unknown framebuffer encoding! ENCODING:{ENCODING}')
+        if len(RAW) != (WIDTH + 1) // 2 * HEIGHT or zlib.crc32(RAW) != CRC32:
+            raise ValueError(f'framebuffer is corrupted! len(RAW):{len(RAW)}, WIDTH:{WIDTH}, HEIGHT:{HEIGHT}')
+        return RAW, WIDTH, HEIGHT
+
+    @classmethod
+    def encode_rle(cls, SRC:bytes) -> bytes:
+        """RLE(PackBits)で圧縮
+        ※制御byte n が0～127の場合は後続のn+1byteをそのまま、129～255の場合は後続の1byteを257-n回繰り返す(128は使用しない)。
+        3byte以上連続する値を繰り返しとして圧縮し、それ以外はまとめてそのまま格納する。
+
+        Args:
+            SRC (bytes): 圧縮前のデータ
+
+        Returns:
+            bytes: 圧縮後のデータ
+        """
+        DATA = np.frombuffer(SRC, dtype=np.uint8)
+        if len(DATA) <= 0:
+            return b''
+        # 値が変わる位置から、連続する値(ラン)の開始位置と長さを求める
+        STARTS = np.concatenate(([0], np.flatnonzero(DATA[1:] != DATA[:-1]) + 1))
+        LENGTHS = np.diff(np.append(STARTS, len(DATA)))
+        ret_value = bytearray()
+        literal_start = -1
+        def _flush_literal(END:int) -> None:
+            for START in range(literal_start, END, 128):
+                CHUNK = SRC[START:min(START + 128, END)]
+                ret_value.append(len(CHUNK) - 1)
+                ret_value.extend(CHUNK)
+        for START, LENGTH in zip(STARTS.tolist(), LENGTHS.tolist()):
+            if LENGTH < 3:
+                if literal_start < 0: literal_start = START
+                continue
+            if literal_start >= 0:
+                _flush_literal(END=START)
+                literal_start = -1
+            VALUE = SRC[START]
+            for COUNT in [128] * (LENGTH // 128) + [LENGTH % 128]:
+                if COUNT >= 2:
+                    ret_value.append(257 - COUNT)
+                    ret_value.append(VALUE)
+                elif COUNT == 1:
+                    ret_value.append(0)
+                    ret_value.append(VALUE)
+        if literal_start >= 0:
+            _flush_literal(END=len(SRC))
+        return bytes(ret_value)
+
+    @classmethod
+    def decode_rle(cls, SRC:bytes) -> bytes:
+        """RLE(PackBits)で圧縮したデータを展開
+
+        Args:
+            SRC (bytes): 圧縮後のデータ
+
+        Returns:
+            bytes: 展開したデータ
+        """
+        ret_value = bytearray()
+        index = 0
+        while index < len(SRC):
+            CONTROL = SRC[index]
+            if CONTROL < 128:
+                ret_value.extend(SRC[index + 1:index + 2 + CONTROL])
+                index += 2 + CONTROL
+            elif CONTROL > 128:
+                ret_value.extend(SRC[index + 1:index + 2] * (257 - CONTROL))
+                index += 2
+            else:
+                index += 1
+        return bytes(ret_value)
@@ -0,0 +1,158 @@
+"""S3イベント重複排除キャッシュ管理クラス定義
+"""
+from collections import OrderedDict
+from threading import Lock
+
+import time
+
+class cEventDedupeCache:
+    """S3イベント重複排除キャッシュ管理クラス
+    ※(オブジェクトキー, シーケンサー)をキーとした、保持期間付きのLRUキャッシュ。
+    S3イベントは少なくとも1回配信(重複配信あり)のため、Lambdaコンテナ内で反映済みのイベントを保持し、再配信時のDB書き込みを省く。
+    あわせて、オブジェクトキーごとに反映済みの削除イベントのシーケンサーを保持し、削除より前の追加イベントが遅れて届いた場合の再登録を防ぐ。
+    """
+
+    def __init__(self, MAX_SIZE:int = 4096, TTL:float = 300.0) -> None:
+        """S3イベント重複排除キャッシュ管理クラスのコンストラクタ
+
+        Args:
+            MAX_SIZE (int, optional): 最大保持件数(0以下の場合はキャッシュしない). Defaults to 4096.
+            TTL (float, optional): 保持期間(単位:秒). Defaults to 300.0.
+        """
+        self._max_size:int = max(0, MAX_SIZE)
+        self._ttl:float = max(0.0, TTL)
+        self._entries:OrderedDict[tuple[str, str], float] = OrderedDict()
+        # オブジェクトキー → (削除イベントのシーケンサー, 登録日時)
+        self._removed_entries:OrderedDict[str, tuple[str, float]] = OrderedDict()
+        self._lock:Lock = Lock()
+        self._hit_count:int = 0
+        self._miss_count:int = 0
+
+    def __str__(self) -> str:
+        """現在のオブジェクトを表す文字列を返す
+
+        Returns:
+            str: 現在のオブジェクトを表す文字列
+        """
+        return f'MAX_SIZE:{self.MAX_SIZE}, TTL:{self.TTL}, SIZE:{len(self._entries)}, HIT_COUNT:{self.HIT_COUNT}, MISS_COUNT:{self.MISS_COUNT}'
+
+    @property
+    def MAX_SIZE(self) -> int:
+        """最大保持件数 取得
+
+        Returns:
+            int: 最大保持件数
+        """
+        return self._max_size
+
+    @property
+    def TTL(self) -> float:
+        """保持期間 取得
+
+        Returns:
+            float: 保持期間(単位:秒)
+        """
+        return self._ttl
+
+    @property
+    def HIT_COUNT(self) -> int:
+        """キャッシュヒット数(重複イベント数) 取得
+
+        Returns:
+            int: キャッシュヒット数
+        """
+        return self._hit_count
+
+    @property
+    def MISS_COUNT(self) -> int:
+        """キャッシュミス数 取得
+
+        Returns:
+            int: キャッシュミス数
+        """
+        return self._miss_count
+
+    def contains(self, OBJECT_KEY:str, SEQUENCER:str) -> bool:
+        """反映済みイベントの判定
+
+        Args:
+            OBJECT_KEY (str): オブジェクトキー(ファイル名)
+            SEQUENCER (str): S3イベントのシーケンサー
+
+        Returns:
+            bool: 保持期間内に反映済みの場合はTrue、それ以外はFalse
+        """
+        KEY = (OBJECT_KEY, SEQUENCER)
+        with self._lock:
+            REGISTERED_AT = self._entries.get(KEY, None)
+            if REGISTERED_AT is not None and time.time() - REGISTERED_AT < self._ttl:
+                self._entries.move_to_end(KEY)
+                self._hit_count += 1
+                return True
+            if REGISTERED_AT is not None:
+                # 保持期間超過のため破棄
+                del self._entries[KEY]
+            self._miss_count += 1
+        return False
+
+    def put(self, OBJECT_KEY:str, SEQUENCER:str) -> None:
+        """反映済みイベントの登録
+
+        Args:
+            OBJECT_KEY (str): オブジェクトキー(ファイル名)
+            SEQUENCER (str): S3イベントのシーケンサー
+        """
+        if self._max_size <= 0 or not OBJECT_KEY or not SEQUENCER:
+            return
+        KEY = (OBJECT_KEY, SEQUENCER)
+        with self._lock:
+            self._entries[KEY] = time.time()
+            self._entries.move_to_end(KEY)
+            # 最大保持件数を超えた分は最も古く参照されたものから破棄
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def get_removed_sequencer(self, OBJECT_KEY:str) -> str:
+        """反映済みの削除イベントのシーケンサー取得
+
+        Args:
+            OBJECT_KEY (str): オブジェクトキー(ファイル名)
+
+        Returns:
+            str: 保持期間内に反映済みの削除イベントのシーケンサー(未登録の場合は空文字)
+        """
+        with self._lock:
+            ENTRY = self._removed_entries.get(OBJECT_KEY, None)
+            if ENTRY is not None and time.time() - ENTRY[1] < self._ttl:
+                return ENTRY[0]
+            if ENTRY is not None:
+                # 保持期間超過のため破棄
+                del self._removed_entries[OBJECT_KEY]
+        return ''
+
+    def put_removed(self, OBJECT_KEY:str, SEQUENCER:str) -> None:
+        """反映済みの削除イベントの登録(登録済みのシーケンサーより新しい場合のみ更新)
+
+        Args:
+            OBJECT_KEY (str): オブジェクトキー(ファイル名)
+            SEQUENCER (str): 正規化済みの削除イベントのシーケンサー
+        """
+        if self._max_size <= 0 or not OBJECT_KEY or not SEQUENCER:
+            return
+        with self._lock:
+            ENTRY = self._removed_entries.get(OBJECT_KEY, None)
+            if ENTRY is None or ENTRY[0] < SEQUENCER:
+                self._removed_entries[OBJECT_KEY] = (SEQUENCER, time.time())
+            self._removed_entries.move_to_end(OBJECT_KEY)
+            # 最大保持件数を超えた分は最も古く参照されたものから破棄
+            while len(self._removed_entries) > self._max_size:
+                self._removed_entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """全イベントの破棄およびヒット/ミス数のリセット
+        """
+        with self._lock:
+            self._entries.clear()
+            self._removed_entries.clear()
+            self._hit_count = 0
+            self._miss_count = 0
@@ -0,0 +1,169 @@
+"""画像レコード定義
+"""
+from contextlib import contextmanager
+from collections.abc import Iterator
+from threading import local
+
+import json
+
+from module.common_func import cCommonFunc, eImageConvertibleKind
+
+class cImageRecord:
+    """画像レコード(画像IDと画像URL管理テーブルの1アイテム)
+    ※全件を保持するため__slots__で属性を固定し、dictより少ないメモリで保持する。
+    """
+
+    __slots__ = ('id', 'url', 'last_modified', 'convertible')
+
+    def __init__(self, id:str = '', url:str = '', last_modified:str = '', convertible:int = eImageConvertibleKind.UNDETERMINED.value) -> None:
+        """画像レコードのコンストラクタ
+
+        Args:
+            id (str, optional): 画像ID. Defaults to ''.
+            url (str, optional): 画像URL(S3ファイルパス). Defaults to ''.
+            last_modified (str, optional): 最終更新日時. Defaults to ''.
+            convertible (int, optional): 画像変換状態の値. Defaults to eImageConvertibleKind.UNDETERMINED.value.
+        """
+        self.id:str = id
+        self.url:str = url
+        self.last_modified:str = last_modified
+        self.convertible:int = convertible
+
+    def __repr__(self) -> str:
+        """現在のオブジェクトを表す文字列を返す
+
+        Returns:
+            str: 現在のオブジェクトを表す文字列
+        """
+        return f'cImageRecord(id={self.id!r}, url={self.url!r}, last_modified={self.last_modified!r}, convertible={self.convertible!r})'
+
+    def __eq__(self, OTHER:object) -> bool:
+        """属性値の比較
+
+        Args:
+            OTHER (object): 比較対象
+
+        Returns:
+            bool: 全属性値が一致する場合はTrue、それ以外はFalse
+        """
+        return isinstance(OTHER, cImageRecord) and (self.id, self.url, self.last_modified, self.convertible) == (OTHER.id, OTHER.url, OTHER.last_modified, OTHER.convertible)
+
+    @classmethod
+    def from_wire(cls, ITEM:dict[str, dict[str, str]]) -> 'cImageRecord':
+        """DynamoDB JSON形式のアイテムから生成
+
+        Args:
+            ITEM (dict[str, dict[str, str]]): DynamoDB JSON形式のアイテム(ex:{'id':{'S':'abcd...'}, 'convertible':{'N':'1'}, ...})
+
+        Returns:
+            cImageRecord: 画像レコード
+        """
+        ID = ITEM.get(cCommonFunc.API_RESP_DICT_KEY_ID, None)
+        URL = ITEM.get(cCommonFunc.API_RESP_DICT_KEY_URL, None)
+        LAST_MODIFIED = ITEM.get(cCommonFunc.API_RESP_DICT_KEY_LAST_MODIFIED, None)
+        CONVERTIBLE = ITEM.get(cCommonFunc.API_RESP_DICT_KEY_CONVERTIBLE, None)
+        return cls(
+            '' if ID is None else ID.get('S', ''),
+            '' if URL is None else URL.get('S', ''),
+            '' if LAST_MODIFIED is None else LAST_MODIFIED.get('S', ''),
+            eImageConvertibleKind.UNDETERMINED.value if CONVERTIBLE is None or not 'N' in CONVERTIBLE else int(CONVERTIBLE['N']),
+        )
+
+    @classmethod
+    def from_item(cls, ITEM:dict[str, str|int]) -> 'cImageRecord':
+        """Pythonの値のアイテム(DynamoDBリソースの入出力形式)から生成
+
+        Args:
+            ITEM (dict[str, str|int]): アイテム(ex:{'id':'abcd...', 'convertible':1, ...})
+
+        Returns:
+            cImageRecord: 画像レコード
+        """
+        return cls(
+            ITEM.get(cCommonFunc.API_RESP_DICT_KEY_ID, ''),
+            ITEM.get(cCommonFunc.API_RESP_DICT_KEY_URL, ''),
+            ITEM.get(cCommonFunc.API_RESP_DICT_KEY_LAST_MODIFIED, ''),
+            int(ITEM.get(cCommonFunc.API_RESP_DICT_KEY_CONVERTIBLE, eImageConvertibleKind.UNDETERMINED.value)),
+        )
+
+    def to_item(self) -> dict[str, str|int]:
+        """Pythonの値のアイテム(DynamoDBリソースの入出力形式)へ変換
+
+        Returns:
+            dict[str, str|int]: アイテム
+        """
+        return {cCommonFunc.API_RESP_DICT_KEY_ID:self.id, cCommonFunc.API_RESP_DICT_KEY_URL:self.url, cCommonFunc.API_RESP_DICT_KEY_LAST_MODIFIED:self.last_modified, cCommonFunc.API_RESP_DICT_KEY_CONVERTIBLE:self.convertible}
+
+class cImageRecordDecoder:
+    """画像レコードの高速デコードクラス
+    ※DynamoDBクライアントのScan応答を、botocoreの応答パーサ(モデル定義に沿った属性値ごとの変換)およびboto3の属性値変換を経由せず、
+    応答本文(DynamoDB JSON)から直接画像レコードへ変換する。
+    decoding()のwith文内で発行したScanのみを対象とし、変換結果は応答の"Records"キーに設定する(応答の"Items"キーは空となる)。
+    """
+
+    RESPONSE_KEY_RECORDS:str = 'Records'
+    """画像レコードリストを設定する応答のキー名
+    """
+
+    def __init__(self) -> None:
+        """画像レコードの高速デコードクラスのコンストラクタ
+        """
+        self._attached_ids:set[int] = set()
+        # デコード対象の判定はスレッド単位(botocoreの応答処理は呼び出し元スレッドで行われる)
+        self._state:local = local()
+
+    def __str__(self) -> str:
+        """現在のオブジェクトを表す文字列を返す
+
+        Returns:
+            str: 現在のオブジェクトを表す文字列
+        """
+        return f'len(ATTACHED):{len(self._attached_ids)}, IS_DECODING:{self.IS_DECODING}'
+
+    @property
+    def IS_DECODING(self) -> bool:
+        """現在のスレッドがデコード対象か 取得
+
+        Returns:
+            bool: デコード対象の場合はTrue、それ以外はFalse
+        """
+        return getattr(self._state, 'depth', 0) > 0
+
+    def attach(self, CLIENT) -> None:
+        """DynamoDBクライアントへのデコード処理登録(同一クライアントへの重複登録は行わない)
+
+        Args:
+            CLIENT (_type_): DynamoDBクライアントのインスタンス
+        """
+        if CLIENT is None or id(CLIENT) in self._attached_ids:
+            return
+        self._attached_ids.add(id(CLIENT))
+        CLIENT.meta.events.register('before-parse.dynamodb.Scan', self._on_before_parse)
+
+    @contextmanager
+    def decoding(self) -> Iterator[None]:
+        """with文内で発行したScan応答を画像レコードへデコード
+        """
+        self._state.depth = getattr(self._state, 'depth', 0) + 1
+        try:
+            yield
+        finally:
+            self._state.depth -= 1
+
+    def _on_before_parse(self, response_dict:dict, customized_response_dict:dict, **kwargs) -> None:
+        """応答解析前フック(Itemsを画像レコードへ変換し、残りの本文のみを通常の解析対象とする)
+
+        Args:
+            response_dict (dict): botocoreのHTTP応答dict
+            customized_response_dict (dict): 解析結果へ追加する値のdict
+        """
+        if not self.IS_DECODING or response_dict.get('status_code', 0) != 200:
+            return
+        try:
+            BODY:dict = json.loads(response_dict.get('body', b'') or b'{}')
+            FROM_WIRE = cImageRecord.from_wire
+            customized_response_dict[self.RESPONSE_KEY_RECORDS] = [FROM_WIRE(ITEM) for ITEM in BODY.pop('Items', [])]
+            response_dict['body'] = json.dumps(BODY, separators=(',', ':')).encode('utf-8')
+        except Exception:
+            # 解析できない場合は通常の解析に委ねる
+            customized_response_dict.pop(self.RESPONSE_KEY_RECORDS, None)
@@ -1,11 +1,11 @@
 """ログ出力管理クラス定義
 """
+from collections.abc import Callable
 from datetime import datetime
 from logging import getLogger, Logger
 from os.path import abspath
 
 import logging
-import inspect
 import sys
 
 class cLoggerWrapper:
@@ -22,13 +22,26 @@ class cLoggerWrapper:
         self._logger.setLevel(LEVEL)
         self._level:int = LEVEL
 
-    def output(self, MSG:str, PREFIX:str = '', LEVEL:int = logging.DEBUG) -> bool:
+    def is_enabled(self, LEVEL:int = logging.DEBUG) -> bool:
+        """指定したログ出力レベルが出力対象か
+
+        Args:
+            LEVEL (int, optional): ログ出力レベル. Defaults to logging.DEBUG.
+
+        Returns:
+            bool: 出力対象の場合はTrue、それ以外はFalse
+        """
+        return LEVEL >= self._level and self._logger.isEnabledFor(LEVEL)
+
+    def output(self, MSG:str|Callable[[], str], PREFIX:str = '', LEVEL:int = logging.DEBUG) -> bool:
         """ログの出力
         出力形式:
         現在時刻 ファイルパス(行番号) 【関数名PREFIX】 MSG
+        ※出力レベルの判定を最初に行い、出力対象外の場合は呼び出し元情報の取得・メッセージ生成を行わない。
+        MSGに関数(ex:lambda: f'...')を指定した場合は、出力対象の場合のみ呼び出してメッセージを生成する。
 
         Args:
-            MSG (str): 出力内容
+            MSG (str|Callable[[], str]): 出力内容 または 出力内容を返す関数
             PREFIX (str, optional): 接頭辞. Defaults to ''.
             LEVEL (int, optional): ログ出力レベル. Defaults to logging.DEBUG.
 
@@ -36,24 +49,26 @@ class cLoggerWrapper:
             bool: 成功時はTrue、それ以外はFalse
         """
         ret_value:bool = True
+        if LEVEL < self._level or not self._logger.isEnabledFor(LEVEL):
+            return ret_value
         try:
+            # 呼び出し元(1つ上のフレーム)の情報を取得
+            FRAME = sys._getframe(1)
+            FILE_PATH:str = abspath(FRAME.f_code.co_filename)
+            LINE_NO:int = FRAME.f_lineno
+            FUNC_NAME:str = FRAME.f_code.co_name
             NOW:str = datetime.now().strftime("%Y/%m/%d %H:%M:%S.%f")[:-3]
-            FRAME = inspect.stack()[1]
-            FILE_PATH:str = abspath(FRAME.filename)
-            LINE_NO:int = FRAME.lineno
-            FUNC_NAME:str = FRAME.function
-            DST_MSG:str = f'{NOW}\t{FILE_PATH}({LINE_NO})\t【{FUNC_NAME}{PREFIX}】\t{MSG}' if LEVEL >= self._level else ''
-            if len(DST_MSG) > 0:
-                if LEVEL >= logging.CRITICAL:
-                    self._logger.critical(DST_MSG)
-                elif LEVEL >= logging.ERROR:
-                    self._logger.error(DST_MSG)
-                elif LEVEL >= logging.WARN:
-                    self._logger.warn(DST_MSG)
-                elif LEVEL >= logging.INFO:
-                    self._logger.info(DST_MSG)
-                else:
-                    self._logger.debug(DST_MSG)
+            DST_MSG:str = f'{NOW}\t{FILE_PATH}({LINE_NO})\t【{FUNC_NAME}{PREFIX}】\t{MSG() if callable(MSG) else MSG}'
+            if LEVEL >= logging.CRITICAL:
+                self._logger.critical(DST_MSG)
+            elif LEVEL >= logging.ERROR:
+                self._logger.error(DST_MSG)
+            elif LEVEL >= logging.WARN:
+                self._logger.warning(DST_MSG)
+            elif LEVEL >= logging.INFO:
+                self._logger.info(DST_MSG)
+            else:
+                self._logger.debug(DST_MSG)
         except Exception as e:
             ret_value = False
             print(f'MSG:{MSG}, PREFIX:{PREFIX}, LEVEL:{LEVEL}, {type(e).__name__}! {e}')
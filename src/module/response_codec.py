@@ -0,0 +1,285 @@
+"""API応答の直列化・圧縮処理
+"""
+from aws_lambda_powertools.shared.json_encoder import Encoder
+
+import base64
+import decimal
+import gzip
+import json
+import logging
+
+from module.logger_wrapper import cLoggerWrapper
+
+# 高速な直列化・brotli圧縮はrequirements.txtでデプロイするモジュールを利用し、未インストールの環境(ローカル実行等)ではjson・gzipのみで処理する
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+class cResponseCodec:
+    """API応答の直列化・圧縮クラス
+    ※応答内容dictをJSON文字列へ直列化し(orjsonが利用可能な場合はorjson)、
+    リクエストヘッダ"Accept-Encoding"で受け入れ可能な圧縮方式(br, gzip)のうち、サーバーの優先順で最初のものを使って応答本文を圧縮する。
+    """
+
+    ENCODING_BR:str = 'br'
+    """圧縮方式名:brotli
+    """
+
+    ENCODING_GZIP:str = 'gzip'
+    """圧縮方式名:gzip
+    """
+
+    ENCODING_IDENTITY:str = 'identity'
+    """圧縮方式名:無圧縮
+    """
+
+    def __init__(self, MIN_SIZE:int = 1024, GZIP_LEVEL:int = 6, BROTLI_QUALITY:int = 5, LOGGER_WRAPPER:cLoggerWrapper = None) -> None:
+        """API応答の直列化・圧縮クラスのコンストラクタ
+
+        Args:
+            MIN_SIZE (int, optional): 圧縮する応答本文の最小サイズ(単位:byte、未満の場合は圧縮しない). Defaults to 1024.
+            GZIP_LEVEL (int, optional): gzipの圧縮レベル(1～9). Defaults to 6.
+            BROTLI_QUALITY (int, optional): brotliの圧縮品質(0～11). Defaults to 5.
+            LOGGER_WRAPPER (cLoggerWrapper, optional): ログ出力管理クラスのインスタンス. Defaults to None.
+        """
+        self._min_size:int = max(0, MIN_SIZE)
+        self._gzip_level:int = min(max(1, GZIP_LEVEL), 9)
+        self._brotli_quality:int = min(max(0, BROTLI_QUALITY), 11)
+        self._logger_wrapper:cLoggerWrapper = LOGGER_WRAPPER
+        self._json_encoder:json.JSONEncoder = Encoder(separators=(',', ':'))
+
+    def __str__(self) -> str:
+        """現在のオブジェクトを表す文字列を返す
+
+        Returns:
+            str: 現在のオブジェクトを表す文字列
+        """
+        return f'MIN_SIZE:{self.MIN_SIZE}, GZIP_LEVEL:{self._gzip_level}, BROTLI_QUALITY:{self._brotli_quality}, SERIALIZER_NAME:{self.SERIALIZER_NAME}, ENCODINGS:{self.ENCODINGS}'
+
+    @property
+    def MIN_SIZE(self) -> int:
+        """圧縮する応答本文の最小サイズ 取得
+
+        Returns:
+            int: 圧縮する応答本文の最小サイズ(単位:byte)
+        """
+        return self._min_size
+
+    @property
+    def SERIALIZER_NAME(self) -> str:
+        """利用する直列化モジュール名 取得
+
+        Returns:
+            str: 利用する直列化モジュール名("orjson", "json")
+        """
+        return 'json' if orjson is None else 'orjson'
+
+    @property
+    def ENCODINGS(self) -> tuple[str]:
+        """利用可能な圧縮方式 取得
+
+        Returns:
+            tuple[str]: 利用可能な圧縮方式(サーバーの優先順)
+        """
+        return (self.ENCODING_GZIP,) if brotli is None else (self.ENCODING_BR, self.ENCODING_GZIP)
+
+    @property
+    def LOGGER_WRAPPER(self) -> cLoggerWrapper:
+        """ログ出力管理クラスのインスタンス 取得
+
+        Returns:
+            cLoggerWrapper: ログ出力管理クラスのインスタンス
+        """
+        if self._logger_wrapper is None:
+            self._logger_wrapper = cLoggerWrapper()
+        return self._logger_wrapper
+
+    def serialize(self, DATA:dict) -> str:
+        """応答内容dictの直列化(APIGatewayRestResolverのserializer)
+
+        Args:
+            DATA (dict): 応答内容dict
+
+        Returns:
+            str: JSON文字列
+        """
+        if orjson is None:
+            return self._json_encoder.encode(DATA)
+        return orjson.dumps(DATA, default=self._orjson_default).decode('utf-8')
+
+    @classmethod
+    def _orjson_default(cls, OBJ:object) -> object:
+        """orjsonが直列化できない値の変換(既定の直列化処理と同じくDecimalは文字列として出力する)
+
+        Args:
+            OBJ (object): 直列化できない値
+
+        Returns:
+            object: 直列化可能な値
+        """
+        if isinstance(OBJ, decimal.Decimal):
+            return str(OBJ)
+        raise TypeError(f'Type is not JSON serializable: {type(OBJ).__name__}')
+
+    def select_encoding(self, ACCEPT_ENCODING:str) -> str:
+        """リクエストヘッダ"Accept-Encoding"から応答の圧縮方式を選択
+
+        Args:
+            ACCEPT_ENCODING (str): リクエストヘッダ"Accept-Encoding"の値(ex:"gzip, deflate, br;q=0.8")
+
+        Returns:
+            str: 圧縮方式名(受け入れ可能な圧縮方式がない場合は"identity")
+        """
+        QUALITIES:dict[str, float] = {}
+        for VALUE in (ACCEPT_ENCODING or '').split(','):
+            PARAMS = [PARAM.strip() for PARAM in VALUE.split(';')]
+            NAME = PARAMS[0].lower()
+            if len(NAME) <= 0:
+                continue
+            quality = 1.0
+            for PARAM in PARAMS[1:]:
+                if PARAM.lower().startswith('q='):
+                    try:
+                        quality = float(PARAM[2:])
+                    except ValueError:
+                        quality = 0.0
+            QUALITIES[NAME] = quality
+        WILDCARD_QUALITY = QUALITIES.get('*', 0.0)
+        ret_value = self.ENCODING_IDENTITY
+        best_quality = 0.0
+        for ENCODING in self.ENCODINGS:
+            QUALITY = QUALITIES.get(ENCODING, WILDCARD_QUALITY)
+            if QUALITY > best_quality:
+                ret_value = ENCODING
+                best_quality = QUALITY
+        return ret_value
+
+    def compress_response(self, RESPONSE:dict, ACCEPT_ENCODING:str) -> dict:
+        """Lambdaプロキシ統合の応答dictの本文圧縮
+        ※本文が最小サイズ未満・Base64エンコード済み(バイナリ)・Content-Encoding設定済みの場合は圧縮しない。
+
+        Args:
+            RESPONSE (dict): Lambdaプロキシ統合の応答dict(APIGatewayRestResolver.resolveの戻り値)
+            ACCEPT_ENCODING (str): リクエストヘッダ"Accept-Encoding"の値
+
+        Returns:
+            dict: 応答dict(圧縮時は本文をBase64エンコードし、ヘッダ"Content-Encoding"を設定する)
+        """
+        BODY = RESPONSE.get('body', None)
+        if not isinstance(BODY, str) or RESPONSE.get('isBase64Encoded', False) or not self._get_header(RESPONSE=RESPONSE, NAME='Content-Encoding') is None:
+            return RESPONSE
+        RAW_BODY = BODY.encode('utf-8')
+        if len(RAW_BODY) < max(1, self._min_size):
+            return RESPONSE
+        # 圧縮方式によって応答が変わるため、キャッシュに対してAccept-Encodingごとの応答であることを示す
+        self._set_header(RESPONSE=RESPONSE, NAME='Vary', VALUE='Accept-Encoding')
+        ENCODING = self.select_encoding(ACCEPT_ENCODING=ACCEPT_ENCODING)
+        try:
+            if ENCODING == self.ENCODING_BR:
+                COMPRESSED = brotli.compress(RAW_BODY, quality=self._brotli_quality)
+            elif ENCODING == self.ENCODING_GZIP:
+                COMPRESSED = gzip.compress(RAW_BODY, compresslevel=self._gzip_level, mtime=0)
+            else:
+                return RESPONSE
+        except Exception as e:
+            self.LOGGER_WRAPPER.output(MSG=lambda: f'ENCODING:{ENCODING}, len(BODY):{len(RAW_BODY)}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+            return RESPONSE
+        RESPONSE['body'] = base64.b64encode(COMPRESSED).decode('ascii')
+        RESPONSE['isBase64Encoded'] = True
+        self._set_header(RESPONSE=RESPONSE, NAME='Content-Encoding', VALUE=ENCODING)
+        # 圧縮方式ごとに本文が異なるため、ETagにも圧縮方式を付与して無圧縮の応答と区別する
+        ETAG = self._get_header(RESPONSE=RESPONSE, NAME='ETag')
+        if not ETAG is None: self._set_header(RESPONSE=RESPONSE, NAME='ETag', VALUE=self.add_etag_encoding(ETAG=ETAG, ENCODING=ENCODING))
+        return RESPONSE
+
+    @classmethod
+    def add_etag_encoding(cls, ETAG:str, ENCODING:str) -> str:
+        """ETagへの圧縮方式の付与(ex:"abcd" → "abcd-gzip")
+
+        Args:
+            ETAG (str): ETag(ダブルクォートで囲んだ文字列、弱いETagの場合は"W/"付き)
+            ENCODING (str): 圧縮方式名
+
+        Returns:
+            str: 圧縮方式を付与したETag
+        """
+        return f'{ETAG[:-1]}-{ENCODING}"' if ETAG.endswith('"') else f'{ETAG}-{ENCODING}'
+
+    @classmethod
+    def remove_etag_encoding(cls, IF_NONE_MATCH:str) -> str:
+        """リクエストヘッダ"If-None-Match"の各ETagから圧縮方式を除去(ex:"abcd-gzip" → "abcd")
+        ※圧縮した応答のETagを、圧縮前のETagと比較できるようにする
+
+        Args:
+            IF_NONE_MATCH (str): リクエストヘッダ"If-None-Match"の値(カンマ区切りの複数指定)
+
+        Returns:
+            str: 圧縮方式を除去した"If-None-Match"の値
+        """
+        if not IF_NONE_MATCH:
+            return IF_NONE_MATCH
+        TAGS:list[str] = []
+        for TAG in IF_NONE_MATCH.split(','):
+            TAG = TAG.strip()
+            for ENCODING in (cls.ENCODING_BR, cls.ENCODING_GZIP):
+                SUFFIX = f'-{ENCODING}"' if TAG.endswith('"') else f'-{ENCODING}'
+                if TAG.endswith(SUFFIX):
+                    TAG = f'{TAG[:-len(SUFFIX)]}"' if TAG.endswith('"') else TAG[:-len(SUFFIX)]
+                    break
+            TAGS.append(TAG)
+        return ', '.join(TAGS)
+
+    @classmethod
+    def _get_header(cls, RESPONSE:dict, NAME:str) -> str:
+        """応答dictのヘッダ値取得(ヘッダ名の大文字・小文字は区別しない)
+
+        Args:
+            RESPONSE (dict): Lambdaプロキシ統合の応答dict
+            NAME (str): ヘッダ名
+
+        Returns:
+            str: ヘッダ値(未設定の場合はNone)
+        """
+        LOWER_NAME = NAME.lower()
+        for KEY in ('multiValueHeaders', 'headers'):
+            for HEADER_NAME, VALUE in (RESPONSE.get(KEY, None) or {}).items():
+                if HEADER_NAME.lower() == LOWER_NAME:
+                    return ','.join(VALUE) if isinstance(VALUE, list) else VALUE
+        return None
+
+    @classmethod
+    def _set_header(cls, RESPONSE:dict, NAME:str, VALUE:str) -> None:
+        """応答dictへのヘッダ値設定(応答dictのヘッダ形式に合わせて設定する)
+
+        Args:
+            RESPONSE (dict): Lambdaプロキシ統合の応答dict
+            NAME (str): ヘッダ名
+            VALUE (str): ヘッダ値
+        """
+        if 'multiValueHeaders' in RESPONSE:
+            RESPONSE['multiValueHeaders'] = RESPONSE['multiValueHeaders'] or {}
+            RESPONSE['multiValueHeaders'][NAME] = [VALUE]
+        else:
+            RESPONSE['headers'] = RESPONSE.get('headers', None) or {}
+            RESPONSE['headers'][NAME] = VALUE
+
+    @classmethod
+    def get_accept_encoding(cls, EVENT:dict) -> str:
+        """Lambdaプロキシ統合のイベントからリクエストヘッダ"Accept-Encoding"の値を取得
+
+        Args:
+            EVENT (dict): Lambdaプロキシ統合のイベント
+
+        Returns:
+            str: リクエストヘッダ"Accept-Encoding"の値(未指定の場合は空文字)
+        """
+        for KEY in ('multiValueHeaders', 'headers'):
+            for HEADER_NAME, VALUE in (EVENT.get(KEY, None) or {}).items():
+                if HEADER_NAME.lower() == 'accept-encoding':
+                    return ','.join(VALUE) if isinstance(VALUE, list) else (VALUE or '')
+        return ''
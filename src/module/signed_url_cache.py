@@ -0,0 +1,137 @@
+"""署名付きURLキャッシュ管理クラス定義
+"""
+from collections import OrderedDict
+from threading import Lock
+
+import time
+
+class cSignedUrlCache:
+    """署名付きURLキャッシュ管理クラス
+    ※(APIメソッド, オブジェクトキー, 有効期限)をキーとしたLRUキャッシュ。
+    有効期限に対する経過時間の割合が更新閾値を超えたURLは、期限切れ前でも再発行対象(ミス扱い)とする。
+    """
+
+    def __init__(self, MAX_SIZE:int = 4096, REFRESH_RATIO:float = 0.5) -> None:
+        """署名付きURLキャッシュ管理クラスのコンストラクタ
+
+        Args:
+            MAX_SIZE (int, optional): 最大保持件数(0以下の場合はキャッシュしない). Defaults to 4096.
+            REFRESH_RATIO (float, optional): 再発行閾値(有効期限に対する経過時間の割合 0.0～1.0). Defaults to 0.5.
+        """
+        self._max_size:int = max(0, MAX_SIZE)
+        self._refresh_ratio:float = min(max(REFRESH_RATIO, 0.0), 1.0)
+        self._entries:OrderedDict[tuple[str, str, int], tuple[str, float]] = OrderedDict()
+        self._lock:Lock = Lock()
+        self._hit_count:int = 0
+        self._miss_count:int = 0
+
+    def __str__(self) -> str:
+        """現在のオブジェクトを表す文字列を返す
+
+        Returns:
+            str: 現在のオブジェクトを表す文字列
+        """
+        return f'MAX_SIZE:{self.MAX_SIZE}, REFRESH_RATIO:{self.REFRESH_RATIO}, SIZE:{len(self._entries)}, HIT_COUNT:{self.HIT_COUNT}, MISS_COUNT:{self.MISS_COUNT}'
+
+    @property
+    def MAX_SIZE(self) -> int:
+        """最大保持件数 取得
+
+        Returns:
+            int: 最大保持件数
+        """
+        return self._max_size
+
+    @property
+    def REFRESH_RATIO(self) -> float:
+        """再発行閾値 取得
+
+        Returns:
+            float: 再発行閾値(有効期限に対する経過時間の割合)
+        """
+        return self._refresh_ratio
+
+    @property
+    def HIT_COUNT(self) -> int:
+        """キャッシュヒット数 取得
+
+        Returns:
+            int: キャッシュヒット数
+        """
+        return self._hit_count
+
+    @property
+    def MISS_COUNT(self) -> int:
+        """キャッシュミス数 取得
+
+        Returns:
+            int: キャッシュミス数
+        """
+        return self._miss_count
+
+    def get(self, CLIENT_METHOD:str, OBJECT_KEY:str, EXPIRATION:int) -> str:
+        """キャッシュ済み署名付きURLの取得
+
+        Args:
+            CLIENT_METHOD (str): S3へのリクエストで利用するAPI(ex:"get_object")
+            OBJECT_KEY (str): ファイル名
+            EXPIRATION (int): 有効期限(単位:秒)
+
+        Returns:
+            str: 署名付きURL(未登録 または 再発行閾値を超えている場合は空文字)
+        """
+        KEY = (CLIENT_METHOD, OBJECT_KEY, EXPIRATION)
+        with self._lock:
+            ENTRY = self._entries.get(KEY, None)
+            if ENTRY is not None and time.time() - ENTRY[1] < EXPIRATION * self._refresh_ratio:
+                self._entries.move_to_end(KEY)
+                self._hit_count += 1
+                return ENTRY[0]
+            if ENTRY is not None:
+                # 再発行閾値超過のため破棄
+                del self._entries[KEY]
+            self._miss_count += 1
+        return ''
+
+    def put(self, CLIENT_METHOD:str, OBJECT_KEY:str, EXPIRATION:int, URL:str, ISSUED_AT:float = None) -> None:
+        """署名付きURLの登録
+
+        Args:
+            CLIENT_METHOD (str): S3へのリクエストで利用するAPI(ex:"get_object")
+            OBJECT_KEY (str): ファイル名
+            EXPIRATION (int): 有効期限(単位:秒)
+            URL (str): 署名付きURL
+            ISSUED_AT (float, optional): 発行日時(UNIX時間、省略時は現在時刻). Defaults to None.
+        """
+        if self._max_size <= 0 or not URL:
+            return
+        KEY = (CLIENT_METHOD, OBJECT_KEY, EXPIRATION)
+        with self._lock:
+            self._entries[KEY] = (URL, time.time() if ISSUED_AT is None else ISSUED_AT)
+            self._entries.move_to_end(KEY)
+            # 最大保持件数を超えた分は最も古く参照されたものから破棄
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, OBJECT_KEY:str) -> int:
+        """オブジェクトキーに該当する署名付きURLの破棄
+
+        Args:
+            OBJECT_KEY (str): ファイル名
+
+        Returns:
+            int: 破棄した件数
+        """
+        with self._lock:
+            KEYS = [KEY for KEY in self._entries if KEY[1] == OBJECT_KEY]
+            for KEY in KEYS:
+                del self._entries[KEY]
+        return len(KEYS)
+
+    def clear(self) -> None:
+        """全署名付きURLの破棄およびヒット/ミス数のリセット
+        """
+        with self._lock:
+            self._entries.clear()
+            self._hit_count = 0
+            self._miss_count = 0
@@ -1,9 +1,15 @@
-"""S3へのオブジェクトアップロードイベントハンドラ
+"""S3へのオブジェクトアップロード・削除イベントハンドラ
+※S3からの直接通知と、SQSキュー経由の通知(S3通知をSQSメッセージで包んだバッチ)の両方を受け付ける。
+イベント種別ごとに振り分け、ObjectCreatedはアイテムの追加、ObjectRemovedはアイテムの削除としてDBへ反映する。
+追加された画像は電子ペーパー向けに変換して格納し、画像フォーマット変換状態を設定してからDBへ書き込む。
 """
-import dateutil.parser as du_parser
+import json
 import logging
 
+from datetime import datetime
 from http import HTTPStatus
+from module.aws_call_tracer import cAwsCallTracer
+from module.aws_client_factory import cAwsClientFactory
 from module.aws_mng import cAwsAccessMng
 from module.common_func import cCommonFunc
 from module.env_mng import cEnvMng
@@ -11,22 +17,44 @@ from module.logger_wrapper import cLoggerWrapper
 
 ENV_MNG = cEnvMng()
 LOGGER_WRAPPER:cLoggerWrapper = cLoggerWrapper(LEVEL=ENV_MNG.LOG_LEVEL)
-AWS_MNG = cAwsAccessMng(REGION_NAME=ENV_MNG.AWS_REGION, S3_BUCKET=ENV_MNG.AWS_S3_BUCKET, DYNAMO_DB_IMAGE_MNG_TABLE_NAME=ENV_MNG.AWS_DYNAMODB_IMAGE_MNG_TABLE_NAME, LOGGER_WRAPPER=LOGGER_WRAPPER)
-AWS_MNG.initialize()
+AWS_CALL_TRACER:cAwsCallTracer = cAwsCallTracer(ENABLED=ENV_MNG.AWS_CALL_TRACE_ENABLED)
+AWS_CLIENT_FACTORY:cAwsClientFactory = cAwsClientFactory(REGION_NAME=ENV_MNG.AWS_REGION, MAX_POOL_CONNECTIONS=max(ENV_MNG.AWS_CLIENT_MAX_POOL_CONNECTIONS, ENV_MNG.S3_LIST_MAX_WORKERS), CONNECT_TIMEOUT=ENV_MNG.AWS_CLIENT_CONNECT_TIMEOUT, READ_TIMEOUT=ENV_MNG.AWS_CLIENT_READ_TIMEOUT, TCP_KEEPALIVE=ENV_MNG.AWS_CLIENT_TCP_KEEPALIVE, RETRY_MODE=ENV_MNG.AWS_CLIENT_RETRY_MODE, MAX_ATTEMPTS=ENV_MNG.AWS_CLIENT_MAX_ATTEMPTS, LOGGER_WRAPPER=LOGGER_WRAPPER)
+AWS_MNG = cAwsAccessMng(REGION_NAME=ENV_MNG.AWS_REGION, S3_BUCKET=ENV_MNG.AWS_S3_BUCKET, DYNAMO_DB_IMAGE_MNG_TABLE_NAME=ENV_MNG.AWS_DYNAMODB_IMAGE_MNG_TABLE_NAME, LOGGER_WRAPPER=LOGGER_WRAPPER, SIGNED_URL_CACHE_SIZE=ENV_MNG.SIGNED_URL_CACHE_SIZE, SIGNED_URL_CACHE_REFRESH_RATIO=ENV_MNG.SIGNED_URL_CACHE_REFRESH_RATIO, S3_LIST_MAX_WORKERS=ENV_MNG.S3_LIST_MAX_WORKERS, AWS_CALL_TRACER=AWS_CALL_TRACER, AWS_CLIENT_FACTORY=AWS_CLIENT_FACTORY, EVENT_DEDUPE_CACHE_SIZE=ENV_MNG.EVENT_DEDUPE_CACHE_SIZE, EVENT_DEDUPE_CACHE_TTL=ENV_MNG.EVENT_DEDUPE_CACHE_TTL)
+# 画像変換はNumPy・Pillowの読み込みを伴うため、初期化フェーズでは生成せず変換が有効な場合のみ初回の変換時に生成する
+EPAPER_CONVERTER = None
+# 初期化フェーズではクライアント生成のみ行い、AWSへの通信を伴うリソースの存在確認は初回呼び出し時に行う
+AWS_MNG.create_clients()
 DICT_KEY_TIME = 'time'
 DICT_KEY_FILE_NAME = 'file_name'
+DICT_KEY_MESSAGE_ID = 'message_id'
+DICT_KEY_SEQUENCER = 'sequencer'
+DICT_KEY_EVENT_NAME = 'event_name'
+EVENT_NAME_PREFIX_CREATED = 'ObjectCreated:'
+EVENT_NAME_PREFIX_REMOVED = 'ObjectRemoved:'
+EVENT_SOURCE_SQS = 'aws:sqs'
 
 def lambda_handler(event, context):
-    LOGGER_WRAPPER.output(MSG=f'', PREFIX='::Enter')
-    RESULT_DATAS:dict[str, str] = {cCommonFunc.API_RESP_DICT_KEY_RESULT:''}
-    S3_OBJECT_DATAS:list[str] = [] # イベント内のS3オブジェクトの日時・ファイル名リスト
-    # S3オブジェクトの日時・ファイル名リストを設定
-    status = get_s3_event_object_keys(RECORDS=event.get('Records', []), S3_OBJECT_DATAS=S3_OBJECT_DATAS, API_RESULT_DATAS=RESULT_DATAS)
-    # S3オブジェクトの日時・ファイル名リスト設定成功
-    if status == HTTPStatus.OK:
-        # DB更新処理呼び出し
-        status = call_update_db_func(S3_OBJECT_DATAS=S3_OBJECT_DATAS, API_RESULT_DATAS=RESULT_DATAS)
-    LOGGER_WRAPPER.output(MSG=f'status:{status}, RESULT_DATAS:{RESULT_DATAS}', PREFIX='::Leave')
+    RECORDS:list[dict] = event.get('Records', None) or []
+    # SQSキュー経由の通知はバッチ処理し、失敗したメッセージのみを再試行対象として返す
+    if len(RECORDS) > 0 and RECORDS[0].get('eventSource', '') == EVENT_SOURCE_SQS:
+        return sqs_lambda_handler(event=event, context=context)
+    LOGGER_WRAPPER.output(MSG='', PREFIX='::Enter')
+    AWS_CALL_TRACER.begin(ROUTE='S3Event')
+    try:
+        # S3バケット・DynamoDBテーブルの存在確認(確認済みの場合は通信しない)
+        AWS_MNG.initialize()
+        RESULT_DATAS:dict[str, str] = {cCommonFunc.API_RESP_DICT_KEY_RESULT:''}
+        S3_OBJECT_DATAS:list[str] = [] # イベント内のS3オブジェクトの日時・ファイル名リスト
+        # S3オブジェクトの日時・ファイル名リストを設定
+        status = get_s3_event_object_keys(RECORDS=event.get('Records', []), S3_OBJECT_DATAS=S3_OBJECT_DATAS, API_RESULT_DATAS=RESULT_DATAS)
+        # S3オブジェクトの日時・ファイル名リスト設定成功
+        if status == HTTPStatus.OK:
+            # DB更新処理呼び出し
+            status = call_update_db_func(S3_OBJECT_DATAS=S3_OBJECT_DATAS, API_RESULT_DATAS=RESULT_DATAS)
+    finally:
+        # 例外発生時も呼び出し単位の計測結果を出力する
+        AWS_CALL_TRACER.emit()
+    LOGGER_WRAPPER.output(MSG=lambda: f'status:{status}, RESULT_DATAS:{RESULT_DATAS}', PREFIX='::Leave')
     return RESULT_DATAS, status
 
 def get_s3_event_object_keys(RECORDS:list[dict[str, str|dict]], S3_OBJECT_DATAS:list[dict], API_RESULT_DATAS:dict[str, str]) -> int:
@@ -40,46 +68,168 @@ def get_s3_event_object_keys(RECORDS:list[dict[str, str|dict]], S3_OBJECT_DATAS:
     Returns:
         int: httpステータスコード
     """
-    LOGGER_WRAPPER.output(MSG=f'len(RECORDS):{-1 if RECORDS is None else len(RECORDS)}', PREFIX='::Enter')
+    LOGGER_WRAPPER.output(MSG=lambda: f'len(RECORDS):{-1 if RECORDS is None else len(RECORDS)}', PREFIX='::Enter')
     ret_value = HTTPStatus.OK if not cCommonFunc.is_none_or_empty(RECORDS) and not S3_OBJECT_DATAS is None else HTTPStatus.INTERNAL_SERVER_ERROR
     if ret_value == HTTPStatus.OK:
         try:
             S3_OBJECT_DATAS.clear()
             for RECORD in RECORDS:
-                EVENT_TIME:str = RECORD.get('eventTime', "")
-                S3_OBJECT:dict = RECORD.get('s3', {}).get('object', {})
-                if 'key' in S3_OBJECT and not cCommonFunc.is_none_or_empty(EVENT_TIME):
-                    S3_OBJECT_DATAS.append({DICT_KEY_FILE_NAME:S3_OBJECT.get('key'), DICT_KEY_TIME:du_parser.parse(EVENT_TIME).strftime("%Y/%m/%d %H:%M:%S.%f")[:-3]})
+                S3_OBJECT_DATA = get_s3_object_data(RECORD=RECORD)
+                if not S3_OBJECT_DATA is None: S3_OBJECT_DATAS.append(S3_OBJECT_DATA)
         except Exception as e:
             ret_value = HTTPStatus.INTERNAL_SERVER_ERROR
             # 例外内容をAPI処理結果詳細に設定
             cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'{type(e).__name__}, {e}')
-            LOGGER_WRAPPER.output(MSG=f'len(RECORDS):{-1 if RECORDS is None else len(RECORDS)}, len(S3_OBJECT_DATAS):{-1 if S3_OBJECT_DATAS is None else len(S3_OBJECT_DATAS)}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
-    LOGGER_WRAPPER.output(MSG=f'len(RECORDS):{-1 if RECORDS is None else len(RECORDS)}, len(S3_OBJECT_DATAS):{-1 if S3_OBJECT_DATAS is None else len(S3_OBJECT_DATAS)}, ret_value:{ret_value}', PREFIX='::Leave')
+            LOGGER_WRAPPER.output(MSG=lambda: f'len(RECORDS):{-1 if RECORDS is None else len(RECORDS)}, len(S3_OBJECT_DATAS):{-1 if S3_OBJECT_DATAS is None else len(S3_OBJECT_DATAS)}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+    LOGGER_WRAPPER.output(MSG=lambda: f'len(RECORDS):{-1 if RECORDS is None else len(RECORDS)}, len(S3_OBJECT_DATAS):{-1 if S3_OBJECT_DATAS is None else len(S3_OBJECT_DATAS)}, ret_value:{ret_value}', PREFIX='::Leave')
     return ret_value
 
-def call_update_db_func(S3_OBJECT_DATAS:list[dict], API_RESULT_DATAS:dict[str, str]) -> int:
-    """DB更新処理呼び出し
+def sqs_lambda_handler(event, context) -> dict[str, list[dict[str, str]]]:
+    """SQSキュー経由のS3通知のバッチ処理
+    ※全メッセージのS3通知をまとめて1回の一括書き込みで反映し、解析・書き込みに失敗したメッセージのみを"batchItemFailures"で返す
 
     Args:
-        S3_OBJECT_DATAS (list[dict]): S3オブジェクトの日時・ファイル名リスト
+        event (_type_): Lambda関数の呼び出し元の情報(SQSメッセージのバッチ)
+        context (_type_): コンテキストオブジェクト
+
+    Returns:
+        dict[str, list[dict[str, str]]]: 部分的なバッチ応答(ex:{'batchItemFailures':[{'itemIdentifier':'メッセージID'}, ...]})
+    """
+    LOGGER_WRAPPER.output(MSG='', PREFIX='::Enter')
+    AWS_CALL_TRACER.begin(ROUTE='SQSEvent')
+    try:
+        # S3バケット・DynamoDBテーブルの存在確認(確認済みの場合は通信しない)
+        AWS_MNG.initialize()
+        MESSAGES:list[dict] = event.get('Records', None) or []
+        RESULT_DATAS:dict[str, str] = {cCommonFunc.API_RESP_DICT_KEY_RESULT:''}
+        S3_OBJECT_DATAS:list[dict] = [] # 全メッセージ内のS3オブジェクトの日時・ファイル名・メッセージIDリスト
+        FAILED_MESSAGE_IDS:set[str] = set()
+        status = get_sqs_event_object_keys(MESSAGES=MESSAGES, S3_OBJECT_DATAS=S3_OBJECT_DATAS, FAILED_MESSAGE_IDS=FAILED_MESSAGE_IDS)
+        if len(S3_OBJECT_DATAS) > 0:
+            FAILED_URLS:set[str] = set()
+            status = call_update_db_func(S3_OBJECT_DATAS=S3_OBJECT_DATAS, API_RESULT_DATAS=RESULT_DATAS, FAILED_URLS=FAILED_URLS)
+            # 書き込みに失敗した画像URLを含むメッセージを再試行対象とする
+            FAILED_MESSAGE_IDS.update(OBJECT[DICT_KEY_MESSAGE_ID] for OBJECT in S3_OBJECT_DATAS if OBJECT[DICT_KEY_FILE_NAME] in FAILED_URLS)
+    finally:
+        # 例外発生時も呼び出し単位の計測結果を出力する
+        AWS_CALL_TRACER.emit()
+    # 再試行対象はバッチ内のメッセージ順で返す
+    BATCH_ITEM_FAILURES:list[dict[str, str]] = [{'itemIdentifier':MESSAGE.get('messageId', '')} for MESSAGE in MESSAGES if MESSAGE.get('messageId', '') in FAILED_MESSAGE_IDS]
+    LOGGER_WRAPPER.output(MSG=lambda: f'status:{status}, len(MESSAGES):{len(MESSAGES)}, len(S3_OBJECT_DATAS):{len(S3_OBJECT_DATAS)}, BATCH_ITEM_FAILURES:{BATCH_ITEM_FAILURES}, RESULT_DATAS:{RESULT_DATAS}', PREFIX='::Leave')
+    return {'batchItemFailures':BATCH_ITEM_FAILURES}
+
+def get_sqs_event_object_keys(MESSAGES:list[dict[str, str|dict]], S3_OBJECT_DATAS:list[dict], FAILED_MESSAGE_IDS:set[str]) -> int:
+    """SQSメッセージ内のS3通知からS3オブジェクトの日時・ファイル名・メッセージIDリストを設定
+
+    Args:
+        MESSAGES (list[dict[str, str | dict]]): SQSメッセージリスト(lambda_handlerのイベント)
+        S3_OBJECT_DATAS (list[dict]): S3オブジェクトの日時・ファイル名・メッセージIDリスト
+        FAILED_MESSAGE_IDS (set[str]): 解析に失敗したメッセージIDの設定先
+
+    Returns:
+        int: httpステータスコード(解析に失敗したメッセージが存在する場合は400)
+    """
+    LOGGER_WRAPPER.output(MSG=lambda: f'len(MESSAGES):{-1 if MESSAGES is None else len(MESSAGES)}', PREFIX='::Enter')
+    ret_value = HTTPStatus.OK if not MESSAGES is None and not S3_OBJECT_DATAS is None and not FAILED_MESSAGE_IDS is None else HTTPStatus.INTERNAL_SERVER_ERROR
+    if ret_value == HTTPStatus.OK:
+        S3_OBJECT_DATAS.clear()
+        for MESSAGE in MESSAGES:
+            MESSAGE_ID:str = MESSAGE.get('messageId', '')
+            try:
+                # S3のテスト通知(s3:TestEvent)等、Recordsを含まないメッセージは処理対象なしとして扱う
+                BODY:dict = json.loads(MESSAGE.get('body', '') or '{}')
+                for RECORD in BODY.get('Records', None) or []:
+                    S3_OBJECT_DATA = get_s3_object_data(RECORD=RECORD)
+                    if not S3_OBJECT_DATA is None:
+                        S3_OBJECT_DATA[DICT_KEY_MESSAGE_ID] = MESSAGE_ID
+                        S3_OBJECT_DATAS.append(S3_OBJECT_DATA)
+            except Exception as e:
+                # 解析できないメッセージのみ再試行対象とし、他のメッセージの処理は継続する
+                FAILED_MESSAGE_IDS.add(MESSAGE_ID)
+                ret_value = HTTPStatus.BAD_REQUEST
+                LOGGER_WRAPPER.output(MSG=lambda: f'MESSAGE_ID:{MESSAGE_ID}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+    LOGGER_WRAPPER.output(MSG=lambda: f'len(MESSAGES):{-1 if MESSAGES is None else len(MESSAGES)}, len(S3_OBJECT_DATAS):{-1 if S3_OBJECT_DATAS is None else len(S3_OBJECT_DATAS)}, ret_value:{ret_value}', PREFIX='::Leave')
+    return ret_value
+
+def get_s3_object_data(RECORD:dict[str, str|dict]) -> dict[str, str]:
+    """S3通知のレコードからS3オブジェクトの日時・ファイル名・シーケンサー・イベント種別を取得
+
+    Args:
+        RECORD (dict[str, str | dict]): S3通知のレコード
+
+    Returns:
+        dict[str, str]: S3オブジェクトの日時・ファイル名・シーケンサー・イベント種別(ファイル名・日時を含まないレコードの場合はNone)
+    """
+    EVENT_TIME:str = RECORD.get('eventTime', "")
+    S3_OBJECT:dict = RECORD.get('s3', {}).get('object', {})
+    if not 'key' in S3_OBJECT or cCommonFunc.is_none_or_empty(EVENT_TIME):
+        return None
+    # S3通知のeventTimeはISO 8601形式(ex:"2024-05-30T03:40:35.123Z")のため、datetime.fromisoformatで解析する
+    return {DICT_KEY_FILE_NAME:S3_OBJECT.get('key'), DICT_KEY_TIME:datetime.fromisoformat(EVENT_TIME).strftime("%Y/%m/%d %H:%M:%S.%f")[:-3], DICT_KEY_SEQUENCER:S3_OBJECT.get('sequencer', ''), DICT_KEY_EVENT_NAME:RECORD.get('eventName', '')}
+
+def get_epaper_converter():
+    """電子ペーパー向け画像変換クラスのインスタンスを取得(変換が有効な場合のみ初回呼び出し時に生成する)
+
+    Returns:
+        cEpaperConverter: 電子ペーパー向け画像変換クラスのインスタンス(変換が無効な場合はNone)
+    """
+    global EPAPER_CONVERTER
+    if EPAPER_CONVERTER is None and ENV_MNG.EPAPER_CONVERSION_ENABLED:
+        from module.epaper_converter import cEpaperConverter
+        EPAPER_CONVERTER = cEpaperConverter(LOGGER_WRAPPER=LOGGER_WRAPPER)
+    return EPAPER_CONVERTER
+
+def call_update_db_func(S3_OBJECT_DATAS:list[dict], API_RESULT_DATAS:dict[str, str], FAILED_URLS:set[str] = None) -> int:
+    """DB更新処理呼び出し(イベント種別ごとに削除・追加へ振り分け)
+    ※削除を先に反映することで、同一バッチ内の追加・削除はシーケンサーの順序どおりに反映される
+    (削除より古い追加は書き込まれず、削除より新しい追加は削除後に書き込まれる)。
+    追加する画像は電子ペーパー向けに変換してから書き込む。変換に失敗した画像は、再試行できる場合(FAILED_URLS指定時)は書き込まずに再試行対象とし、
+    それ以外の場合は画像フォーマット変換状態を未判定のまま書き込む。
+
+    Args:
+        S3_OBJECT_DATAS (list[dict]): S3オブジェクトの日時・ファイル名・シーケンサー・イベント種別リスト
         API_RESULT_DATAS (dict[str, str]): 応答内容dict
+        FAILED_URLS (set[str], optional): 書き込み・削除に失敗した画像URL(ファイル名)の設定先. Defaults to None.
 
     Returns:
         int: httpステータスコード
     """
-    LOGGER_WRAPPER.output(MSG=f'len(S3_OBJECT_DATAS):{-1 if S3_OBJECT_DATAS is None else len(S3_OBJECT_DATAS)}', PREFIX='::Enter')
+    LOGGER_WRAPPER.output(MSG=lambda: f'len(S3_OBJECT_DATAS):{-1 if S3_OBJECT_DATAS is None else len(S3_OBJECT_DATAS)}', PREFIX='::Enter')
     ret_value = HTTPStatus.OK if not S3_OBJECT_DATAS is None and not AWS_MNG is None else HTTPStatus.INTERNAL_SERVER_ERROR
     if ret_value == HTTPStatus.OK:
         try:
-            PUT_RESULTS:list[int] = []
+            PUT_ITEMS:list[dict[str, str]] = []
+            DELETE_ITEMS:list[dict[str, str]] = []
             for OBJECT in S3_OBJECT_DATAS:
-                PUT_RESULTS.append(AWS_MNG.putitem_to_dynamodb_image_mng_table(FILE_URL=OBJECT.get(DICT_KEY_FILE_NAME, ''), LAST_MODIFIED=OBJECT.get(DICT_KEY_TIME, ''), API_RESULT_DATAS=API_RESULT_DATAS))
-            ret_value = max(PUT_RESULTS)
+                EVENT_NAME:str = OBJECT.get(DICT_KEY_EVENT_NAME, '')
+                # 変換した画像の格納先が通知対象に含まれる場合でも、変換した画像自体は画像として扱わない
+                if OBJECT.get(DICT_KEY_FILE_NAME, '').startswith(f'{AWS_MNG.S3_CONVERTED_PREFIX}/'): continue
+                ITEM = {cCommonFunc.API_RESP_DICT_KEY_URL:OBJECT.get(DICT_KEY_FILE_NAME, ''), cCommonFunc.API_RESP_DICT_KEY_LAST_MODIFIED:OBJECT.get(DICT_KEY_TIME, ''), AWS_MNG.SEQUENCER_ATTRIBUTE_NAME:OBJECT.get(DICT_KEY_SEQUENCER, '')}
+                if EVENT_NAME.startswith(EVENT_NAME_PREFIX_REMOVED):
+                    DELETE_ITEMS.append(ITEM)
+                # イベント種別を含まない通知は従来どおり追加として扱う(その他のイベント種別は対象外)
+                elif len(EVENT_NAME) <= 0 or EVENT_NAME.startswith(EVENT_NAME_PREFIX_CREATED):
+                    PUT_ITEMS.append(ITEM)
+            # イベント内の全レコードを一括で反映する(同一ファイル名は重複排除され、再配信・古いイベントは反映されない)
+            if len(DELETE_ITEMS) > 0:
+                ret_value = AWS_MNG.deleteitems_by_url_to_dynamodb_image_mng_table(ITEMS=DELETE_ITEMS, API_RESULT_DATAS=API_RESULT_DATAS, FAILED_URLS=FAILED_URLS)
+            CONVERTER = get_epaper_converter() if len(PUT_ITEMS) > 0 else None
+            if not CONVERTER is None and CONVERTER.ENABLED:
+                CONVERT_FAILED_URLS:set[str] = set()
+                CONVERT_STATUS = AWS_MNG.convert_images_for_epaper(ITEMS=PUT_ITEMS, CONVERTER=CONVERTER, API_RESULT_DATAS=API_RESULT_DATAS, FAILED_URLS=CONVERT_FAILED_URLS)
+                if not FAILED_URLS is None and len(CONVERT_FAILED_URLS) > 0:
+                    # 再試行時に変換からやり直すため、変換に失敗した画像は書き込まない
+                    FAILED_URLS.update(CONVERT_FAILED_URLS)
+                    PUT_ITEMS = [ITEM for ITEM in PUT_ITEMS if not ITEM.get(cCommonFunc.API_RESP_DICT_KEY_URL, '') in CONVERT_FAILED_URLS]
+                    ret_value = CONVERT_STATUS if ret_value == HTTPStatus.OK else ret_value
+            if len(PUT_ITEMS) > 0:
+                PUT_STATUS = AWS_MNG.putitems_to_dynamodb_image_mng_table(ITEMS=PUT_ITEMS, API_RESULT_DATAS=API_RESULT_DATAS, FAILED_URLS=FAILED_URLS)
+                ret_value = PUT_STATUS if ret_value == HTTPStatus.OK else ret_value
         except Exception as e:
             ret_value = HTTPStatus.INTERNAL_SERVER_ERROR
+            if not FAILED_URLS is None: FAILED_URLS.update(OBJECT.get(DICT_KEY_FILE_NAME, '') for OBJECT in S3_OBJECT_DATAS)
             # 例外内容をAPI処理結果詳細に設定
             cCommonFunc.set_api_resp_str_msg(API_RESULT_DATAS=API_RESULT_DATAS, VALUE=f'{type(e).__name__}, {e}')
-            LOGGER_WRAPPER.output(MSG=f'len(S3_OBJECT_DATAS):{-1 if S3_OBJECT_DATAS is None else len(S3_OBJECT_DATAS)}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
-    LOGGER_WRAPPER.output(MSG=f'len(S3_OBJECT_DATAS):{-1 if S3_OBJECT_DATAS is None else len(S3_OBJECT_DATAS)}, ret_value:{ret_value}', PREFIX='::Leave')
+            LOGGER_WRAPPER.output(MSG=lambda: f'len(S3_OBJECT_DATAS):{-1 if S3_OBJECT_DATAS is None else len(S3_OBJECT_DATAS)}, {type(e).__name__}! {e}', LEVEL=logging.WARN)
+    LOGGER_WRAPPER.output(MSG=lambda: f'len(S3_OBJECT_DATAS):{-1 if S3_OBJECT_DATAS is None else len(S3_OBJECT_DATAS)}, ret_value:{ret_value}', PREFIX='::Leave')
     return ret_value